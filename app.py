@@ -1,28 +1,174 @@
-from dotenv import load_dotenv
+import io
+
+import click
 from flask import Flask, jsonify, make_response, Response, request
 from werkzeug.exceptions import BadRequest, Unauthorized
-from scholarship_finder.utils.random_utils import fetch_scholarship_data
 from pprint import pprint
 # from flask_cors import CORS
 
 from config import ProductionConfig
-from scholarship_finder.db import db
-from scholarship_finder.models.user_model import User
+from scholarship_finder.db import configure_engine, db, install_pragmas, install_query_timer
+from scholarship_finder.models.user_model import User, init_credential_cache
+from scholarship_finder.instrumentation import init_metrics
 from scholarship_finder.models.favorites_model import FavoritesModel
-from scholarship_finder.models.scholarship_model import Scholarship
-from datetime import datetime
+from scholarship_finder.models.favorites_store import favorites_store
+from scholarship_finder.clients.mongo_client import mongo
+from scholarship_finder.clients.redis_client import redis_connection
+from scholarship_finder.models.catalog_model import catalog_cache
+from scholarship_finder.models.catalog_index import FACETS
+from scholarship_finder.utils.logger import init_logging
+from scholarship_finder.utils.metrics import metrics
+from scholarship_finder.utils.result_cache import result_cache
+from scholarship_finder.utils.user_import import FORMATS as IMPORT_FORMATS, detect_format, iter_user_records
+from scholarship_finder.utils.json_encoding import iter_json_chunks, join_fragments
+from scholarship_finder.utils.pagination import decode_cursor, encode_cursor, query_fingerprint, seek_after
+from datetime import date, datetime
+from typing import Optional
 from scholarship_finder.models.mongo_session_model import login_user, logout_user
 import logging
 
-# Load environment variables from .env file
-load_dotenv()
+def parse_catalog_filters(args) -> dict:
+    """
+    Parse and validate the scholarship catalog filters from query parameters.
+
+    Args:
+        args (MultiDict): The request's query parameters.
+
+    Returns:
+        dict: The facet values, `min_gpa` (float or None) and the deadline window bounds.
+
+    Raises:
+        ValueError: If a numeric or date parameter is malformed.
+    """
+    query = {facet: args.get(facet) for facet in FACETS}
+
+    query['min_gpa'] = None
+    if args.get('min_gpa'):
+        try:
+            query['min_gpa'] = float(args['min_gpa'])
+        except ValueError:
+            raise ValueError("Invalid min_gpa value")
+
+    for param in ('deadline_after', 'deadline_before'):
+        query[param] = args.get(param) or None
+        if query[param]:
+            try:
+                date.fromisoformat(query[param])
+            except ValueError:
+                raise ValueError(f"Invalid {param} value, expected YYYY-MM-DD")
+    return query
+
+def canonical_catalog_filters(query: dict) -> dict:
+    """
+    Normalize parsed catalog filters into a canonical form.
+
+    Equivalent requests (different parameter order, case of case-insensitive
+    values, empty values) produce the same dict, which every catalog route
+    echoes as `filters_applied`.
+
+    Args:
+        query (dict): Filters as returned by `parse_catalog_filters`.
+
+    Returns:
+        dict: Canonical parameter name to string value.
+    """
+    canonical = {}
+    for name, value in query.items():
+        if value is None or value == '':
+            continue
+        if name == 'major':
+            value = value.lower()
+        canonical[name] = repr(value) if isinstance(value, float) else value
+    return canonical
+
+def canonical_catalog_query(query: dict, sort_by: str, sort_order: str) -> dict:
+    """
+    Normalize parsed catalog filters and sort options into a canonical form.
+
+    Adds the sort options, defaults included, to `canonical_catalog_filters`;
+    the result is used both as the result cache key and as `filters_applied`.
+
+    Args:
+        query (dict): Filters as returned by `parse_catalog_filters`.
+        sort_by (str): The requested sort field.
+        sort_order (str): The requested sort direction.
+
+    Returns:
+        dict: Canonical parameter name to string value.
+    """
+    canonical = canonical_catalog_filters(query)
+    canonical['sort_by'] = sort_by.lower()
+    canonical['sort_order'] = 'desc' if sort_order.lower() == 'desc' else 'asc'
+    return canonical
+
+def resolve_scholarship_id(payload: dict, snapshot, listed_only: bool = True) -> Optional[str]:
+    """
+    Find the ID of the scholarship a favorites request refers to.
+
+    Accepts either a `scholarship_id` or a `scholarship` object, which is matched
+    by its `id` or, failing that, by university and scholarship name.
+
+    Args:
+        payload (dict): The request body or batch operation.
+        snapshot (CatalogSnapshot): The catalog to resolve against.
+        listed_only (bool): Whether a `scholarship_id` must still be in the catalog.
+
+    Returns:
+        str: The scholarship ID, or None if it cannot be resolved.
+    """
+    scholarship_id = payload.get('scholarship_id')
+    if scholarship_id:
+        if not isinstance(scholarship_id, str):
+            return None
+        return scholarship_id if not listed_only or scholarship_id in snapshot.id_index else None
+    scholarship = payload.get('scholarship')
+    if not isinstance(scholarship, dict):
+        return None
+    position = snapshot.position_of(scholarship)
+    return snapshot.columns.ids[position] if position is not None else None
+
+def resolve_batch_operations(operations: list, snapshot) -> list:
+    """
+    Validate favorites batch operations and resolve their scholarship IDs.
+
+    Args:
+        operations (list): The operations from the request body.
+        snapshot (CatalogSnapshot): The catalog to resolve against.
+
+    Returns:
+        list: Dicts with `op` and `scholarship_id`, in request order.
+
+    Raises:
+        ValueError: If an operation is malformed or its scholarship cannot be found.
+    """
+    resolved = []
+    for index, operation in enumerate(operations):
+        if not isinstance(operation, dict) or operation.get('op') not in ('add', 'remove'):
+            raise ValueError(f"Invalid operation at index {index}")
+        scholarship_id = resolve_scholarship_id(operation, snapshot, listed_only=operation['op'] == 'add')
+        if scholarship_id is None:
+            raise ValueError(f"Scholarship not found at index {index}")
+        resolved.append({"op": operation['op'], "scholarship_id": scholarship_id})
+    return resolved
 
 def create_app(config_class=ProductionConfig):
     app = Flask(__name__)
     app.config.from_object(config_class)
+    init_logging(app)  # Levels and the background log handler
 
+    sqlite_pragmas = configure_engine(app)  # Engine profile from config
     db.init_app(app)  # Initialize db with app
+    catalog_cache.init_app(app)  # Scholarship catalog is served from memory
+    result_cache.init_app(app)
+    favorites_store.init_app(app)
+    mongo.init_app(app)  # Pool settings and the sessions.user_id index
+    redis_connection.init_app(app)  # Clients are only created when a route needs them
+    init_credential_cache(app)
+    init_metrics(app)  # Request timing and the gauges behind /api/metrics
     with app.app_context():
+        install_pragmas(db.engine, sqlite_pragmas)
+        if app.config.get('METRICS_ENABLED', True):
+            install_query_timer(db.engine)
         db.create_all()  # Recreate all tables
 
     ####################################################
@@ -40,9 +186,36 @@ def create_app(config_class=ProductionConfig):
         Returns:
             JSON response indicating the health status of the service.
         """
-        app.logger.info('Health check')
+        app.logger.debug('Health check')
         return make_response(jsonify({'status': 'healthy'}), 200)
 
+    @app.route('/api/ready', methods=['GET'])
+    def readiness() -> Response:
+        """
+        Readiness route: the service only takes traffic once the catalog is loaded.
+        While it is not, a background load is started (or left running), so a
+        worker whose warm-up failed does not stay unready for good.
+
+        Returns:
+            JSON response with the catalog version, or 503 while it is still loading.
+        """
+        if catalog_cache.version == 0:
+            catalog_cache.load_in_background()
+            return make_response(jsonify({'status': 'loading'}), 503)
+        return make_response(jsonify({'status': 'ready', 'catalog_version': catalog_cache.version}), 200)
+
+    @app.route('/api/metrics', methods=['GET'])
+    def metrics_endpoint() -> Response:
+        """
+        Route exposing this process's metrics in the Prometheus text format.
+
+        Returns:
+            Plain-text response with every metric, or 404 if metrics are disabled.
+        """
+        if not app.config.get('METRICS_ENABLED', True):
+            return make_response(jsonify({'error': 'Metrics are disabled'}), 404)
+        return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
     ##########################################################
     #
     # User management
@@ -86,6 +259,69 @@ def create_app(config_class=ProductionConfig):
             app.logger.error("Failed to add user: %s", str(e))
             return make_response(jsonify({'error': str(e)}), 500)
 
+    @app.route('/api/create-users/bulk', methods=['POST'])
+    def bulk_create_users() -> Response:
+        """
+        Route to create many users at once.
+
+        Expected Input:
+            - An NDJSON body (`application/x-ndjson`) with one
+              `{"username": ..., "password": ...}` object per line, or a CSV body
+              (`text/csv`) with `username` and `password` columns. The format
+              can also be given with the `format` query parameter.
+
+        Returns:
+            JSON response with the number of users created and an error for each
+            record that was malformed or had a duplicate username.
+        Raises:
+            400 error if the format is not supported or the input cannot be read
+            to the end; in the latter case the body is the report of the users
+            imported before the failing line, with `aborted` set.
+            500 error if there is an issue adding the users to the database.
+        """
+        fmt = (request.args.get('format') or detect_format(request.content_type) or '').lower()
+        if fmt not in IMPORT_FORMATS:
+            return make_response(jsonify({'error': 'Unsupported format, send NDJSON or CSV'}), 400)
+
+        try:
+            lines = io.TextIOWrapper(request.stream, encoding='utf-8', newline='')
+            report = User.bulk_create_users(
+                iter_user_records(lines, fmt),
+                batch_size=app.config.get('USER_IMPORT_BATCH_SIZE', 1000)
+            )
+            app.logger.info("Bulk created %d users", report['created'])
+            if 'aborted' in report:
+                body = dict(report, status='import aborted', error=report['aborted']['error'])
+                return make_response(jsonify(body), 400)
+            return make_response(jsonify(dict(report, status='users imported')), 200)
+        except ValueError as e:
+            app.logger.warning("Rejected bulk user import: %s", str(e))
+            return make_response(jsonify({'error': str(e)}), 400)
+        except Exception as e:
+            app.logger.error("Failed to bulk create users: %s", str(e))
+            return make_response(jsonify({'error': str(e)}), 500)
+
+    @app.cli.command('import-users')
+    @click.argument('path', type=click.Path(exists=True, dir_okay=False))
+    @click.option('--format', 'fmt', type=click.Choice(IMPORT_FORMATS), help="Defaults to the file extension.")
+    @click.option('--batch-size', type=int, help="Users per transaction.")
+    def import_users_command(path, fmt, batch_size):
+        """Create users from an NDJSON or CSV file."""
+        fmt = fmt or detect_format(None, path)
+        if fmt is None:
+            raise click.UsageError("Cannot tell the format from the file name; pass --format.")
+        with open(path, encoding='utf-8', newline='') as lines:
+            report = User.bulk_create_users(
+                iter_user_records(lines, fmt),
+                batch_size=batch_size or app.config.get('USER_IMPORT_BATCH_SIZE', 1000)
+            )
+        for error in report['errors']:
+            click.echo(f"line {error['line']}: {error['username'] or '-'}: {error['error']}", err=True)
+        click.echo(f"Created {report['created']} users in {report['transactions']} transactions; "
+                   f"{report['failed']} records failed.")
+        if 'aborted' in report:
+            raise click.ClickException(f"Stopped at line {report['aborted']['line']}: {report['aborted']['error']}")
+
     @app.route('/api/delete-user', methods=['DELETE'])
     def delete_user() -> Response:
         """
@@ -147,20 +383,21 @@ def create_app(config_class=ProductionConfig):
         password = data['password']
 
         try:
-            # Validate user credentials
-            if not User.check_password(username, password):
+            # Validate user credentials and get the user ID in one lookup
+            try:
+                user_id, verified = User.authenticate(username, password)
+            except ValueError:
+                verified = False
+            if not verified:
                 app.logger.warning("Login failed for username: %s", username)
                 raise Unauthorized("Invalid username or password.")
 
-            # Get user ID
-            user_id = User.get_id_by_username(username)
-
-            # Load user's favorites into the FavoritesModel
-            favorites_model = FavoritesModel(user_id)
-            login_user(user_id, favorites_model)  # Load favorites from MongoDB
+            # The login's one session read also fills the favorites cache
+            favorites_store.seed(user_id, login_user(user_id))
 
             app.logger.info("User %s logged in successfully.", username)
-            return jsonify({"message": f"User {username} logged in successfully.", "favorites": favorites_model.get_favorites()}), 200
+            favorites = favorites_store.get(user_id)  # Hydrated from the catalog by scholarship ID
+            return jsonify({"message": f"User {username} logged in successfully.", "favorites": favorites}), 200
 
         except Unauthorized as e:
             return jsonify({"error": str(e)}), 401
@@ -195,11 +432,12 @@ def create_app(config_class=ProductionConfig):
             # Get user ID
             user_id = User.get_id_by_username(username)
 
-            # Create a new FavoritesModel instance
-            favorites_model = FavoritesModel(user_id)
+            # Load the user's current favorite IDs from the favorites store
+            favorites_model = FavoritesModel(user_id, favorites_store.get_ids(user_id))
 
-            # Save user's favorites and clear the favorites model
+            # Save user's favorites, clear the favorites model and drop the cached copy
             logout_user(user_id, favorites_model)  # Save favorites to MongoDB
+            favorites_store.evict(user_id)
 
             app.logger.info("User %s logged out successfully.", username)
             return jsonify({"message": f"User {username} logged out successfully."}), 200
@@ -228,74 +466,212 @@ def create_app(config_class=ProductionConfig):
             degree_level (str): Filter by degree level
             min_gpa (float): Filter by minimum GPA
             major (str): Filter by major
-            sort_by (str): Sort results by field (e.g., 'deadline')
+            deadline_after (str): Only deadlines on or after this date (YYYY-MM-DD)
+            deadline_before (str): Only deadlines on or before this date (YYYY-MM-DD)
+            sort_by (str): Sort results by field ('deadline', 'scholarship_name', 'university' or 'min_gpa')
             sort_order (str): Sort direction ('asc' or 'desc')
+            limit (int): Page size; enables pagination
+            cursor (str): The `next_cursor` of the previous page
         
         Returns:
             JSON response with filtered scholarships
         """
         try:
-            # Get all scholarships
-            scholarships = fetch_scholarship_data()
-            
             # Apply filters based on query parameters
             filters = request.args
-            
-            # Type filter
-            if filters.get('type'):
-                scholarships = [s for s in scholarships if s['type'] == filters['type']]
-            
-            # Country filter
-            if filters.get('country'):
-                scholarships = [s for s in scholarships if s['country'] == filters['country']]
-            
-            # Degree level filter
-            if filters.get('degree_level'):
-                scholarships = [s for s in scholarships if s['degree_level'] == filters['degree_level']]
-            
-            # Min GPA filter
-            if filters.get('min_gpa'):
+            try:
+                query = parse_catalog_filters(filters)
+            except ValueError as e:
+                return jsonify({
+                    "status": "error",
+                    "message": str(e)
+                }), 400
+
+            # Pagination
+            limit = None
+            cursor = None
+            if filters.get('limit') or filters.get('cursor'):
                 try:
-                    min_gpa = float(filters['min_gpa'])
-                    scholarships = [s for s in scholarships if s['min_gpa'] and float(s['min_gpa']) >= min_gpa]
+                    limit = int(filters.get('limit') or app.config.get('SCHOLARSHIPS_DEFAULT_LIMIT', 50))
+                    if limit < 1:
+                        raise ValueError("limit must be positive")
+                    limit = min(limit, app.config.get('SCHOLARSHIPS_MAX_LIMIT', 500))
+                    if filters.get('cursor'):
+                        cursor = decode_cursor(filters['cursor'])
                 except ValueError:
                     return jsonify({
                         "status": "error",
-                        "message": "Invalid min_gpa value"
+                        "message": "Invalid limit or cursor"
                     }), 400
-            
-            # Major filter
-            if filters.get('major'):
-                scholarships = [
-                    s for s in scholarships 
-                    if any(major['name'].lower() == filters['major'].lower() for major in s['major'])
-                ]
-            
-            # Sorting
-            sort_by = filters.get('sort_by', 'deadline')
-            sort_order = filters.get('sort_order', 'asc')
-            
-            if sort_by in ['deadline', 'scholarship_name', 'university']:
-                scholarships = sorted(
-                    scholarships,
-                    key=lambda x: (x[sort_by] is None, x[sort_by]),  # Handle None values
-                    reverse=(sort_order.lower() == 'desc')
-                )
-            
-            return jsonify({
+
+            canonical = canonical_catalog_query(
+                query, filters.get('sort_by', 'deadline'), filters.get('sort_order', 'asc')
+            )
+            sort_by = canonical['sort_by']
+            descending = canonical['sort_order'] == 'desc'
+            fingerprint = query_fingerprint(canonical)
+
+            # A cursor pins the catalog version it was issued for, so refreshes
+            # never make a paginating client see duplicated or skipped rows
+            if cursor is None:
+                snapshot = catalog_cache.get_snapshot()
+            else:
+                if cursor['q'] != fingerprint:
+                    return jsonify({
+                        "status": "error",
+                        "message": "Cursor does not match the query parameters"
+                    }), 400
+                snapshot = catalog_cache.get_version(cursor['v'])
+                if snapshot is None:
+                    return jsonify({
+                        "status": "error",
+                        "message": "Cursor has expired, restart from the first page"
+                    }), 410
+
+            headers = {
+                "X-Catalog-Version": str(snapshot.version),
+                "X-Catalog-Age": f"{snapshot.age:.0f}"
+            }
+            cache_key = (tuple(sorted(canonical.items())), limit, filters.get('cursor'))
+            body = result_cache.get(snapshot.version, cache_key)
+            if body is not None:
+                headers["X-Cache"] = "HIT"
+                return Response(body, 200, headers, mimetype='application/json')
+
+            # Filtering and sorting are both answered from the snapshot's indexes
+            positions = snapshot.select(
+                facets={facet: query[facet] for facet in FACETS},
+                min_gpa=query['min_gpa'],
+                deadline_after=query['deadline_after'],
+                deadline_before=query['deadline_before'],
+                sort_by=sort_by,
+                descending=descending
+            )
+
+            response = {
                 "status": "success",
-                "filters_applied": dict(filters),
-                "count": len(scholarships),
-                "scholarships": scholarships
-            }), 200
+                "filters_applied": canonical,
+                "total": len(positions),
+            }
+            if limit is not None:
+                rank = snapshot.rank_for(sort_by)
+                start = seek_after(positions, rank, cursor['r'], descending) if cursor else 0
+                page = positions[start:start + limit]
+                has_more = start + limit < len(positions)
+                response["next_cursor"] = encode_cursor(snapshot.version, rank[page[-1]], fingerprint) if has_more else None
+                positions = page
+            response["count"] = len(positions)
+
+            # Rows are encoded once per catalog version and spliced into the body
+            fragments = (snapshot.row_json(p) for p in positions)
+            if len(positions) > app.config.get('SCHOLARSHIPS_STREAM_THRESHOLD', 2000):
+                headers["X-Cache"] = "BYPASS"
+                return Response(iter_json_chunks(response, "scholarships", fragments), 200, headers,
+                                mimetype='application/json')
+
+            body = join_fragments(response, "scholarships", fragments)
+            result_cache.put(snapshot.version, cache_key, body)
+            headers["X-Cache"] = "MISS"
+            return Response(body, 200, headers, mimetype='application/json')
             
         except Exception as e:
-            app.logger.error(f"Error retrieving scholarships: {str(e)}")
+            app.logger.error("Error retrieving scholarships: %s", str(e))
             return jsonify({
                 "status": "error",
                 "message": "Failed to retrieve scholarships"
             }), 500
 
+    @app.route('/api/scholarships/facets', methods=['GET'])
+    def get_scholarship_facets():
+        """
+        Get per-value counts for the scholarship filters.
+
+        Query Parameters:
+            type, country, degree_level, major, min_gpa, deadline_after, deadline_before:
+                Currently applied filters, as for `/api/scholarships`
+
+        Returns:
+            JSON response with counts per type, country, degree level and major,
+            and a histogram of deadlines by month. Each facet is counted with
+            every applied filter except its own. `filters_applied` echoes the
+            filters in the same canonical form as `/api/scholarships`.
+        """
+        try:
+            query = parse_catalog_filters(request.args)
+        except ValueError as e:
+            return jsonify({
+                "status": "error",
+                "message": str(e)
+            }), 400
+
+        try:
+            snapshot = catalog_cache.get_snapshot()
+            counts = snapshot.facet_counts(
+                facets={facet: query[facet] for facet in FACETS},
+                min_gpa=query['min_gpa'],
+                deadline_after=query['deadline_after'],
+                deadline_before=query['deadline_before']
+            )
+            return jsonify(dict(counts, status="success", filters_applied=canonical_catalog_filters(query))), 200, {
+                "X-Catalog-Version": str(snapshot.version)
+            }
+        except Exception as e:
+            app.logger.error("Error computing scholarship facets: %s", str(e))
+            return jsonify({
+                "status": "error",
+                "message": "Failed to compute scholarship facets"
+            }), 500
+
+    @app.route('/api/scholarships/search', methods=['GET'])
+    def search_scholarships():
+        """
+        Search scholarships by keyword.
+
+        Query Parameters:
+            q (str): Keywords matched against scholarship name, university and majors
+            limit (int): Maximum number of results (default 20, max 100)
+            type, country, degree_level, major (str): Optional facet filters
+
+        Returns:
+            JSON response with the best-matching scholarships, best first
+        """
+        query = request.args.get('q', '').strip()
+        if not query:
+            return jsonify({
+                "status": "error",
+                "message": "Missing search query 'q'"
+            }), 400
+        try:
+            limit = int(request.args.get('limit', 20))
+            if limit < 1:
+                raise ValueError("limit must be positive")
+            limit = min(limit, 100)
+        except ValueError:
+            return jsonify({
+                "status": "error",
+                "message": "Invalid limit value"
+            }), 400
+
+        try:
+            snapshot = catalog_cache.get_snapshot()
+            candidates = snapshot.facet_index.match_set({facet: request.args.get(facet) for facet in FACETS})
+            results = snapshot.search_index.search(query, limit, candidates)
+            rows = snapshot.rows
+            return jsonify({
+                "status": "success",
+                "query": query,
+                "count": len(results),
+                "scholarships": [dict(rows[position], score=round(score, 4)) for position, score in results]
+            }), 200, {
+                "X-Catalog-Version": str(snapshot.version)
+            }
+        except Exception as e:
+            app.logger.error("Error searching scholarships: %s", str(e))
+            return jsonify({
+                "status": "error",
+                "message": "Failed to search scholarships"
+            }), 500
+
     ##########################################################
     #
     # Favorites Routes
@@ -306,15 +682,14 @@ def create_app(config_class=ProductionConfig):
     def get_user_favorites(user_id):
         """Get all favorites for a specific user."""
         try:
-            favorites_model = FavoritesModel(user_id)
-            favorites = favorites_model.get_favorites()
+            favorites = favorites_store.get(user_id)
             
             return jsonify({
                 "status": "success",
                 "favorites": favorites
             }), 200
         except Exception as e:
-            app.logger.error(f"Error retrieving favorites for user {user_id}: {str(e)}")
+            app.logger.error("Error retrieving favorites for user %s: %s", user_id, str(e))
             return jsonify({
                 "status": "error",
                 "message": "Failed to retrieve favorites"
@@ -326,35 +701,30 @@ def create_app(config_class=ProductionConfig):
         try:
             data = request.get_json()
             user_id = data.get('user_id')
-            scholarship_data = data.get('scholarship')
 
-            if not user_id or not scholarship_data:
+            if not user_id or not (data.get('scholarship_id') or data.get('scholarship')):
                 return jsonify({
                     "status": "error",
                     "message": "Missing user_id or scholarship data"
                 }), 400
 
-            # Create Scholarship object from the received data
-            scholarship = Scholarship(
-                university=scholarship_data.get('university'),
-                scholarship_name=scholarship_data.get('scholarship_name'),
-                type=scholarship_data.get('type'),
-                degree_level=scholarship_data.get('degree_level'),
-                country=scholarship_data.get('country'),
-                deadline=scholarship_data.get('deadline'),
-                min_gpa=scholarship_data.get('min_gpa'),
-                major=scholarship_data.get('major')
-            )
+            scholarship_id = resolve_scholarship_id(data, catalog_cache.get_snapshot())
+            if scholarship_id is None:
+                return jsonify({
+                    "status": "error",
+                    "message": "Scholarship not found"
+                }), 404
 
-            favorites_model = FavoritesModel(user_id)
-            favorites_model.add_to_favorites(scholarship)
+            added = favorites_store.add(user_id, scholarship_id)
 
             return jsonify({
                 "status": "success",
-                "message": "Scholarship added to favorites"
+                "message": "Scholarship added to favorites" if added else "Scholarship already in favorites",
+                "scholarship_id": scholarship_id,
+                "added": added
             }), 200
         except Exception as e:
-            app.logger.error(f"Error adding scholarship to favorites: {str(e)}")
+            app.logger.error("Error adding scholarship to favorites: %s", str(e))
             return jsonify({
                 "status": "error",
                 "message": "Failed to add scholarship to favorites"
@@ -366,40 +736,79 @@ def create_app(config_class=ProductionConfig):
         try:
             data = request.get_json()
             user_id = data.get('user_id')
-            scholarship_data = data.get('scholarship')
 
-            if not user_id or not scholarship_data:
+            if not user_id or not (data.get('scholarship_id') or data.get('scholarship')):
                 return jsonify({
                     "status": "error",
                     "message": "Missing user_id or scholarship data"
                 }), 400
 
-            # Create Scholarship object from the received data
-            scholarship = Scholarship(
-                university=scholarship_data.get('university'),
-                scholarship_name=scholarship_data.get('scholarship_name'),
-                type=scholarship_data.get('type'),
-                degree_level=scholarship_data.get('degree_level'),
-                country=scholarship_data.get('country'),
-                deadline=scholarship_data.get('deadline'),
-                min_gpa=scholarship_data.get('min_gpa'),
-                major=scholarship_data.get('major')
-            )
+            # Scholarships removed from the catalog can still be unfavorited by ID
+            scholarship_id = resolve_scholarship_id(data, catalog_cache.get_snapshot(), listed_only=False)
+            if scholarship_id is None:
+                return jsonify({
+                    "status": "error",
+                    "message": "Scholarship not found"
+                }), 404
 
-            favorites_model = FavoritesModel(user_id)
-            favorites_model.remove_from_favorites(scholarship)
+            removed = favorites_store.remove(user_id, scholarship_id)
 
             return jsonify({
                 "status": "success",
-                "message": "Scholarship removed from favorites"
+                "message": "Scholarship removed from favorites" if removed else "Scholarship not in favorites",
+                "scholarship_id": scholarship_id,
+                "removed": removed
             }), 200
         except Exception as e:
-            app.logger.error(f"Error removing scholarship from favorites: {str(e)}")
+            app.logger.error("Error removing scholarship from favorites: %s", str(e))
             return jsonify({
                 "status": "error",
                 "message": "Failed to remove scholarship from favorites"
             }), 500
 
+    @app.route('/api/favorites/batch', methods=['POST'])
+    def batch_favorites():
+        """Apply several add/remove operations to a user's favorites in one request."""
+        try:
+            data = request.get_json(silent=True) or {}
+            user_id = data.get('user_id')
+            operations = data.get('operations')
+
+            if not user_id or not isinstance(operations, list) or not operations:
+                return jsonify({
+                    "status": "error",
+                    "message": "Missing user_id or operations"
+                }), 400
+
+            max_operations = app.config.get('FAVORITES_BATCH_MAX_OPERATIONS', 100)
+            if len(operations) > max_operations:
+                return jsonify({
+                    "status": "error",
+                    "message": f"At most {max_operations} operations per batch"
+                }), 400
+
+            try:
+                resolved = resolve_batch_operations(operations, catalog_cache.get_snapshot())
+            except ValueError as e:
+                return jsonify({
+                    "status": "error",
+                    "message": str(e)
+                }), 400
+
+            results = favorites_store.apply_batch(user_id, resolved)
+
+            return jsonify({
+                "status": "success",
+                "applied": sum(1 for result in results if result["applied"]),
+                "results": results
+            }), 200
+        except Exception as e:
+            app.logger.error("Error applying favorites batch: %s", str(e))
+            return jsonify({
+                "status": "error",
+                "message": "Failed to apply favorites batch"
+            }), 500
+
     @app.route('/api/favorites/clear', methods=['POST'])
     def clear_favorites():
         """Clear all favorites for a user."""
@@ -413,15 +822,14 @@ def create_app(config_class=ProductionConfig):
                     "message": "Missing user_id"
                 }), 400
 
-            favorites_model = FavoritesModel(user_id)
-            favorites_model.clear_favorites()
+            favorites_store.clear(user_id)
 
             return jsonify({
                 "status": "success",
                 "message": "All favorites cleared"
             }), 200
         except Exception as e:
-            app.logger.error(f"Error clearing favorites: {str(e)}")
+            app.logger.error("Error clearing favorites: %s", str(e))
             return jsonify({
                 "status": "error",
                 "message": "Failed to clear favorites"
@@ -0,0 +1,309 @@
+"""
+Async (ASGI) serving mode.
+
+Serve with any ASGI server, e.g. `uvicorn asgi:app --workers 4`. Login,
+logout and the favorites routes run as coroutines on `redis.asyncio` and
+pymongo's `AsyncMongoClient`; password hashing and SQLAlchemy calls go to a
+bounded thread pool. Every other route is handed to the regular Flask app on
+that pool, so both serving modes answer the same API.
+"""
+import json
+import logging
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from werkzeug.exceptions import MethodNotAllowed, NotFound, Unauthorized
+from werkzeug.routing import Map, Rule
+from werkzeug.test import EnvironBuilder, run_wsgi_app
+
+from app import create_app, resolve_batch_operations, resolve_scholarship_id
+from scholarship_finder.clients.async_clients import async_clients
+from scholarship_finder.clients.mongo_client import mongo
+from scholarship_finder.instrumentation import HTTP_REQUEST_SECONDS, HTTP_REQUESTS
+from scholarship_finder.models.async_favorites_store import AsyncFavoritesStore
+from scholarship_finder.models.catalog_model import catalog_cache
+from scholarship_finder.models.favorites_model import FavoritesModel
+from scholarship_finder.models.favorites_store import favorites_store
+from scholarship_finder.models.mongo_session_model import login_user_async, logout_user_async
+from scholarship_finder.models.user_model import User
+from scholarship_finder.utils.executor import BoundedExecutor
+from scholarship_finder.utils.json_encoding import dumps
+from scholarship_finder.utils.logger import configure_logger
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+# (payload, status) returned by the native handlers
+Result = Tuple[Dict[str, Any], int]
+
+
+class AsgiApp:
+    """
+    ASGI application serving the I/O-bound routes natively and the rest through Flask.
+
+    Args:
+        flask_app (Flask): The application built by `create_app`.
+        favorites (AsyncFavoritesStore): Optional store, defaults to one over the shared `favorites_store`.
+    """
+
+    def __init__(self, flask_app, favorites: Optional[AsyncFavoritesStore] = None):
+        self.flask_app = flask_app
+        self.executor = BoundedExecutor(
+            max_workers=flask_app.config.get('ASYNC_EXECUTOR_WORKERS', 16),
+            max_pending=flask_app.config.get('ASYNC_EXECUTOR_MAX_PENDING', 256),
+            context=flask_app.app_context
+        )
+        async_clients.init_app(flask_app)
+        self.metrics_enabled = flask_app.config.get('METRICS_ENABLED', True)
+        self.favorites = favorites or AsyncFavoritesStore(favorites_store, async_clients, self.executor)
+        self.url_map = Map([
+            Rule('/api/health', endpoint='health', methods=['GET']),
+            Rule('/api/login', endpoint='login', methods=['POST']),
+            Rule('/api/logout', endpoint='logout', methods=['POST']),
+            Rule('/api/favorites/<int:user_id>', endpoint='get_favorites', methods=['GET']),
+            Rule('/api/favorites/add', endpoint='add_favorite', methods=['POST']),
+            Rule('/api/favorites/remove', endpoint='remove_favorite', methods=['POST']),
+            Rule('/api/favorites/batch', endpoint='batch_favorites', methods=['POST']),
+            Rule('/api/favorites/clear', endpoint='clear_favorites', methods=['POST']),
+        ])
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+            return
+        if scope['type'] != 'http':
+            return
+        started = time.perf_counter()
+        body = await self._read_body(receive)
+        try:
+            rule, args = self.url_map.bind('').match(scope['path'], scope['method'], return_rule=True)
+        except (NotFound, MethodNotAllowed):
+            await self._call_flask(scope, body, send)  # Timed by the Flask app's own hooks
+            return
+        try:
+            data = json.loads(body) if body else None
+        except ValueError:
+            data = None
+        payload, status = await getattr(self, rule.endpoint)(data, **args)
+        await self._send(send, status, [(b'content-type', b'application/json')], [dumps(payload)])
+        if self.metrics_enabled:
+            HTTP_REQUEST_SECONDS.observe(time.perf_counter() - started, rule.rule, scope['method'])
+            HTTP_REQUESTS.inc(rule.rule, scope['method'], str(status))
+
+    ####################################################
+    #
+    # Plumbing
+    #
+    ####################################################
+
+    async def _lifespan(self, receive, send) -> None:
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                try:
+                    # Load the catalog before taking traffic so no request waits on Notion
+                    await self.executor.run(catalog_cache.get_snapshot)
+                except Exception as e:
+                    logger.error("Could not load the catalog at startup: %s", str(e))
+                # Retried with back-off on later session access if MongoDB is not reachable yet
+                await self.executor.run(mongo.ensure_pending_indexes)
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await async_clients.aclose()
+                self.executor.shutdown(wait=True)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    @staticmethod
+    async def _read_body(receive) -> bytes:
+        chunks = []
+        while True:
+            message = await receive()
+            chunks.append(message.get('body', b''))
+            if not message.get('more_body'):
+                return b''.join(chunks)
+
+    @staticmethod
+    async def _send(send, status: int, headers: List[Tuple[bytes, bytes]], chunks) -> None:
+        await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+        for chunk in chunks:
+            await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+        await send({'type': 'http.response.body', 'body': b''})
+
+    async def _call_flask(self, scope, body: bytes, send) -> None:
+        headers = [(name.decode('latin-1'), value.decode('latin-1')) for name, value in scope.get('headers', [])]
+        builder = EnvironBuilder(
+            path=scope['path'],
+            method=scope['method'],
+            headers=headers,
+            data=body,
+            query_string=scope.get('query_string', b'').decode('latin-1'),
+            base_url=f"{scope.get('scheme', 'http')}://{dict(headers).get('host', 'localhost')}{scope.get('root_path', '')}"
+        )
+        try:
+            environ = builder.get_environ()
+        finally:
+            builder.close()
+
+        app_iter, status, response_headers = await self.executor.run(run_wsgi_app, self.flask_app, environ)
+        iterator = iter(app_iter)
+        await send({
+            'type': 'http.response.start',
+            'status': int(status.split(' ', 1)[0]),
+            'headers': [(name.lower().encode('latin-1'), value.encode('latin-1'))
+                        for name, value in response_headers.items()]
+        })
+        try:
+            # Streamed responses are pulled one chunk at a time instead of buffered
+            while True:
+                chunk = await self.executor.run(next, iterator, None)
+                if chunk is None:
+                    break
+                await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+        finally:
+            if hasattr(app_iter, 'close'):
+                await self.executor.run(app_iter.close)
+        await send({'type': 'http.response.body', 'body': b''})
+
+    async def _snapshot(self):
+        if catalog_cache.version == 0:
+            await self.executor.run(catalog_cache.get_snapshot)  # First load talks to Notion
+        return catalog_cache.get_snapshot()
+
+    ####################################################
+    #
+    # Native routes
+    #
+    ####################################################
+
+    async def health(self, data) -> Result:
+        return {'status': 'healthy'}, 200
+
+    async def login(self, data) -> Result:
+        if not isinstance(data, dict) or 'username' not in data or 'password' not in data:
+            return {"error": "Invalid request payload. 'username' and 'password' are required."}, 400
+        username = data['username']
+        try:
+            try:
+                user_id, verified = await self.executor.run(User.authenticate, username, data['password'])
+            except ValueError:
+                verified = False
+            if not verified:
+                logger.warning("Login failed for username: %s", username)
+                return {"error": str(Unauthorized("Invalid username or password."))}, 401
+
+            await self.favorites.seed(user_id, await login_user_async(user_id, sessions=self.favorites.sessions))
+            favorites = await self.favorites.get(user_id)
+            return {"message": f"User {username} logged in successfully.", "favorites": favorites}, 200
+        except Exception as e:
+            logger.error("Error during login for username %s: %s", username, str(e))
+            return {"error": "An unexpected error occurred."}, 500
+
+    async def logout(self, data) -> Result:
+        if not isinstance(data, dict) or 'username' not in data:
+            return {"error": "Invalid request payload. 'username' is required."}, 400
+        username = data['username']
+        try:
+            user_id = await self.executor.run(User.get_id_by_username, username)
+            favorites_model = FavoritesModel(user_id, await self.favorites.get_ids(user_id))
+            await logout_user_async(user_id, favorites_model, self.favorites.sessions)
+            await self.favorites.evict(user_id)
+            return {"message": f"User {username} logged out successfully."}, 200
+        except ValueError as e:
+            logger.warning("Logout failed for username %s: %s", username, str(e))
+            return {"error": str(e)}, 400
+        except Exception as e:
+            logger.error("Error during logout for username %s: %s", username, str(e))
+            return {"error": "An unexpected error occurred."}, 500
+
+    async def get_favorites(self, data, user_id: int) -> Result:
+        try:
+            return {"status": "success", "favorites": await self.favorites.get(user_id)}, 200
+        except Exception as e:
+            logger.error("Error retrieving favorites for user %s: %s", user_id, str(e))
+            return {"status": "error", "message": "Failed to retrieve favorites"}, 500
+
+    async def _change_favorite(self, data, op: str) -> Result:
+        data = data if isinstance(data, dict) else {}
+        user_id = data.get('user_id')
+        if not user_id or not (data.get('scholarship_id') or data.get('scholarship')):
+            return {"status": "error", "message": "Missing user_id or scholarship data"}, 400
+        scholarship_id = resolve_scholarship_id(data, await self._snapshot(), listed_only=op == 'add')
+        if scholarship_id is None:
+            return {"status": "error", "message": "Scholarship not found"}, 404
+
+        if op == 'add':
+            added = await self.favorites.add(user_id, scholarship_id)
+            message = "Scholarship added to favorites" if added else "Scholarship already in favorites"
+            return {"status": "success", "message": message, "scholarship_id": scholarship_id, "added": added}, 200
+        removed = await self.favorites.remove(user_id, scholarship_id)
+        message = "Scholarship removed from favorites" if removed else "Scholarship not in favorites"
+        return {"status": "success", "message": message, "scholarship_id": scholarship_id, "removed": removed}, 200
+
+    async def add_favorite(self, data) -> Result:
+        try:
+            return await self._change_favorite(data, 'add')
+        except Exception as e:
+            logger.error("Error adding scholarship to favorites: %s", str(e))
+            return {"status": "error", "message": "Failed to add scholarship to favorites"}, 500
+
+    async def remove_favorite(self, data) -> Result:
+        try:
+            return await self._change_favorite(data, 'remove')
+        except Exception as e:
+            logger.error("Error removing scholarship from favorites: %s", str(e))
+            return {"status": "error", "message": "Failed to remove scholarship from favorites"}, 500
+
+    async def batch_favorites(self, data) -> Result:
+        try:
+            data = data if isinstance(data, dict) else {}
+            user_id = data.get('user_id')
+            operations = data.get('operations')
+            if not user_id or not isinstance(operations, list) or not operations:
+                return {"status": "error", "message": "Missing user_id or operations"}, 400
+            max_operations = self.flask_app.config.get('FAVORITES_BATCH_MAX_OPERATIONS', 100)
+            if len(operations) > max_operations:
+                return {"status": "error", "message": f"At most {max_operations} operations per batch"}, 400
+            try:
+                resolved = resolve_batch_operations(operations, await self._snapshot())
+            except ValueError as e:
+                return {"status": "error", "message": str(e)}, 400
+
+            results = await self.favorites.apply_batch(user_id, resolved)
+            return {"status": "success", "applied": sum(1 for result in results if result["applied"]),
+                    "results": results}, 200
+        except Exception as e:
+            logger.error("Error applying favorites batch: %s", str(e))
+            return {"status": "error", "message": "Failed to apply favorites batch"}, 500
+
+    async def clear_favorites(self, data) -> Result:
+        try:
+            user_id = data.get('user_id') if isinstance(data, dict) else None
+            if not user_id:
+                return {"status": "error", "message": "Missing user_id"}, 400
+            await self.favorites.clear(user_id)
+            return {"status": "success", "message": "All favorites cleared"}, 200
+        except Exception as e:
+            logger.error("Error clearing favorites: %s", str(e))
+            return {"status": "error", "message": "Failed to clear favorites"}, 500
+
+
+def create_asgi_app(flask_app=None) -> AsgiApp:
+    """
+    Builds the ASGI application.
+
+    Args:
+        flask_app (Flask): The Flask app to serve the remaining routes, defaults to `create_app()`.
+
+    Returns:
+        AsgiApp: The ASGI callable.
+    """
+    return AsgiApp(flask_app or create_app())
+
+
+def __getattr__(name: str):
+    # `uvicorn asgi:app` builds the app on first access, so importing this module stays cheap
+    if name == 'app':
+        globals()['app'] = create_asgi_app()
+        return globals()['app']
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
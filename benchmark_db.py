@@ -0,0 +1,90 @@
+"""
+Measures concurrent login and signup throughput under each database engine profile.
+
+Usage:
+    python benchmark_db.py [--users 200] [--threads 8] [--seconds 5]
+
+Each profile gets a fresh file-backed SQLite database in a temporary
+directory. Worker threads mix logins (with the credential cache disabled, so
+every login reads the database) and signups, and the script prints
+operations per second and the number of "database is locked" failures.
+"""
+import argparse
+import os
+import random
+import tempfile
+import threading
+import time
+
+from sqlalchemy.exc import OperationalError
+
+from app import create_app
+from config import TestConfig
+from scholarship_finder.db import ENGINE_PROFILES, db
+from scholarship_finder.models.user_model import User
+
+
+def run_profile(profile: str, directory: str, users: int, threads: int, seconds: float, write_ratio: float) -> dict:
+    class BenchmarkConfig(TestConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(directory, profile + '.db')}"
+        SQLALCHEMY_ENGINE_PROFILE = profile
+        USER_CREDENTIAL_CACHE_SIZE = 0
+
+    app = create_app(BenchmarkConfig)
+    with app.app_context():
+        User.bulk_create_users(((i, f"user{i}", "password", None) for i in range(users)))
+
+    counts = {"logins": 0, "signups": 0, "locked": 0}
+    lock = threading.Lock()
+    deadline = time.monotonic() + seconds
+
+    def worker(number: int) -> None:
+        done = {"logins": 0, "signups": 0, "locked": 0}
+        step = 0
+        with app.app_context():
+            while time.monotonic() < deadline:
+                step += 1
+                try:
+                    if random.random() < write_ratio:
+                        User.create_user(f"signup-{number}-{step}", "password")
+                        done["signups"] += 1
+                    else:
+                        User.authenticate(f"user{step % users}", "password")
+                        done["logins"] += 1
+                except OperationalError:
+                    db.session.rollback()
+                    done["locked"] += 1
+        with lock:
+            for key, value in done.items():
+                counts[key] += value
+
+    workers = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    with app.app_context():
+        db.engine.dispose()
+    return counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=200, help="Users created before measuring.")
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=5.0, help="Measuring time per profile.")
+    parser.add_argument("--write-ratio", type=float, default=0.2, help="Share of operations that are signups.")
+    parser.add_argument("--profile", action="append", choices=[p for p in ENGINE_PROFILES if p != "server"],
+                        help="Profile to run; repeatable. Defaults to every SQLite profile.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        for profile in args.profile or ["default", "sqlite-production"]:
+            counts = run_profile(profile, directory, args.users, args.threads, args.seconds, args.write_ratio)
+            total = counts["logins"] + counts["signups"]
+            print(f"{profile:>18}: {total / args.seconds:8.1f} ops/s "
+                  f"({counts['logins']} logins, {counts['signups']} signups, {counts['locked']} locked)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,56 @@
 import os
 
+from dotenv import load_dotenv
+
+# Load environment variables from .env file, before the settings below read them
+load_dotenv()
+
 class ProductionConfig():
     """Production configuration."""
     DEBUG = False
-    SQLALCHEMY_TRACK_MODIFICATIONS = True  # This would almost universally be false in a Flask app
-                                           # But we are doing unnecessarily complicated Redis
-                                           # write-throughs
-    SQLALCHEMY_DATABASE_URI = 'sqlite:///scholarship_finder.db'  # or your preferred database URI
+    LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
+    LOG_QUEUE_SIZE = 10000  # Records waiting for the log writer thread; more are dropped and counted
+    LOG_RATE_LIMIT_PER_SECOND = 20  # INFO and DEBUG records per logging call site per second; 0 disables
+    SQLALCHEMY_TRACK_MODIFICATIONS = False  # Nothing subscribes to the modification signals
+    SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL', 'sqlite:///scholarship_finder.db')  # or your preferred database URI
+    SQLALCHEMY_ENGINE_PROFILE = os.environ.get('SQLALCHEMY_ENGINE_PROFILE', 'sqlite-production')  # See scholarship_finder.db.ENGINE_PROFILES
     NOTION_DATABASE_ID = "157b2df7f84a81e98082febf3604e719"  # Replace with your actual Notion database ID
+    CATALOG_TTL_SECONDS = int(os.environ.get('CATALOG_TTL_SECONDS', 300))  # Serve the cached catalog this long before refreshing
+    CATALOG_RETRY_SECONDS = int(os.environ.get('CATALOG_RETRY_SECONDS', 30))  # Back-off after a failed refresh
+    CATALOG_FULL_SYNC_EVERY = int(os.environ.get('CATALOG_FULL_SYNC_EVERY', 12))  # Incremental syncs between full passes
+    CATALOG_RETAINED_VERSIONS = int(os.environ.get('CATALOG_RETAINED_VERSIONS', 2))  # Old versions kept for in-flight pagination
+    CATALOG_SHARED_CACHE = os.environ.get('CATALOG_SHARED_CACHE', 'false').lower() == 'true'  # Share one catalog across workers via Redis
+    CATALOG_REDIS_PREFIX = os.environ.get('CATALOG_REDIS_PREFIX', 'catalog')
+    CATALOG_INITIAL_WAIT_SECONDS = int(os.environ.get('CATALOG_INITIAL_WAIT_SECONDS', 10))  # Cold-start wait for another worker's load
+    SCHOLARSHIPS_DEFAULT_LIMIT = 50  # Page size when a cursor is sent without a limit
+    SCHOLARSHIPS_MAX_LIMIT = 500
+    SCHOLARSHIPS_STREAM_THRESHOLD = 2000  # Larger results are streamed in chunks instead of buffered and cached
+    RESULT_CACHE_MAX_BYTES = int(os.environ.get('RESULT_CACHE_MAX_BYTES', 32 * 1024 * 1024))  # Memory budget for cached responses
+    USER_CREDENTIAL_CACHE_SIZE = 10000  # Users whose (id, salt, hash) are kept in memory per worker
+    USER_CREDENTIAL_CACHE_TTL_SECONDS = 60  # Bounds staleness without shared invalidation, or after an invalidation fails to reach Redis
+    USER_CREDENTIAL_CACHE_SHARED = os.environ.get('USER_CREDENTIAL_CACHE_SHARED', 'true').lower() == 'true'  # Invalidate across workers via Redis
+    USER_IMPORT_BATCH_SIZE = 1000  # Users inserted per transaction by bulk imports
+    MONGO_MAX_POOL_SIZE = int(os.environ.get('MONGO_MAX_POOL_SIZE', 50))  # Connections per worker process
+    MONGO_MIN_POOL_SIZE = int(os.environ.get('MONGO_MIN_POOL_SIZE', 0))
+    MONGO_MAX_IDLE_TIME_MS = 60000
+    MONGO_CONNECT_TIMEOUT_MS = int(os.environ.get('MONGO_CONNECT_TIMEOUT_MS', 2000))
+    MONGO_SOCKET_TIMEOUT_MS = int(os.environ.get('MONGO_SOCKET_TIMEOUT_MS', 5000))
+    MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.environ.get('MONGO_SERVER_SELECTION_TIMEOUT_MS', 3000))  # Fail fast instead of pymongo's 30s default
+    MONGO_WAIT_QUEUE_TIMEOUT_MS = 2000  # Max wait for a free pooled connection
+    REDIS_CONNECT_TIMEOUT_MS = int(os.environ.get('REDIS_CONNECT_TIMEOUT_MS', 1000))
+    REDIS_SOCKET_TIMEOUT_MS = int(os.environ.get('REDIS_SOCKET_TIMEOUT_MS', 2000))  # Redis failures fall back instead of hanging
+    MONGO_ENSURE_INDEXES = True  # Create the unique sessions.user_id index at startup
+    FAVORITES_REDIS_PREFIX = os.environ.get('FAVORITES_REDIS_PREFIX', 'favorites')
+    FAVORITES_BATCH_MAX_OPERATIONS = 100
+    FAVORITES_CACHE_TTL_SECONDS = int(os.environ.get('FAVORITES_CACHE_TTL_SECONDS', 86400))  # Idle users are re-read from MongoDB
+    FAVORITES_WRITE_BEHIND = os.environ.get('FAVORITES_WRITE_BEHIND', 'false').lower() == 'true'  # Acknowledge after Redis, flush to MongoDB in batches
+    FAVORITES_FLUSH_INTERVAL_SECONDS = float(os.environ.get('FAVORITES_FLUSH_INTERVAL_SECONDS', 1.0))
+    FAVORITES_FLUSH_BATCH_SIZE = 100  # Users per bulk_write
+    FAVORITES_MAX_PENDING_USERS = 10000  # Beyond this, writes wait for the flusher, then go synchronously
+    FAVORITES_ENQUEUE_TIMEOUT_SECONDS = 0.5
+    ASYNC_EXECUTOR_WORKERS = int(os.environ.get('ASYNC_EXECUTOR_WORKERS', 16))  # Threads for blocking calls in the ASGI app
+    ASYNC_EXECUTOR_MAX_PENDING = 256  # Blocking calls queued on the pool; more wait on the event loop
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'true').lower() == 'true'  # Request timing and /api/metrics
     
 class TestConfig():
     """Testing configuration."""
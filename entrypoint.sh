@@ -13,5 +13,5 @@ else
     echo "Skipping database creation."
 fi
 
-# Start the Python application
-exec python app.py
+# Start the production server; settings are read from gunicorn.conf.py
+exec gunicorn wsgi:app
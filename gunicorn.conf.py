@@ -0,0 +1,37 @@
+import multiprocessing
+import os
+
+# Server socket
+bind = os.environ.get('BIND', '0.0.0.0:5000')
+
+# Workers: processes for every core, threads for requests waiting on Redis, MongoDB or SQLite
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count()))
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+worker_class = 'gthread'
+
+# Load the app and warm the catalog in the master, before forking
+preload_app = True
+
+# On SIGTERM workers stop accepting and get this long to finish in-flight requests
+graceful_timeout = int(os.environ.get('GRACEFUL_TIMEOUT', 30))
+timeout = int(os.environ.get('WORKER_TIMEOUT', 60))
+keepalive = 5
+
+# Recycle workers now and then to bound memory growth
+max_requests = int(os.environ.get('MAX_REQUESTS', 10000))
+max_requests_jitter = 1000
+
+accesslog = '-'
+errorlog = '-'
+
+
+def post_fork(server, worker):
+    from wsgi import app
+    from scholarship_finder.server import reset_after_fork
+    reset_after_fork(app)
+
+
+def worker_exit(server, worker):
+    from wsgi import app
+    from scholarship_finder.server import shutdown
+    shutdown(app)
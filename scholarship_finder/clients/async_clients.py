@@ -0,0 +1,83 @@
+import asyncio
+import logging
+import weakref
+from typing import Any, Dict, Optional
+
+from scholarship_finder.clients.mongo_client import MONGO_DB_NAME, command_timer, mongo
+from scholarship_finder.clients.redis_client import redis_connection
+from scholarship_finder.utils.logger import configure_logger
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+class AsyncClients:
+    """
+    Redis and MongoDB clients for coroutines, created lazily per event loop.
+
+    `redis.asyncio` connections and pymongo's `AsyncMongoClient` belong to the
+    event loop they were first used on, so each loop (normally one per worker
+    process) gets its own pair. Connection, pool and timeout settings are the
+    ones the synchronous clients were configured with.
+    """
+
+    def __init__(self):
+        self._clients: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()  # event loop -> {name: client}
+
+    def init_app(self, app) -> None:
+        """
+        Registers the clients with the Flask app.
+
+        Args:
+            app (Flask): The application.
+        """
+        app.extensions['async_clients'] = self
+
+    def _loop_clients(self) -> Dict[str, Any]:
+        loop = asyncio.get_running_loop()
+        clients = self._clients.get(loop)
+        if clients is None:
+            clients = self._clients[loop] = {}
+        return clients
+
+    @property
+    def redis(self):
+        """ Returns: The `redis.asyncio.Redis` client for the running event loop. """
+        clients = self._loop_clients()
+        if 'redis' not in clients:
+            import redis.asyncio
+            logger.info("Connecting async Redis client to %s:%s", redis_connection.host, redis_connection.port)
+            clients['redis'] = redis.asyncio.Redis(**redis_connection.options)
+        return clients['redis']
+
+    @property
+    def mongo_client(self):
+        """ Returns: The `AsyncMongoClient` for the running event loop. """
+        clients = self._loop_clients()
+        if 'mongo' not in clients:
+            from pymongo import AsyncMongoClient
+            logger.info("Connecting async MongoDB client to %s:%d", mongo.host, mongo.port)
+            clients['mongo'] = AsyncMongoClient(host=mongo.host, port=mongo.port, connect=False,
+                                                event_listeners=[command_timer()], **mongo.options)
+        return clients['mongo']
+
+    @property
+    def sessions(self):
+        """ Returns: The 'sessions' collection on the async MongoDB client. """
+        if mongo.indexes_due:
+            # Created with the synchronous client, off the event loop; see `LazyMongoClient.ensure_pending_indexes`
+            asyncio.get_running_loop().run_in_executor(None, mongo.ensure_pending_indexes)
+        return self.mongo_client[MONGO_DB_NAME]['sessions']
+
+    async def aclose(self) -> None:
+        """ Closes the running event loop's clients. """
+        clients: Optional[Dict[str, Any]] = self._clients.pop(asyncio.get_running_loop(), None)
+        if not clients:
+            return
+        if 'redis' in clients:
+            await clients['redis'].aclose()
+        if 'mongo' in clients:
+            await clients['mongo'].close()
+
+
+async_clients = AsyncClients()
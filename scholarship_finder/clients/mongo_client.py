@@ -1,7 +1,14 @@
 import logging
 import os
-from pymongo import MongoClient
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
 from scholarship_finder.utils.logger import configure_logger
+from scholarship_finder.utils.metrics import FAST_BUCKETS, metrics
+
+if TYPE_CHECKING:
+    from pymongo import MongoClient
 
 # Set up a logger for tracking application events and errors
 logger = logging.getLogger(__name__)
@@ -12,15 +19,171 @@ configure_logger(logger)
 # Read MongoDB host and port from environment variables, or use default values if not set
 MONGO_HOST = os.environ.get('MONGO_HOST', 'localhost')  # Default host: localhost
 MONGO_PORT = int(os.environ.get('MONGO_PORT', 27017))   # Default port: 27017
+MONGO_DB_NAME = 'scholarship_finder'
+INDEX_RETRY_SECONDS = 30  # Back-off after failing to create the indexes
+
+# Flask config keys mapped to MongoClient keyword arguments
+_CLIENT_OPTIONS = {
+    'MONGO_MAX_POOL_SIZE': 'maxPoolSize',
+    'MONGO_MIN_POOL_SIZE': 'minPoolSize',
+    'MONGO_MAX_IDLE_TIME_MS': 'maxIdleTimeMS',
+    'MONGO_CONNECT_TIMEOUT_MS': 'connectTimeoutMS',
+    'MONGO_SOCKET_TIMEOUT_MS': 'socketTimeoutMS',
+    'MONGO_SERVER_SELECTION_TIMEOUT_MS': 'serverSelectionTimeoutMS',
+    'MONGO_WAIT_QUEUE_TIMEOUT_MS': 'waitQueueTimeoutMS',
+}
+
+MONGO_COMMAND_SECONDS = metrics.histogram(
+    "mongo_command_duration_seconds", "MongoDB command round trips, as reported by the driver.",
+    ("command", "outcome"), buckets=FAST_BUCKETS
+)
+
+
+def command_timer():
+    """
+    Builds a pymongo command listener that records every command in `MONGO_COMMAND_SECONDS`.
+
+    pymongo measures the duration itself, so the listener only files it away.
+
+    Returns:
+        CommandListener: The listener, to pass in a client's `event_listeners`.
+    """
+    from pymongo import monitoring
+
+    class CommandTimer(monitoring.CommandListener):
+        def started(self, event) -> None:
+            pass
+
+        def succeeded(self, event) -> None:
+            MONGO_COMMAND_SECONDS.observe(event.duration_micros / 1e6, event.command_name, "ok")
+
+        def failed(self, event) -> None:
+            MONGO_COMMAND_SECONDS.observe(event.duration_micros / 1e6, event.command_name, "error")
+
+    return CommandTimer()
+
+
+class LazyMongoClient:
+    """
+    Per-process MongoDB client, created on first use.
+
+    MongoClient is not fork-safe: its pool and monitor threads must not be
+    shared with a forked child. The client is therefore built lazily and
+    rebuilt whenever it is accessed from a different process than the one
+    that created it, so a prefork server's master never hands its
+    connections to workers. pymongo itself is only imported then, and the
+    indexes requested by `init_app` are created on first use, so starting
+    the app never waits on MongoDB.
+    """
+
+    def __init__(self, host: str = MONGO_HOST, port: int = MONGO_PORT, db_name: str = MONGO_DB_NAME):
+        self.host = host
+        self.port = port
+        self.db_name = db_name
+        self.options: Dict[str, Any] = {}
+        self._client: Optional["MongoClient"] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+        self._index_lock = threading.Lock()
+        self._indexes_pending = False
+        self._next_index_attempt = 0.0
+
+    def init_app(self, app) -> None:
+        """
+        Reads pool and timeout settings from the Flask config and, if
+        `MONGO_ENSURE_INDEXES` is set, schedules the indexes the app relies on
+        to be created on first use.
+
+        Args:
+            app (Flask): The application whose config holds the `MONGO_*` settings.
+        """
+        self.host = app.config.get('MONGO_HOST', self.host)
+        self.port = int(app.config.get('MONGO_PORT', self.port))
+        self.options = {option: app.config[key] for key, option in _CLIENT_OPTIONS.items()
+                        if app.config.get(key) is not None}
+        self.reset()
+        self._indexes_pending = bool(app.config.get('MONGO_ENSURE_INDEXES'))
+        self._next_index_attempt = 0.0
+        app.extensions['mongo'] = self
+
+    @property
+    def client(self) -> "MongoClient":
+        """ Returns: The MongoClient for the current process. """
+        pid = os.getpid()
+        if self._client is None or self._pid != pid:
+            with self._lock:
+                if self._client is None or self._pid != pid:
+                    from pymongo import MongoClient
+                    # Log a message indicating the connection attempt to MongoDB
+                    logger.info("Connecting to MongoDB at %s:%d (pid %d)", self.host, self.port, pid)
+                    self._client = MongoClient(host=self.host, port=self.port, connect=False,
+                                               event_listeners=[command_timer()], **self.options)
+                    self._pid = pid
+        return self._client
+
+    @property
+    def db(self):
+        """ Returns: The 'scholarship_finder' database. """
+        return self.client[self.db_name]
+
+    @property
+    def sessions(self):
+        """ Returns: The 'sessions' collection. """
+        if self.indexes_due:
+            self.ensure_pending_indexes()
+        return self.db['sessions']
+
+    @property
+    def indexes_due(self) -> bool:
+        """ Returns: Whether indexes requested by `init_app` still need creating and an attempt may start now. """
+        return self._indexes_pending and time.monotonic() >= self._next_index_attempt
+
+    def ensure_pending_indexes(self) -> bool:
+        """
+        Creates the indexes requested by `init_app`, unless they already exist
+        or another thread is creating them. A failed attempt is retried on a
+        later access, after `INDEX_RETRY_SECONDS`.
+
+        Returns:
+            bool: True once no indexes are pending.
+        """
+        if not self.indexes_due or not self._index_lock.acquire(blocking=False):
+            return not self._indexes_pending
+        try:
+            if self._indexes_pending:
+                self.ensure_indexes()
+                self._indexes_pending = False
+        except Exception as e:
+            self._next_index_attempt = time.monotonic() + INDEX_RETRY_SECONDS
+            logger.error("Could not ensure MongoDB indexes, retrying in %d s: %s", INDEX_RETRY_SECONDS, str(e))
+        finally:
+            self._index_lock.release()
+        return not self._indexes_pending
+
+    def ensure_indexes(self) -> None:
+        """ Creates the unique index on `sessions.user_id` used by every session lookup. """
+        from pymongo import ASCENDING
+        self.db['sessions'].create_index([("user_id", ASCENDING)], unique=True, name="user_id_unique")
+        logger.info("Ensured unique index on sessions.user_id.")
+
+    def reset(self) -> None:
+        """ Drops the current client so the next access builds a new one; used after fork. """
+        with self._lock:
+            if self._client is not None and self._pid == os.getpid():
+                self._client.close()
+            self._client = None
+            self._pid = None
 
-# Log a message indicating the connection attempt to MongoDB
-logger.info("Connecting to MongoDB at %s:%d", MONGO_HOST, MONGO_PORT)
 
-# Initialize a MongoDB client using the host and port
-mongo_client = MongoClient(host=MONGO_HOST, port=MONGO_PORT)
+mongo = LazyMongoClient()
 
-# Access the 'scholarship_finder' database
-db = mongo_client['scholarship_finder']
 
-# Access the 'sessions' collection within the database
-sessions_collection = db['sessions']
+def __getattr__(name: str):
+    # Module attributes kept for existing imports; resolved per access so they stay lazy
+    if name == 'mongo_client':
+        return mongo.client
+    if name == 'db':
+        return mongo.db
+    if name == 'sessions_collection':
+        return mongo.sessions
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
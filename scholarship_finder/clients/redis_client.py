@@ -1,7 +1,7 @@
 import logging
 import os
-
-import redis
+import threading
+from typing import Any, Dict, Optional
 
 from scholarship_finder.utils.logger import configure_logger
 
@@ -13,6 +13,84 @@ configure_logger(logger)
 REDIS_HOST = os.environ.get('REDIS_HOST', 'localhost')
 REDIS_PORT = os.environ.get('REDIS_PORT', 6379)
 REDIS_DB = os.environ.get('REDIS_DB', 0)
+REDIS_CONNECT_TIMEOUT_MS = int(os.environ.get('REDIS_CONNECT_TIMEOUT_MS', 1000))
+REDIS_SOCKET_TIMEOUT_MS = int(os.environ.get('REDIS_SOCKET_TIMEOUT_MS', 2000))
+
+
+class LazyRedisClient:
+    """
+    Per-process Redis client, created on first use.
+
+    Nothing is imported or connected until a route needs Redis, so importing
+    the app and `create_app()` work with Redis down. A process other than the
+    one that built the client gets a new one, as with `LazyMongoClient`.
+    Connects and commands time out after a few seconds, so callers that fall
+    back when Redis is unreachable do so quickly instead of hanging.
+    """
+
+    def __init__(self, host: str = REDIS_HOST, port: int = REDIS_PORT, db: int = REDIS_DB,
+                 connect_timeout_ms: int = REDIS_CONNECT_TIMEOUT_MS, socket_timeout_ms: int = REDIS_SOCKET_TIMEOUT_MS):
+        self.host = host
+        self.port = int(port)
+        self.db = int(db)
+        self.connect_timeout_ms = connect_timeout_ms
+        self.socket_timeout_ms = socket_timeout_ms
+        self._client = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app) -> None:
+        """
+        Reads connection settings from the Flask config, if present.
+
+        Args:
+            app (Flask): The application whose config may hold `REDIS_HOST`, `REDIS_PORT`, `REDIS_DB` and
+                the `REDIS_*_TIMEOUT_MS` settings.
+        """
+        self.host = app.config.get('REDIS_HOST', self.host)
+        self.port = int(app.config.get('REDIS_PORT', self.port))
+        self.db = int(app.config.get('REDIS_DB', self.db))
+        self.connect_timeout_ms = int(app.config.get('REDIS_CONNECT_TIMEOUT_MS', self.connect_timeout_ms))
+        self.socket_timeout_ms = int(app.config.get('REDIS_SOCKET_TIMEOUT_MS', self.socket_timeout_ms))
+        self.reset()
+        app.extensions['redis'] = self
+
+    @property
+    def options(self) -> Dict[str, Any]:
+        """ Returns: The keyword arguments shared by the sync and async Redis clients. """
+        return {
+            'host': self.host,
+            'port': self.port,
+            'db': self.db,
+            'socket_connect_timeout': self.connect_timeout_ms / 1000,
+            'socket_timeout': self.socket_timeout_ms / 1000,
+        }
+
+    @property
+    def client(self):
+        """ Returns: The `redis.StrictRedis` client for the current process. """
+        pid = os.getpid()
+        if self._client is None or self._pid != pid:
+            with self._lock:
+                if self._client is None or self._pid != pid:
+                    import redis
+                    logger.info("Connecting to Redis at %s:%s (pid %d)", self.host, self.port, pid)
+                    self._client = redis.StrictRedis(**self.options)
+                    self._pid = pid
+        return self._client
+
+    def reset(self) -> None:
+        """ Drops the current client so the next access builds a new one. """
+        with self._lock:
+            self._client = None
+            self._pid = None
+
+
+redis_connection = LazyRedisClient()
+
 
-logger.info("Connecting to Redis at %s:%s", REDIS_HOST, REDIS_PORT)
-redis_client = redis.StrictRedis(host=REDIS_HOST, port=REDIS_PORT, db=REDIS_DB)
\ No newline at end of file
+def __getattr__(name: str):
+    # Kept for existing imports; resolved per access so it stays lazy
+    if name == 'redis_client':
+        return redis_connection.client
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
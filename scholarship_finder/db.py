@@ -1,3 +1,159 @@
+import logging
+import time
+from typing import Any, Dict
+
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event
+
+from scholarship_finder.utils.logger import configure_logger
+from scholarship_finder.utils.metrics import FAST_BUCKETS, metrics
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
 
 db = SQLAlchemy()
+
+DB_QUERY_SECONDS = metrics.histogram(
+    "db_query_duration_seconds", "SQL statement execution time, by dialect and statement type.",
+    ("dialect", "operation"), buckets=FAST_BUCKETS
+)
+
+# Named engine profiles: SQLAlchemy engine options plus SQLite pragmas run on every new connection
+ENGINE_PROFILES: Dict[str, Dict[str, Any]] = {
+    # SQLAlchemy's defaults: rollback journal, no busy timeout
+    "default": {
+        "engine_options": {},
+        "pragmas": {},
+    },
+    # File-backed SQLite serving concurrent workers: readers never block the writer under WAL,
+    # writers wait for the lock instead of failing with "database is locked"
+    "sqlite-production": {
+        "engine_options": {
+            "connect_args": {"timeout": 5, "check_same_thread": False},
+            "pool_pre_ping": False,
+        },
+        "pragmas": {
+            "journal_mode": "WAL",
+            "busy_timeout": 5000,       # ms
+            "synchronous": "NORMAL",    # Durable across app crashes; WAL makes FULL unnecessary
+            "cache_size": -64000,       # Negative means KiB: 64 MiB page cache per connection
+            "temp_store": "MEMORY",
+            "foreign_keys": "ON",
+        },
+    },
+    # Networked databases (PostgreSQL, MySQL): bounded pool, stale connections detected before use
+    "server": {
+        "engine_options": {
+            "pool_size": 10,
+            "max_overflow": 20,
+            "pool_timeout": 10,
+            "pool_recycle": 1800,
+            "pool_pre_ping": True,
+        },
+        "pragmas": {},
+    },
+}
+
+
+def _tracking_consumed() -> bool:
+    from flask_sqlalchemy.track_modifications import before_models_committed, models_committed
+    return bool(models_committed.receivers or before_models_committed.receivers)
+
+
+def configure_engine(app) -> Dict[str, Any]:
+    """
+    Applies the engine profile named by `SQLALCHEMY_ENGINE_PROFILE` to the app config.
+
+    Must run before `db.init_app(app)`. Options already in
+    `SQLALCHEMY_ENGINE_OPTIONS` and pragmas in `SQLITE_PRAGMAS` override the
+    profile's. Modification tracking is switched off when no signal receiver
+    consumes it.
+
+    Args:
+        app (Flask): The application to configure.
+
+    Returns:
+        dict: The SQLite pragmas to install with `install_pragmas` once the engine exists.
+
+    Raises:
+        ValueError: If the profile name is unknown.
+    """
+    name = app.config.get('SQLALCHEMY_ENGINE_PROFILE', 'default')
+    if name not in ENGINE_PROFILES:
+        raise ValueError(f"Unknown engine profile: {name}")
+    profile = ENGINE_PROFILES[name]
+    uri = app.config.get('SQLALCHEMY_DATABASE_URI') or ''
+    is_sqlite = uri.startswith('sqlite')
+
+    options = dict(profile["engine_options"])
+    if not is_sqlite:
+        options.pop("connect_args", None)  # SQLite-specific arguments
+    options.update(app.config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = options
+
+    if app.config.get('SQLALCHEMY_TRACK_MODIFICATIONS') and not _tracking_consumed():
+        logger.info("Nothing consumes SQLAlchemy modification signals; turning tracking off.")
+        app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+
+    pragmas = dict(profile["pragmas"]) if is_sqlite else {}
+    pragmas.update(app.config.get('SQLITE_PRAGMAS') or {})
+    logger.info("Using database engine profile '%s'.", name)
+    return pragmas
+
+
+def install_pragmas(engine, pragmas: Dict[str, Any]) -> None:
+    """
+    Runs the given PRAGMA statements on every new connection of a SQLite engine.
+
+    Args:
+        engine (Engine): The SQLAlchemy engine.
+        pragmas (dict): Pragma name to value.
+    """
+    if not pragmas or engine.dialect.name != 'sqlite':
+        return
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma, value in pragmas.items():
+                cursor.execute(f"PRAGMA {pragma}={value}")
+        finally:
+            cursor.close()
+
+
+def _before_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('query_started', []).append(time.perf_counter())
+
+
+def _operation(statement: str) -> str:
+    words = statement[:16].split(None, 1)  # Only the leading keyword: SELECT, INSERT, PRAGMA...
+    return words[0].upper() if words else "OTHER"
+
+
+def _after_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get('query_started')
+    if started:
+        DB_QUERY_SECONDS.observe(time.perf_counter() - started.pop(), conn.dialect.name, _operation(statement))
+
+
+def _on_error(exception_context):
+    conn = exception_context.connection
+    started = conn.info.get('query_started') if conn is not None else None
+    if started and exception_context.statement is not None:
+        DB_QUERY_SECONDS.observe(time.perf_counter() - started.pop(), conn.dialect.name, "ERROR")
+
+
+def install_query_timer(engine) -> None:
+    """
+    Records the execution time of every statement on the engine in `DB_QUERY_SECONDS`.
+
+    Safe to call more than once for the same engine.
+
+    Args:
+        engine (Engine): The SQLAlchemy engine.
+    """
+    if not event.contains(engine, "before_cursor_execute", _before_execute):
+        event.listen(engine, "before_cursor_execute", _before_execute)
+        event.listen(engine, "after_cursor_execute", _after_execute)
+        event.listen(engine, "handle_error", _on_error)
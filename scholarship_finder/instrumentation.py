@@ -0,0 +1,118 @@
+import logging
+import time
+
+from flask import g, request
+
+from scholarship_finder.models.catalog_model import catalog_cache
+from scholarship_finder.models.favorites_store import favorites_store
+from scholarship_finder.models.user_model import credential_cache
+from scholarship_finder.utils.logger import configure_logger, logging_stats
+from scholarship_finder.utils.metrics import metrics
+from scholarship_finder.utils.result_cache import result_cache
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+HTTP_REQUESTS = metrics.counter(
+    "http_requests_total", "Requests handled, by route template, method and status code.",
+    ("route", "method", "status")
+)
+HTTP_REQUEST_SECONDS = metrics.histogram(
+    "http_request_duration_seconds", "Time from the start of a request to its response, by route template.",
+    ("route", "method")
+)
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+def _start_timer() -> None:
+    g.metrics_started = time.perf_counter()
+
+
+def _record(status: int) -> None:
+    started = g.pop('metrics_started', None)
+    if started is None:
+        return  # Already recorded, or the request never reached before_request
+    # The rule template rather than the path, so IDs in URLs do not multiply the series
+    route = request.url_rule.rule if request.url_rule is not None else UNMATCHED_ROUTE
+    HTTP_REQUEST_SECONDS.observe(time.perf_counter() - started, route, request.method)
+    HTTP_REQUESTS.inc(route, request.method, str(status))
+
+
+def _record_response(response):
+    _record(response.status_code)
+    return response
+
+
+def _record_unhandled(exc) -> None:
+    # after_request does not run when an exception escapes the app
+    if exc is not None:
+        _record(500)
+
+
+def _catalog_gauges() -> None:
+    metrics.gauge("catalog_version", "Version of the catalog snapshot being served, 0 before the first load.",
+                  lambda: [((), catalog_cache.version)])
+    metrics.gauge("catalog_age_seconds", "Seconds since the served catalog was loaded or confirmed current.",
+                  lambda: [((), catalog_cache.age)])
+    metrics.gauge("catalog_rows", "Scholarships in the served catalog.",
+                  lambda: [((), catalog_cache.row_count)])
+
+
+def _cache_gauges() -> None:
+    caches = {"result": result_cache, "credential": credential_cache}
+
+    def stat(key):
+        return lambda: [((name,), cache.stats()[key]) for name, cache in caches.items()]
+
+    metrics.gauge("cache_hits_total", "Lookups answered from the cache.", stat("hits"), ("cache",), kind="counter")
+    metrics.gauge("cache_misses_total", "Lookups the cache could not answer.", stat("misses"), ("cache",),
+                  kind="counter")
+    metrics.gauge("cache_hit_ratio", "Hits over lookups since start.", stat("hit_ratio"), ("cache",))
+    metrics.gauge("cache_entries", "Entries currently held.", stat("entries"), ("cache",))
+
+
+def _writer_gauges() -> None:
+    def stat(key):
+        def collect():
+            writer = favorites_store.writer
+            return [((), writer.stats()[key])] if writer is not None else []
+        return collect
+
+    metrics.gauge("favorites_write_behind_queue_depth", "Users with favorites changes not yet written to MongoDB.",
+                  stat("queue_depth"))
+    metrics.gauge("favorites_write_behind_lag_seconds", "Age of the oldest pending favorites change.",
+                  stat("lag_seconds"))
+    metrics.gauge("favorites_write_behind_failures_total", "Failed write-behind batches.", stat("failures"),
+                  kind="counter")
+
+
+def _logging_gauges() -> None:
+    metrics.gauge("log_queue_depth", "Log records waiting for the background writer.",
+                  lambda: [((), logging_stats()["queue_depth"])])
+    metrics.gauge("log_records_dropped_total", "Log records dropped because the queue was full.",
+                  lambda: [((), logging_stats()["dropped"])], kind="counter")
+    metrics.gauge("log_records_rate_limited_total", "Log records suppressed by the per-call-site rate limit.",
+                  lambda: [((), logging_stats()["rate_limited"])], kind="counter")
+
+
+def init_metrics(app) -> None:
+    """
+    Times every request and registers the gauges read at scrape time.
+
+    Does nothing when `METRICS_ENABLED` is false. Requests are labelled with
+    their route template, so the number of series stays bounded.
+
+    Args:
+        app (Flask): The application.
+    """
+    if not app.config.get('METRICS_ENABLED', True):
+        return
+    app.before_request(_start_timer)
+    app.after_request(_record_response)
+    app.teardown_request(_record_unhandled)
+    _catalog_gauges()
+    _cache_gauges()
+    _writer_gauges()
+    _logging_gauges()
+    app.extensions['metrics'] = metrics
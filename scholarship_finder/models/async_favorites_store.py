@@ -0,0 +1,213 @@
+import logging
+import time
+from typing import Any, Dict, List, Mapping, Sequence, Tuple
+
+from scholarship_finder.models.favorites_store import (CHANGE_IF_LOADED, LOADED_FIELD, SESSION_PROJECTION,
+                                                       FavoritesStore, batch_changes, change_args, favorite_update,
+                                                       is_loaded, needs_migration, ordered_ids, plan_batch,
+                                                       present_ids, queue_cache, stored_favorites)
+from scholarship_finder.utils.logger import configure_logger
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+class AsyncFavoritesStore:
+    """
+    Coroutine counterpart of `FavoritesStore` for the ASGI app.
+
+    Reads and writes the same Redis hashes and Mongo `sessions` documents as
+    the synchronous store, through `redis.asyncio` and `AsyncMongoClient`, and
+    shares its prefix, TTL, catalog and write-behind flusher, so both apps can
+    serve the same users side by side. Decisions and pipelines come from the
+    same helpers as `FavoritesStore`; only the I/O is awaited here. Rare
+    blocking work (migrating legacy favorites, flushing the write-behind
+    queue) goes to the bounded executor.
+    """
+
+    def __init__(self, store: FavoritesStore, clients, executor, redis_client=None, sessions_collection=None):
+        self.store = store
+        self.clients = clients
+        self.executor = executor
+        self._redis = redis_client
+        self._sessions = sessions_collection
+
+    @property
+    def redis(self):
+        return self._redis if self._redis is not None else self.clients.redis
+
+    @property
+    def sessions(self):
+        return self._sessions if self._sessions is not None else self.clients.sessions
+
+    @property
+    def writer(self):
+        return self.store.writer
+
+    async def _load_from_mongo(self, user_id: int) -> List[str]:
+        session = await self.sessions.find_one({"user_id": user_id}, SESSION_PROJECTION)
+        return await self._to_ids(user_id, stored_favorites(session))
+
+    async def _to_ids(self, user_id: int, stored: List[Any]) -> List[str]:
+        if needs_migration(stored):
+            return await self.executor.run(self.store._migrate, user_id, stored)
+        return stored
+
+    async def _cache(self, user_id: int, scholarship_ids: List[str]) -> None:
+        await queue_cache(self.redis.pipeline(), self.store._key(user_id), scholarship_ids, self.store.ttl).execute()
+
+    async def _reload(self, user_id: int) -> List[str]:
+        scholarship_ids = await self._load_from_mongo(user_id)
+        await self._cache(user_id, scholarship_ids)
+        return scholarship_ids
+
+    async def _change(self, user_id: int, changes: List[Tuple[str, str, str]]) -> int:
+        key = self.store._key(user_id)
+        args = change_args(changes, self.store.ttl)
+        while True:
+            changed = await self.redis.eval(CHANGE_IF_LOADED, 1, key, *args)
+            if changed >= 0:
+                return changed
+            await self._reload(user_id)
+
+    async def _mark_dirty(self, user_id: int) -> None:
+        # Usually instant; blocks only when the write-behind queue is full
+        await self.executor.run(self.writer.mark_dirty, user_id)
+
+    async def seed(self, user_id: int, stored: List[Any]) -> None:
+        """
+        Caches favorites just read from the user's session, unless a copy is already in Redis.
+
+        Args:
+            user_id (int): The user's ID.
+            stored (list): The `favorites` array of the user's session document.
+        """
+        if not await self.redis.hexists(self.store._key(user_id), LOADED_FIELD):
+            await self._cache(user_id, await self._to_ids(user_id, stored))
+
+    async def get_ids(self, user_id: int) -> List[str]:
+        """
+        Returns a user's favorite scholarship IDs in the order they were added.
+
+        Args:
+            user_id (int): The user's ID.
+
+        Returns:
+            list: The scholarship IDs.
+        """
+        entries = await self.redis.hgetall(self.store._key(user_id))
+        if not is_loaded(entries):
+            logger.debug("Favorites cache miss for user ID %d; reading from MongoDB.", user_id)
+            return await self._reload(user_id)
+        return ordered_ids(entries)
+
+    async def get(self, user_id: int) -> List[Dict[str, Any]]:
+        """
+        Returns a user's favorites, hydrated from the current catalog.
+
+        Args:
+            user_id (int): The user's ID.
+
+        Returns:
+            list: The favorited scholarships in the catalog row format.
+        """
+        scholarship_ids = await self.get_ids(user_id)
+        return self.store.catalog.get_snapshot().rows_by_id(scholarship_ids)
+
+    async def add(self, user_id: int, scholarship_id: str) -> bool:
+        """
+        Adds a scholarship to a user's favorites.
+
+        Args:
+            user_id (int): The user's ID.
+            scholarship_id (str): The scholarship's ID.
+
+        Returns:
+            bool: True if it was added, False if it was already a favorite.
+        """
+        if not await self._change(user_id, [("setnx", scholarship_id, str(time.time_ns()))]):
+            return False
+        if self.writer is not None:
+            await self._mark_dirty(user_id)
+            return True
+        try:
+            await self.sessions.update_one({"user_id": user_id}, favorite_update("add", scholarship_id), upsert=True)
+        except Exception:
+            await self.redis.hdel(self.store._key(user_id), scholarship_id)
+            raise
+        return True
+
+    async def remove(self, user_id: int, scholarship_id: str) -> bool:
+        """
+        Removes a scholarship from a user's favorites.
+
+        Args:
+            user_id (int): The user's ID.
+            scholarship_id (str): The scholarship's ID.
+
+        Returns:
+            bool: True if it was removed, False if it was not a favorite.
+        """
+        if not await self._change(user_id, [("del", scholarship_id, "")]):
+            return False
+        if self.writer is not None:
+            await self._mark_dirty(user_id)
+            return True
+        try:
+            await self.sessions.update_one({"user_id": user_id}, favorite_update("remove", scholarship_id))
+        except Exception:
+            await self.evict(user_id)
+            raise
+        return True
+
+    async def apply_batch(self, user_id: int, operations: Sequence[Mapping[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Applies add and remove operations in order, with one MongoDB `bulk_write`.
+
+        Args:
+            user_id (int): The user's ID.
+            operations (list): Dicts with `op` (`"add"` or `"remove"`) and `scholarship_id`.
+
+        Returns:
+            list: One result per operation, as for `FavoritesStore.apply_batch`.
+        """
+        fields = await self.redis.hkeys(self.store._key(user_id))
+        present = present_ids(fields) if is_loaded(fields) else set(await self._reload(user_id))
+        results, writes, final = plan_batch(user_id, present, operations)
+
+        if writes:
+            if self.writer is None:
+                try:
+                    await self.sessions.bulk_write(writes, ordered=True)
+                except Exception:
+                    await self.evict(user_id)
+                    raise
+            await self._change(user_id, batch_changes(final))
+            if self.writer is not None:
+                await self._mark_dirty(user_id)
+        return results
+
+    async def clear(self, user_id: int) -> None:
+        """
+        Removes all of a user's favorites.
+
+        Args:
+            user_id (int): The user's ID.
+        """
+        if self.writer is not None:
+            await self._cache(user_id, [])
+            await self._mark_dirty(user_id)
+            return
+        await self.sessions.update_one({"user_id": user_id}, {"$set": {"favorites": []}}, upsert=True)
+        await self._cache(user_id, [])
+
+    async def evict(self, user_id: int) -> None:
+        """
+        Drops a user's cached favorites, writing a pending write-behind change first.
+
+        Args:
+            user_id (int): The user's ID.
+        """
+        if self.writer is not None:
+            await self.executor.run(self.writer.flush_user, user_id)
+        await self.redis.delete(self.store._key(user_id))
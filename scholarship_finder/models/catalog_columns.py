@@ -0,0 +1,188 @@
+import math
+import sys
+from array import array
+from collections.abc import Sequence
+from datetime import date
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Tuple
+
+from scholarship_finder.models.catalog_index import EMPTY_DEADLINE, NO_DEADLINE, deadline_ordinal, major_names
+
+# Columns whose few distinct values are interned and stored as integer codes
+CATEGORICAL_FIELDS = ("university", "type", "degree_level", "country")
+
+
+def _code_array(codes: List[int], cardinality: int) -> array:
+    return array('B' if cardinality <= 0xFF else 'H' if cardinality <= 0xFFFF else 'I', codes)
+
+
+class _Interner:
+    def __init__(self):
+        self.values: List[Any] = []
+        self._codes: Dict[Any, int] = {}
+
+    def code(self, value: Any) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self._codes[value] = code
+            self.values.append(sys.intern(value) if isinstance(value, str) else value)
+        return code
+
+
+class ColumnarCatalog:
+    """
+    Column-oriented, interned storage for the scholarship catalog.
+
+    Categorical fields and majors are stored as small integer codes into
+    per-column value tables, GPA requirements as a packed float array and
+    deadlines as date ordinals. Per-row dicts are only materialized by `row()`,
+    at the response edge.
+    """
+
+    def __init__(self, rows: Iterable[Mapping[str, Any]]):
+        interners = {field: _Interner() for field in CATEGORICAL_FIELDS}
+        codes: Dict[str, List[int]] = {field: [] for field in CATEGORICAL_FIELDS}
+        major_interner = _Interner()
+        major_codes: List[int] = []
+        major_offsets = [0]
+        ids: List[str] = []
+        names: List[str] = []
+        min_gpa = array('d')
+        deadlines = array('i')
+        self._raw_deadlines: Dict[int, str] = {}  # Deadlines that do not round-trip through their ordinal
+
+        for position, row in enumerate(rows):
+            for field in CATEGORICAL_FIELDS:
+                codes[field].append(interners[field].code(row.get(field)))
+            ids.append(row.get('id'))
+            names.append(row.get('scholarship_name'))
+            gpa = row.get('min_gpa')
+            min_gpa.append(math.nan if gpa is None else float(gpa))
+            deadline = row.get('deadline')
+            ordinal = deadline_ordinal(deadline)
+            deadlines.append(ordinal)
+            if deadline and (ordinal == EMPTY_DEADLINE or date.fromordinal(ordinal).isoformat() != deadline):
+                self._raw_deadlines[position] = deadline
+            major_codes.extend(major_interner.code(name) for name in major_names(row))
+            major_offsets.append(len(major_codes))
+
+        self.values = {field: interners[field].values for field in CATEGORICAL_FIELDS}
+        self.codes = {field: _code_array(codes[field], len(self.values[field])) for field in CATEGORICAL_FIELDS}
+        self.ids = ids
+        self.names = names
+        self.min_gpa = min_gpa
+        self.deadlines = deadlines
+        self.major_values = major_interner.values
+        self.major_codes = _code_array(major_codes, len(self.major_values))
+        self.major_offsets = array('I', major_offsets)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def get(self, position: int, field: str) -> Any:
+        """
+        Returns one field of one row, decoded.
+
+        Args:
+            position (int): The row position.
+            field (str): The field name.
+
+        Returns:
+            The field value in the catalog row format.
+        """
+        if field in self.codes:
+            return self.values[field][self.codes[field][position]]
+        if field == 'scholarship_name':
+            return self.names[position]
+        if field == 'id':
+            return self.ids[position]
+        if field == 'min_gpa':
+            gpa = self.min_gpa[position]
+            return None if math.isnan(gpa) else gpa
+        if field == 'deadline':
+            ordinal = self.deadlines[position]
+            if ordinal == NO_DEADLINE:
+                return None
+            raw = self._raw_deadlines.get(position)
+            if raw is not None:
+                return raw
+            return '' if ordinal == EMPTY_DEADLINE else date.fromordinal(ordinal).isoformat()
+        if field == 'major':
+            return [{"name": name} for name in self.majors(position)]
+        raise KeyError(field)
+
+    def majors(self, position: int) -> List[str]:
+        """ Returns: The major names of a row. """
+        start, end = self.major_offsets[position], self.major_offsets[position + 1]
+        return [self.major_values[code] for code in self.major_codes[start:end]]
+
+    def row(self, position: int) -> Dict[str, Any]:
+        """
+        Materializes one row in the catalog JSON shape.
+
+        Args:
+            position (int): The row position.
+
+        Returns:
+            dict: The scholarship row.
+        """
+        return {
+            "id": self.ids[position],
+            "university": self.get(position, 'university'),
+            "scholarship_name": self.names[position],
+            "type": self.get(position, 'type'),
+            "degree_level": self.get(position, 'degree_level'),
+            "country": self.get(position, 'country'),
+            "deadline": self.get(position, 'deadline'),
+            "min_gpa": self.get(position, 'min_gpa'),
+            "major": self.get(position, 'major')
+        }
+
+    def column(self, field: str) -> List[Any]:
+        """ Returns: Every row's decoded value for the field, in row order. """
+        return [self.get(position, field) for position in range(len(self))]
+
+    def sort_keys(self, field: str) -> List[Any]:
+        """
+        Returns the per-row keys the sorted index orders by: GPAs as floats and
+        deadlines as ordinals, with None for missing values.
+        """
+        if field == 'min_gpa':
+            return [None if math.isnan(gpa) else gpa for gpa in self.min_gpa]
+        if field == 'deadline':
+            return [None if ordinal == NO_DEADLINE else ordinal for ordinal in self.deadlines]
+        return self.column(field)
+
+    def search_documents(self) -> Iterator[Tuple[str, str, Tuple[str, ...]]]:
+        """ Yields: `(scholarship_name, university, majors)` for every row, for the search index. """
+        universities = self.values['university']
+        university_codes = self.codes['university']
+        for position, name in enumerate(self.names):
+            yield (name or "", universities[university_codes[position]] or "", tuple(self.majors(position)))
+
+
+class RowView(Sequence):
+    """
+    Read-only sequence of catalog rows backed by a `ColumnarCatalog`.
+
+    Indexing materializes a fresh dict, so callers can keep using `rows[i]`
+    while the catalog itself holds no per-row objects.
+    """
+
+    def __init__(self, columns: ColumnarCatalog):
+        self._columns = columns
+
+    def __len__(self) -> int:
+        return len(self._columns)
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self._columns.row(p) for p in range(*position.indices(len(self)))]
+        if position < 0:
+            position += len(self)
+        if not 0 <= position < len(self):
+            raise IndexError("catalog row index out of range")
+        return self._columns.row(position)
+
+    def __eq__(self, other) -> bool:
+        return list(self) == list(other)
@@ -0,0 +1,248 @@
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from datetime import date
+from typing import Any, Collection, Dict, List, Mapping, Optional, Sequence, Set
+
+# Facets served by the inverted index; `major` is matched case-insensitively
+FACETS = ("type", "country", "degree_level", "major")
+
+# Fields with a precomputed sort order
+SORT_FIELDS = ("deadline", "scholarship_name", "university", "min_gpa")
+
+# Below this fraction of the catalog, sorting the result by rank beats walking the full permutation
+_WALK_THRESHOLD = 8
+
+# Deadline ordinals for rows without a usable date
+NO_DEADLINE = -1     # deadline is None
+EMPTY_DEADLINE = 0   # deadline is '' or could not be parsed
+
+_EMPTY: frozenset = frozenset()
+
+
+def major_names(row: Mapping[str, Any]) -> List[str]:
+    """
+    Returns the major names of a catalog row.
+
+    Notion rows carry `multi_select` dicts while `Scholarship` objects carry
+    plain strings, so both shapes are accepted.
+    """
+    return [m.get('name', '') if isinstance(m, dict) else m for m in (row.get('major') or [])]
+
+
+def normalize_facet_value(facet: str, value: Any) -> Any:
+    """ Returns the value as stored in the index for the given facet. """
+    if facet == 'major' and isinstance(value, str):
+        return value.lower()
+    return value
+
+
+def deadline_ordinal(value: Optional[str]) -> int:
+    """
+    Parses an ISO-8601 date or datetime into a proleptic Gregorian ordinal.
+
+    Args:
+        value (str): The deadline as returned by Notion.
+
+    Returns:
+        int: The ordinal of its date, `NO_DEADLINE` for None, or `EMPTY_DEADLINE`
+             for an empty or unparseable value.
+    """
+    if value is None:
+        return NO_DEADLINE
+    try:
+        return date.fromisoformat(value[:10]).toordinal()
+    except (TypeError, ValueError):
+        return EMPTY_DEADLINE
+
+
+class FacetIndex:
+    """
+    Inverted index from facet values to the row positions that carry them.
+
+    Built once per catalog snapshot. A multi-facet query intersects posting
+    sets starting from the smallest one, so its cost follows the size of the
+    result rather than the size of the catalog.
+    """
+
+    def __init__(self, postings: Dict[str, Dict[Any, frozenset]], major_labels: Dict[str, str]):
+        self.postings = postings
+        self.major_labels = major_labels  # Normalized major -> name as first seen, for display
+
+    @classmethod
+    def from_columns(cls, columns) -> "FacetIndex":
+        """
+        Builds the index straight from a `ColumnarCatalog`'s integer codes,
+        without materializing any rows.
+
+        Args:
+            columns (ColumnarCatalog): The catalog columns.
+
+        Returns:
+            FacetIndex: The index.
+        """
+        postings: Dict[str, Dict[Any, frozenset]] = {}
+        for facet in ("type", "country", "degree_level"):
+            values = columns.values[facet]
+            by_code: List[List[int]] = [[] for _ in values]
+            for position, code in enumerate(columns.codes[facet]):
+                by_code[code].append(position)
+            postings[facet] = {values[code]: frozenset(positions) for code, positions in enumerate(by_code)}
+
+        major_labels: Dict[str, str] = {}
+        majors: Dict[Any, Set[int]] = defaultdict(set)
+        offsets, codes, values = columns.major_offsets, columns.major_codes, columns.major_values
+        for position in range(len(columns)):
+            for code in codes[offsets[position]:offsets[position + 1]]:
+                key = normalize_facet_value('major', values[code])
+                major_labels.setdefault(key, values[code])
+                majors[key].add(position)
+        postings['major'] = {value: frozenset(positions) for value, positions in majors.items()}
+        return cls(postings, major_labels)
+
+    def lookup(self, facet: str, value: Any) -> frozenset:
+        """
+        Returns the positions of rows whose facet matches the value.
+
+        Args:
+            facet (str): One of `FACETS`.
+            value: The value to look up; majors are matched case-insensitively.
+
+        Returns:
+            frozenset: The matching row positions.
+        """
+        return self.postings[facet].get(normalize_facet_value(facet, value), _EMPTY)
+
+    def match_set(self, filters: Mapping[str, Any]) -> Optional[Set[int]]:
+        """
+        Intersects the posting sets for every non-empty filter.
+
+        Args:
+            filters (dict): Facet name to requested value; empty values are ignored.
+
+        Returns:
+            set: The matching row positions, or None if no facet filter applies.
+        """
+        postings = [self.lookup(facet, value) for facet, value in filters.items()
+                    if facet in self.postings and value]
+        if not postings:
+            return None
+        postings.sort(key=len)
+        result = set(postings[0])
+        for posting in postings[1:]:
+            if not result:
+                break
+            result &= posting
+        return result
+
+    def counts(self, facet: str, candidates: Optional[Collection[int]] = None) -> Dict[Any, int]:
+        """
+        Counts the rows carrying each value of a facet.
+
+        Args:
+            facet (str): One of `FACETS`.
+            candidates (set): Only count these row positions, or None for every row.
+
+        Returns:
+            dict: Display value to row count, largest first; empty values and
+                  zero counts are left out.
+        """
+        counts = []
+        for value, positions in self.postings[facet].items():
+            if not value:
+                continue
+            count = len(positions) if candidates is None else len(positions.intersection(candidates))
+            if count:
+                label = self.major_labels.get(value, value) if facet == 'major' else value
+                counts.append((label, count))
+        counts.sort(key=lambda item: (-item[1], str(item[0])))
+        return dict(counts)
+
+
+class SortedIndex:
+    """
+    Row positions ordered by a single field, with missing (None) values last.
+
+    Built once per catalog snapshot. Range queries are binary searches over the
+    sorted keys, and any subset of rows can be put in ascending or descending
+    order from the precomputed permutation without comparing values again.
+    Rows with equal keys keep catalog order; descending order is the exact
+    reverse of ascending order.
+    """
+
+    def __init__(self, values: Sequence[Any]):
+        present = sorted((value, position) for position, value in enumerate(values) if value is not None)
+        missing = [position for position, value in enumerate(values) if value is None]
+        self.keys = [value for value, _ in present]
+        self.order = [position for _, position in present] + missing
+        self.rank = [0] * len(self.order)
+        for rank, position in enumerate(self.order):
+            self.rank[position] = rank
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def between(self, low: Any = None, high: Any = None, exclude_low: bool = False) -> List[int]:
+        """
+        Returns the positions whose key lies in the range, in ascending key order.
+
+        Args:
+            low: Inclusive lower bound, or None for no bound.
+            high: Inclusive upper bound, or None for no bound.
+            exclude_low (bool): Treat `low` as an exclusive bound instead.
+
+        Returns:
+            list: The matching row positions.
+        """
+        start = 0
+        if low is not None:
+            start = bisect_right(self.keys, low) if exclude_low else bisect_left(self.keys, low)
+        end = len(self.keys) if high is None else bisect_right(self.keys, high)
+        return self.order[start:end] if start < end else []
+
+    def ordered(self, positions: Optional[Collection[int]] = None, descending: bool = False) -> List[int]:
+        """
+        Puts row positions in index order.
+
+        Args:
+            positions (set): The positions to order, or None for every row.
+            descending (bool): Return the reverse order.
+
+        Returns:
+            list: The ordered row positions.
+        """
+        if positions is None:
+            return self.order[::-1] if descending else list(self.order)
+        if len(positions) * _WALK_THRESHOLD < len(self.order):
+            rank = self.rank
+            return sorted(positions, key=rank.__getitem__, reverse=descending)
+        if not isinstance(positions, (set, frozenset)):
+            positions = set(positions)
+        order = reversed(self.order) if descending else self.order
+        return [position for position in order if position in positions]
+
+
+def gpa_at_least(index: SortedIndex, min_gpa: float) -> List[int]:
+    """ Returns positions whose (non-zero) GPA requirement is at least `min_gpa`. """
+    if min_gpa <= 0:
+        return index.between(0.0, exclude_low=True)
+    return index.between(min_gpa)
+
+
+def deadline_between(index: SortedIndex, after: Optional[str] = None, before: Optional[str] = None) -> List[int]:
+    """
+    Returns positions whose deadline falls within the date window.
+
+    The deadline index is keyed by date ordinal, so a window is two binary
+    searches. Rows without a usable deadline never match.
+
+    Args:
+        index (SortedIndex): The deadline index.
+        after (str): Inclusive start date (YYYY-MM-DD), or None.
+        before (str): Inclusive end date (YYYY-MM-DD), or None.
+
+    Returns:
+        list: The matching row positions, in deadline order.
+    """
+    high = deadline_ordinal(before) if before else None
+    low = deadline_ordinal(after) if after else EMPTY_DEADLINE
+    return index.between(max(low, EMPTY_DEADLINE), high, exclude_low=(low <= EMPTY_DEADLINE))
@@ -0,0 +1,651 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import date
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set
+
+from scholarship_finder.models.catalog_columns import ColumnarCatalog, RowView
+from scholarship_finder.models.catalog_index import (
+    EMPTY_DEADLINE, FACETS, FacetIndex, SORT_FIELDS, SortedIndex, deadline_between, gpa_at_least
+)
+from scholarship_finder.models.search_index import SearchIndex
+from scholarship_finder.utils.json_encoding import dumps
+from scholarship_finder.utils.logger import configure_logger
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+class CatalogSnapshot:
+    """
+    An immutable, versioned copy of the parsed scholarship catalog.
+
+    Snapshots are never modified once published; a refresh builds a new
+    snapshot and swaps it in, so a request that grabbed a snapshot keeps a
+    consistent view for its whole lifetime.
+
+    Rows are held in a `ColumnarCatalog`; `rows` is a read-only sequence view
+    that materializes a row dict only when it is indexed. Indexes derived from
+    the rows are built at most once per snapshot and cached on it, so they are
+    invalidated together with the version.
+    """
+
+    def __init__(self, rows: Iterable[Dict[str, Any]], version: int, fetched_at: Optional[float] = None,
+                 previous: Optional["CatalogSnapshot"] = None):
+        self.columns = ColumnarCatalog(rows)
+        self.rows = RowView(self.columns)
+        self.version = version
+        self._previous = previous  # Only kept until warm() has reused its indexes
+        self._derived: Dict[str, Any] = {}
+        self._derived_lock = threading.Lock()
+        self.touch(fetched_at)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    @property
+    def age(self) -> float:
+        """ Returns: Seconds elapsed since this snapshot was loaded or last confirmed current. """
+        return time.monotonic() - self._loaded_at
+
+    def touch(self, checked_at: Optional[float] = None) -> None:
+        """
+        Marks the snapshot as confirmed current, e.g. after a refresh found no changes.
+
+        Args:
+            checked_at (float): Wall-clock time the catalog was confirmed current, defaults to now.
+        """
+        now = time.time()
+        self.fetched_at = checked_at if checked_at is not None else now
+        self._loaded_at = time.monotonic() - max(0.0, now - self.fetched_at)
+
+    def derived(self, name: str, builder: Callable[["CatalogSnapshot"], Any]) -> Any:
+        """
+        Returns a structure derived from this snapshot, building it on first use.
+
+        Args:
+            name (str): Cache key for the derived structure.
+            builder (callable): Builds the structure from the snapshot.
+
+        Returns:
+            The cached structure.
+        """
+        value = self._derived.get(name)
+        if value is None:
+            with self._derived_lock:
+                value = self._derived.get(name)
+                if value is None:
+                    value = builder(self)
+                    self._derived[name] = value
+        return value
+
+    @property
+    def facet_index(self) -> FacetIndex:
+        """ Returns: The inverted index over type, country, degree level and major. """
+        return self.derived('facet_index', lambda snapshot: FacetIndex.from_columns(snapshot.columns))
+
+    @property
+    def id_index(self) -> Dict[str, int]:
+        """ Returns: Scholarship ID to row position. """
+        return self.derived('id_index', lambda snapshot: {
+            scholarship_id: position for position, scholarship_id in enumerate(snapshot.columns.ids)
+            if scholarship_id is not None
+        })
+
+    def position_of(self, scholarship: Dict[str, Any]) -> Optional[int]:
+        """
+        Finds a scholarship's row by its ID, or by university and name when it has
+        no ID (e.g. favorites saved before IDs were kept).
+
+        Args:
+            scholarship (dict): The scholarship, in the catalog row format.
+
+        Returns:
+            int: The row position, or None if the catalog does not contain it.
+        """
+        if scholarship.get('id'):
+            return self.id_index.get(scholarship['id'])
+
+        def build(snapshot):
+            names = {}
+            for position, name in enumerate(snapshot.columns.names):
+                names.setdefault((snapshot.columns.get(position, 'university'), name), position)
+            return names
+        return self.derived('name_index', build).get((scholarship.get('university'), scholarship.get('scholarship_name')))
+
+    def rows_by_id(self, scholarship_ids: Iterable[str]) -> List[Dict[str, Any]]:
+        """
+        Materializes rows for a batch of scholarship IDs.
+
+        Args:
+            scholarship_ids (iterable): Scholarship IDs.
+
+        Returns:
+            list: The rows, in the order given; IDs no longer in the catalog are skipped.
+        """
+        id_index = self.id_index
+        return [self.columns.row(id_index[scholarship_id]) for scholarship_id in scholarship_ids
+                if scholarship_id in id_index]
+
+    def sorted_index(self, field: str) -> SortedIndex:
+        """
+        Args:
+            field (str): One of `SORT_FIELDS`.
+
+        Returns:
+            SortedIndex: The precomputed order of the catalog by that field.
+        """
+        return self.derived(f'sorted_index:{field}', lambda snapshot: SortedIndex(snapshot.columns.sort_keys(field)))
+
+    @property
+    def search_index(self) -> SearchIndex:
+        """ Returns: The full-text index, reusing unchanged rows' tokens from the previous version. """
+        def build(snapshot):
+            previous = snapshot._previous
+            return SearchIndex(snapshot.columns.search_documents(),
+                               previous._derived.get('search_index') if previous else None)
+        return self.derived('search_index', build)
+
+    def row_json(self, position: int) -> bytes:
+        """
+        Returns a row's JSON encoding, encoding it at most once per snapshot.
+
+        Args:
+            position (int): The row position.
+
+        Returns:
+            bytes: The row encoded as a JSON object.
+        """
+        fragments = self.derived('row_json', lambda snapshot: [None] * len(snapshot.rows))
+        fragment = fragments[position]
+        if fragment is None:
+            fragment = fragments[position] = dumps(self.columns.row(position))
+        return fragment
+
+    def warm(self) -> None:
+        """ Builds every derived index up front so requests never pay for it. """
+        self.facet_index
+        self.id_index
+        for field in SORT_FIELDS:
+            self.sorted_index(field)
+        self.search_index
+        self.facet_counts()
+        self._previous = None
+
+    def rank_for(self, sort_by: Optional[str]) -> Sequence[int]:
+        """
+        Args:
+            sort_by (str): The sort field of a query, as passed to `select`.
+
+        Returns:
+            list: The rank of every row position in that query's order.
+        """
+        if sort_by in SORT_FIELDS:
+            return self.sorted_index(sort_by).rank
+        return range(len(self.rows))
+
+    def _range_matches(self, min_gpa: Optional[float], deadline_after: Optional[str],
+                       deadline_before: Optional[str]) -> Optional[Set[int]]:
+        ranges = []
+        if min_gpa is not None:
+            ranges.append(gpa_at_least(self.sorted_index('min_gpa'), min_gpa))
+        if deadline_after or deadline_before:
+            ranges.append(deadline_between(self.sorted_index('deadline'), deadline_after, deadline_before))
+        matches = None
+        for positions in sorted(ranges, key=len):
+            matches = set(positions) if matches is None else matches.intersection(positions)
+        return matches
+
+    def _match(self, facets: Optional[Dict[str, Any]], range_matches: Optional[Set[int]]) -> Optional[Set[int]]:
+        matches = self.facet_index.match_set(facets or {})
+        if range_matches is None:
+            return matches
+        if matches is None:
+            return range_matches
+        return matches & range_matches
+
+    def match(self, facets: Optional[Dict[str, Any]] = None, min_gpa: Optional[float] = None,
+              deadline_after: Optional[str] = None, deadline_before: Optional[str] = None) -> Optional[Set[int]]:
+        """
+        Finds the rows matching a query using only the snapshot's indexes.
+
+        Args:
+            facets (dict): Facet name to requested value (see `FACETS`).
+            min_gpa (float): Keep rows whose GPA requirement is at least this value.
+            deadline_after (str): Keep rows with a deadline on or after this date.
+            deadline_before (str): Keep rows with a deadline on or before this date.
+
+        Returns:
+            set: The positions of the matching rows, or None if no filter applies.
+        """
+        return self._match(facets, self._range_matches(min_gpa, deadline_after, deadline_before))
+
+    def select(self, facets: Optional[Dict[str, Any]] = None, min_gpa: Optional[float] = None,
+               deadline_after: Optional[str] = None, deadline_before: Optional[str] = None,
+               sort_by: Optional[str] = 'deadline', descending: bool = False) -> List[int]:
+        """
+        Finds the rows matching a query and puts them in result order.
+
+        Args:
+            facets, min_gpa, deadline_after, deadline_before: As for `match`.
+            sort_by (str): One of `SORT_FIELDS`; anything else orders by catalog position.
+            descending (bool): Reverse the sort order.
+
+        Returns:
+            list: The positions of the matching rows, in result order.
+        """
+        candidates = self.match(facets, min_gpa, deadline_after, deadline_before)
+        if sort_by in SORT_FIELDS:
+            return self.sorted_index(sort_by).ordered(candidates, descending)
+        # Catalog order is ranked by position (see `rank_for`), so it reverses like any other sort
+        if candidates is None:
+            positions = range(len(self.rows))
+            return list(reversed(positions) if descending else positions)
+        return sorted(candidates, reverse=descending)
+
+    def deadline_histogram(self, positions: Optional[Iterable[int]] = None) -> Dict[str, int]:
+        """
+        Counts deadlines per calendar month.
+
+        Args:
+            positions (set): Only count these row positions, or None for every row.
+
+        Returns:
+            dict: `YYYY-MM` to row count, in month order.
+        """
+        ordinals = self.columns.deadlines
+        months: Dict[int, str] = {}
+        counts: Dict[str, int] = {}
+        for position in (range(len(ordinals)) if positions is None else positions):
+            ordinal = ordinals[position]
+            if ordinal <= EMPTY_DEADLINE:
+                continue
+            month = months.get(ordinal)
+            if month is None:
+                month = months[ordinal] = date.fromordinal(ordinal).strftime('%Y-%m')
+            counts[month] = counts.get(month, 0) + 1
+        return dict(sorted(counts.items()))
+
+    def facet_counts(self, facets: Optional[Dict[str, Any]] = None, min_gpa: Optional[float] = None,
+                     deadline_after: Optional[str] = None, deadline_before: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Counts rows per facet value and deadline month, conditioned on the filters.
+
+        Each facet is counted against every filter except its own, so the
+        counts show what selecting another value of that facet would return.
+        Counts come from posting set intersections; no rows are materialized.
+        Unfiltered counts are computed once per snapshot.
+
+        Args:
+            facets, min_gpa, deadline_after, deadline_before: As for `match`.
+
+        Returns:
+            dict: `total` matching rows, per-facet `facets` counts and `deadline_months`.
+        """
+        facets = {facet: value for facet, value in (facets or {}).items() if value}
+        range_matches = self._range_matches(min_gpa, deadline_after, deadline_before)
+        if not facets and range_matches is None:
+            return self.derived('facet_counts', lambda snapshot: snapshot._facet_counts({}, None))
+        return self._facet_counts(facets, range_matches)
+
+    def _facet_counts(self, facets: Dict[str, Any], range_matches: Optional[Set[int]]) -> Dict[str, Any]:
+        index = self.facet_index
+        counts = {}
+        for facet in FACETS:
+            others = {other: value for other, value in facets.items() if other != facet}
+            counts[facet] = index.counts(facet, self._match(others, range_matches))
+        matches = self._match(facets, range_matches)
+        return {
+            "total": len(self.rows) if matches is None else len(matches),
+            "facets": counts,
+            "deadline_months": self.deadline_histogram(matches)
+        }
+
+
+class CatalogCache:
+    """
+    Keeps the scholarship catalog in memory and refreshes it in the background.
+
+    The first call to `get_snapshot` loads the catalog synchronously. Once the
+    snapshot is older than the TTL, callers keep getting the stale copy while a
+    single background thread fetches a fresh one (stale-while-revalidate).
+
+    The loader returns the full list of rows, or None when nothing changed
+    since the previous load, in which case the current snapshot is kept and
+    its age reset. Without an explicit loader, rows come from an incremental
+    `NotionSync`.
+
+    With a shared `store` (see `RedisCatalogStore`), only the worker holding
+    the store's refresh lock talks to Notion; it publishes the result and every
+    other worker swaps in the new version when it is announced. On a cold
+    start a worker waits at most `initial_wait` seconds for another worker to
+    publish, and loads from Notion itself if the store cannot be reached.
+
+    The last `retained_versions` replaced snapshots are kept so that paginated
+    clients can finish walking the version they started on.
+    """
+
+    def __init__(self, loader: Optional[Callable[[], Optional[List[Dict[str, Any]]]]] = None,
+                 ttl: float = 300, retry_interval: float = 30, full_sync_every: int = 12,
+                 store=None, retained_versions: int = 2, initial_wait: float = 10):
+        self.loader = loader
+        self.ttl = ttl
+        self.retry_interval = retry_interval
+        self.full_sync_every = full_sync_every
+        self.store = store
+        self.retained_versions = retained_versions
+        self.initial_wait = initial_wait
+        self._sync = None
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._history: "OrderedDict[int, CatalogSnapshot]" = OrderedDict()
+        self._version = 0
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self._refreshing = False
+        self._loading = False
+        self._next_attempt = 0.0
+        self._listener_stop: Optional[threading.Event] = None
+
+    def init_app(self, app) -> None:
+        """
+        Reads catalog settings from the Flask config.
+
+        Args:
+            app (Flask): The application whose config holds the `CATALOG_*` settings.
+        """
+        self.ttl = app.config.get('CATALOG_TTL_SECONDS', self.ttl)
+        self.retry_interval = app.config.get('CATALOG_RETRY_SECONDS', self.retry_interval)
+        self.full_sync_every = app.config.get('CATALOG_FULL_SYNC_EVERY', self.full_sync_every)
+        self.retained_versions = app.config.get('CATALOG_RETAINED_VERSIONS', self.retained_versions)
+        self.initial_wait = app.config.get('CATALOG_INITIAL_WAIT_SECONDS', self.initial_wait)
+        if app.config.get('CATALOG_SHARED_CACHE') and self.store is None:
+            from scholarship_finder.models.catalog_store import RedisCatalogStore
+            self.store = RedisCatalogStore(prefix=app.config.get('CATALOG_REDIS_PREFIX', 'catalog'))
+            self.start_listener()
+        app.extensions['catalog_cache'] = self
+
+    def _get_sync(self):
+        if self._sync is None:
+            from scholarship_finder.utils.notion_sync import NotionSync
+            self._sync = NotionSync(full_sync_every=self.full_sync_every)
+        return self._sync
+
+    def _load_rows(self) -> Optional[List[Dict[str, Any]]]:
+        if self.loader is not None:
+            return self.loader()
+        return self._get_sync().sync()
+
+    def get_snapshot(self) -> CatalogSnapshot:
+        """
+        Returns the current catalog snapshot without waiting on Notion, except
+        for the very first load.
+
+        Returns:
+            CatalogSnapshot: The newest snapshot available.
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            with self._load_lock:
+                if self._snapshot is None:
+                    self._initial_load()
+                snapshot = self._snapshot
+        elif snapshot.age >= self.ttl:
+            self._schedule_refresh()
+        return snapshot
+
+    def _initial_load(self) -> None:
+        if self.store is not None:
+            try:
+                holds_lock = self._wait_for_shared()
+            except Exception as e:
+                # Redis being down must not keep this worker from serving
+                logger.error("Shared catalog unavailable, loading from Notion: %s", str(e))
+            else:
+                if holds_lock:
+                    self._refresh_locked()
+                    return
+                if self._snapshot is not None:
+                    return
+        self._publish(self._load_rows() or [])
+
+    def _wait_for_shared(self) -> bool:
+        """
+        Adopts the shared catalog, waiting up to `initial_wait` seconds for
+        another worker to publish it.
+
+        Returns:
+            bool: True if this worker took the refresh lock instead and should load the catalog.
+        """
+        deadline = time.monotonic() + min(self.store.lock_ttl, self.initial_wait)
+        while self._adopt_shared() is None:
+            if self.store.acquire_refresh_lock():
+                return True
+            if time.monotonic() >= deadline:
+                return False
+            # Another worker is loading the catalog; wait for it to publish
+            time.sleep(0.5)
+        return False
+
+    def refresh(self) -> CatalogSnapshot:
+        """
+        Reloads the catalog and publishes a new snapshot.
+
+        With a shared store, the catalog is only fetched from Notion if this
+        process wins the refresh lock; otherwise the newest shared version is used.
+
+        Returns:
+            CatalogSnapshot: The current snapshot after the refresh.
+        """
+        if self.store is None:
+            return self._publish(self._load_rows())
+        if not self.store.acquire_refresh_lock():
+            self._next_attempt = time.monotonic() + self.retry_interval
+            return self._adopt_shared() or self._snapshot
+        return self._refresh_locked()
+
+    def _refresh_locked(self) -> CatalogSnapshot:
+        try:
+            snapshot = self._adopt_shared()
+            if snapshot is not None and snapshot.age < self.ttl:
+                # Someone else refreshed while we were waiting for the lock
+                return snapshot
+            rows = self._load_rows()
+            if rows is None and snapshot is not None:
+                self.store.mark_checked()
+                return self._publish(None)
+            rows = rows or []
+            state = self._sync.export_state() if self._sync is not None else None
+            version = self.store.publish(rows, state)
+            return self._publish(rows, version)
+        finally:
+            self.store.release_refresh_lock()
+
+    def _adopt_shared(self, version: Optional[int] = None) -> Optional[CatalogSnapshot]:
+        """ Swaps in the shared catalog if it is newer than ours. Returns the current snapshot. """
+        current = self._snapshot
+        shared_version = version or self.store.current_version()
+        if current is not None and shared_version <= current.version:
+            checked_at = self.store.last_checked()
+            if checked_at and checked_at > current.fetched_at:
+                current.touch(checked_at)
+            return current
+        loaded = self.store.load(shared_version)
+        if loaded is None:
+            return current
+        shared_version, rows, state, fetched_at = loaded
+        if self.loader is None and state is not None:
+            self._get_sync().restore(rows, state)
+        return self._publish(rows, shared_version, fetched_at)
+
+    def _publish(self, rows: Optional[List[Dict[str, Any]]], version: Optional[int] = None,
+                 fetched_at: Optional[float] = None) -> CatalogSnapshot:
+        with self._lock:
+            if rows is None and self._snapshot is not None:
+                self._snapshot.touch()
+                logger.info("Catalog unchanged, keeping version %d.", self._version)
+                return self._snapshot
+            rows = rows or []
+            self._version = version if version is not None else self._version + 1
+            version = self._version
+
+        # Build indexes before the swap so requests only ever see a warm snapshot
+        snapshot = CatalogSnapshot(rows, version, fetched_at, previous=self._snapshot)
+        snapshot.warm()
+        with self._lock:
+            self._retain(self._snapshot)
+            self._snapshot = snapshot
+        logger.info("Published catalog version %d with %d scholarships.", version, len(rows))
+        return snapshot
+
+    def _retain(self, snapshot: Optional[CatalogSnapshot]) -> None:
+        if snapshot is None or self.retained_versions <= 0:
+            return
+        self._history[snapshot.version] = snapshot
+        while len(self._history) > self.retained_versions:
+            self._history.popitem(last=False)
+
+    def get_version(self, version: int) -> Optional[CatalogSnapshot]:
+        """
+        Returns a specific catalog version, if it is still available.
+
+        Looks at the current snapshot, then the retained ones, then the shared
+        store (which may hold a version this worker has not swapped in yet).
+
+        Args:
+            version (int): The catalog version.
+
+        Returns:
+            CatalogSnapshot: The snapshot, or None if the version is gone.
+        """
+        snapshot = self.get_snapshot()
+        if snapshot.version == version:
+            return snapshot
+        retained = self._history.get(version)
+        if retained is not None or self.store is None:
+            return retained
+        if version > snapshot.version:
+            adopted = self._adopt_shared()
+            if adopted is not None and adopted.version == version:
+                return adopted
+        loaded = self.store.load(version)
+        if loaded is None:
+            return None
+        version, rows, _, fetched_at = loaded
+        snapshot = CatalogSnapshot(rows, version, fetched_at)
+        with self._lock:
+            self._retain(snapshot)
+        return snapshot
+
+    def load_in_background(self) -> bool:
+        """
+        Starts loading the first snapshot on a background thread, retrying with
+        backoff up to `retry_interval` until it succeeds.
+
+        Does nothing if a snapshot is loaded or a load is already running.
+
+        Returns:
+            bool: True if a load was started.
+        """
+        with self._lock:
+            if self._snapshot is not None or self._loading:
+                return False
+            self._loading = True
+        thread = threading.Thread(target=self._load_until_ready, name="catalog-load", daemon=True)
+        thread.start()
+        return True
+
+    def _load_until_ready(self) -> None:
+        delay = min(1.0, self.retry_interval)
+        try:
+            while self._snapshot is None:
+                try:
+                    self.get_snapshot()
+                except Exception as e:
+                    logger.error("Catalog load failed, retrying in %.1f s: %s", delay, str(e))
+                    time.sleep(delay)
+                    delay = min(delay * 2, self.retry_interval)
+        finally:
+            self._loading = False
+
+    def _schedule_refresh(self) -> None:
+        with self._lock:
+            if self._refreshing or time.monotonic() < self._next_attempt:
+                return
+            self._refreshing = True
+        thread = threading.Thread(target=self._background_refresh, name="catalog-refresh", daemon=True)
+        thread.start()
+
+    def _background_refresh(self) -> None:
+        try:
+            self.refresh()
+        except Exception as e:
+            logger.error("Catalog refresh failed, serving stale copy: %s", str(e))
+            self._next_attempt = time.monotonic() + self.retry_interval
+        finally:
+            self._refreshing = False
+
+    def start_listener(self) -> None:
+        """ Starts a daemon thread that swaps in shared catalog versions as they are announced. """
+        if self.store is None or self._listener_stop is not None:
+            return
+        self._listener_stop = threading.Event()
+        thread = threading.Thread(
+            target=self.store.listen,
+            args=(self._on_shared_version, self._listener_stop),
+            name="catalog-listener",
+            daemon=True
+        )
+        thread.start()
+
+    def stop_listener(self) -> None:
+        """ Stops the shared catalog listener thread, if running. """
+        if self._listener_stop is not None:
+            self._listener_stop.set()
+            self._listener_stop = None
+
+    def _on_shared_version(self, version: int) -> None:
+        if version > self.version:
+            logger.info("Shared catalog version %d announced, swapping it in.", version)
+            self._adopt_shared(version)
+
+    def after_fork(self) -> None:
+        """
+        Makes a forked worker's copy usable: locks and refresh state are reset,
+        since the parent's threads do not exist in the child, and the shared
+        catalog listener is restarted. The loaded snapshots are kept.
+        """
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self._refreshing = False
+        self._loading = False
+        if self.store is not None:
+            self._listener_stop = None
+            self.start_listener()
+
+    @property
+    def version(self) -> int:
+        """ Returns: The version of the current snapshot, or 0 if nothing is loaded yet. """
+        snapshot = self._snapshot
+        return snapshot.version if snapshot else 0
+
+    @property
+    def age(self) -> Optional[float]:
+        """ Returns: The age in seconds of the current snapshot, or None if nothing is loaded yet. """
+        snapshot = self._snapshot
+        return snapshot.age if snapshot else None
+
+    @property
+    def row_count(self) -> Optional[int]:
+        """ Returns: The number of scholarships in the current snapshot, or None if nothing is loaded yet. """
+        snapshot = self._snapshot
+        return len(snapshot) if snapshot else None
+
+    def clear(self) -> None:
+        """ Drops the current snapshot so the next access reloads it. """
+        with self._lock:
+            self._snapshot = None
+            self._history.clear()
+
+
+catalog_cache = CatalogCache()
@@ -0,0 +1,198 @@
+import json
+import logging
+import threading
+import time
+import uuid
+import zlib
+from typing import Any, Dict, List, Optional, Tuple
+
+from scholarship_finder.utils.logger import configure_logger
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+# Column order used by the compact blob encoding
+CATALOG_FIELDS = ("id", "university", "scholarship_name", "type", "degree_level", "country", "deadline", "min_gpa", "major")
+BLOB_FORMAT = 1
+
+# Releases the refresh lock only if we still own it
+_RELEASE_LOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+def encode_catalog(rows: List[Dict[str, Any]], state: Optional[Dict[str, Any]] = None,
+                   fetched_at: Optional[float] = None) -> bytes:
+    """
+    Encodes catalog rows as a compressed, columnar-ordered JSON blob.
+
+    Rows are stored as lists in `CATALOG_FIELDS` order so field names are not
+    repeated per row, and the whole payload is zlib-compressed.
+
+    Args:
+        rows (list): The parsed catalog rows.
+        state (dict): Optional sync state needed to resume incremental syncs.
+        fetched_at (float): Wall-clock time the rows were fetched.
+
+    Returns:
+        bytes: The encoded blob.
+    """
+    payload = {
+        "format": BLOB_FORMAT,
+        "fetched_at": fetched_at if fetched_at is not None else time.time(),
+        "fields": CATALOG_FIELDS,
+        "rows": [[row.get(field) for field in CATALOG_FIELDS] for row in rows],
+        "state": state,
+    }
+    return zlib.compress(json.dumps(payload, separators=(",", ":")).encode("utf-8"))
+
+
+def decode_catalog(blob: bytes) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]], float]:
+    """
+    Decodes a blob produced by `encode_catalog`.
+
+    Args:
+        blob (bytes): The encoded blob.
+
+    Returns:
+        tuple: The catalog rows, the sync state and the fetch time.
+
+    Raises:
+        ValueError: If the blob was written in an unknown format.
+    """
+    payload = json.loads(zlib.decompress(blob))
+    if payload.get("format") != BLOB_FORMAT:
+        raise ValueError(f"Unsupported catalog blob format: {payload.get('format')}")
+    fields = payload["fields"]
+    rows = [dict(zip(fields, values)) for values in payload["rows"]]
+    return rows, payload.get("state"), payload["fetched_at"]
+
+
+class RedisCatalogStore:
+    """
+    Shares the parsed catalog between worker processes through Redis.
+
+    Each published catalog gets a fleet-wide version from an INCR counter and
+    is stored as an immutable blob under its own key. The current version is
+    kept in a separate key and announced on a pub/sub channel, so every worker
+    can swap to it without talking to Notion. A short-lived lock makes sure only
+    one worker refreshes from Notion at a time.
+    """
+
+    def __init__(self, redis_client=None, prefix: str = "catalog", blob_ttl: int = 86400, lock_ttl: int = 120):
+        self._redis = redis_client
+        self.prefix = prefix
+        self.blob_ttl = blob_ttl
+        self.lock_ttl = lock_ttl
+        self.channel = f"{prefix}:updates"
+        self._lock_token: Optional[str] = None
+
+    @property
+    def redis(self):
+        if self._redis is not None:
+            return self._redis
+        from scholarship_finder.clients.redis_client import redis_connection
+        return redis_connection.client
+
+    def _key(self, *parts) -> str:
+        return ":".join((self.prefix,) + tuple(str(p) for p in parts))
+
+    def current_version(self) -> int:
+        """ Returns: The version currently published in Redis, or 0 if there is none. """
+        value = self.redis.get(self._key("version"))
+        return int(value) if value else 0
+
+    def publish(self, rows: List[Dict[str, Any]], state: Optional[Dict[str, Any]] = None) -> int:
+        """
+        Stores a new catalog version and notifies every subscribed worker.
+
+        Args:
+            rows (list): The parsed catalog rows.
+            state (dict): Optional sync state needed to resume incremental syncs.
+
+        Returns:
+            int: The fleet-wide version assigned to the catalog.
+        """
+        blob = encode_catalog(rows, state)
+        version = int(self.redis.incr(self._key("seq")))
+        pipe = self.redis.pipeline()
+        pipe.set(self._key("blob", version), blob, ex=self.blob_ttl)
+        pipe.set(self._key("version"), version)
+        pipe.set(self._key("checked_at"), time.time())
+        pipe.publish(self.channel, version)
+        pipe.execute()
+        logger.info("Published shared catalog version %d (%d rows, %d bytes).", version, len(rows), len(blob))
+        return version
+
+    def mark_checked(self) -> None:
+        """ Records that the current version was confirmed up to date with Notion. """
+        self.redis.set(self._key("checked_at"), time.time())
+
+    def last_checked(self) -> Optional[float]:
+        """ Returns: When the current version was last confirmed up to date, if known. """
+        value = self.redis.get(self._key("checked_at"))
+        return float(value) if value else None
+
+    def load(self, version: Optional[int] = None) -> Optional[Tuple[int, List[Dict[str, Any]], Optional[Dict[str, Any]], float]]:
+        """
+        Loads a catalog version from Redis.
+
+        Args:
+            version (int): The version to load, defaults to the current one.
+
+        Returns:
+            tuple: The version, rows, sync state and fetch time, or None if the
+                   version is not available.
+        """
+        version = version or self.current_version()
+        if not version:
+            return None
+        blob = self.redis.get(self._key("blob", version))
+        if blob is None:
+            logger.warning("Shared catalog version %d has expired from Redis.", version)
+            return None
+        rows, state, fetched_at = decode_catalog(blob)
+        return version, rows, state, fetched_at
+
+    def acquire_refresh_lock(self) -> bool:
+        """ Returns: True if this process may refresh the catalog from Notion. """
+        token = uuid.uuid4().hex
+        if self.redis.set(self._key("lock"), token, nx=True, ex=self.lock_ttl):
+            self._lock_token = token
+            return True
+        return False
+
+    def release_refresh_lock(self) -> None:
+        """ Releases the refresh lock if this process still holds it. """
+        if self._lock_token is None:
+            return
+        self.redis.eval(_RELEASE_LOCK_SCRIPT, 1, self._key("lock"), self._lock_token)
+        self._lock_token = None
+
+    def listen(self, on_version, stop_event: threading.Event, reconnect_delay: float = 1.0) -> None:
+        """
+        Blocks, calling `on_version(version)` for every version announcement.
+
+        Reconnects after connection errors until `stop_event` is set.
+
+        Args:
+            on_version (callable): Called with each announced version number.
+            stop_event (threading.Event): Set to stop listening.
+            reconnect_delay (float): Seconds to wait before resubscribing after an error.
+        """
+        while not stop_event.is_set():
+            pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+            try:
+                pubsub.subscribe(self.channel)
+                while not stop_event.is_set():
+                    message = pubsub.get_message(timeout=1.0)
+                    if message and message.get("type") == "message":
+                        on_version(int(message["data"]))
+            except Exception as e:
+                logger.error("Catalog subscription failed, retrying: %s", str(e))
+                stop_event.wait(reconnect_delay)
+            finally:
+                pubsub.close()
@@ -1,5 +1,6 @@
 import logging
-from typing import List
+from collections.abc import Mapping
+from typing import Any, Dict, Hashable, Iterable, List, Union
 
 # from scholarship_finder.models.scholarships_model import Scholarship
 from scholarship_finder.utils.logger import configure_logger
@@ -10,12 +11,53 @@ from scholarship_finder.models.scholarship_model import Scholarship
 logger = logging.getLogger(__name__)
 configure_logger(logger)
 
+def favorite_identifier(scholarship: Union['Scholarship', Mapping[str, Any], str]) -> Hashable:
+    """
+    Returns the key favorites are deduplicated by.
+
+    Args:
+        scholarship (Scholarship | dict | str): A scholarship object, a scholarship
+            document or a scholarship ID.
+
+    Returns:
+        The scholarship ID itself, or `(university, scholarship_name)`.
+    """
+    if isinstance(scholarship, str):
+        return scholarship
+    if isinstance(scholarship, Mapping):
+        return (scholarship.get("university"), scholarship.get("scholarship_name"))
+    return (scholarship.university, scholarship.scholarship_name)
+
+
 class FavoritesModel:
+    """
+    A user's favorite scholarships, in the order they were added.
+
+    Favorites are kept in an insertion-ordered dict keyed by scholarship ID
+    (or `(university, scholarship_name)` for scholarship objects), so adding,
+    removing and membership checks are O(1).
+    """
 
     def __init__(self, user_id, favorites = None):
         self.user_id = user_id
-        self.favorites = favorites or []
-    
+        self._favorites: Dict[Hashable, Any] = {}
+        self.load_many(favorites or [])
+
+    @property
+    def favorites(self) -> List['Scholarship']:
+        """ Returns: The favorited scholarships, oldest first. """
+        return list(self._favorites.values())
+
+    @favorites.setter
+    def favorites(self, scholarships: Iterable['Scholarship']) -> None:
+        self.replace_all(scholarships)
+
+    def __len__(self) -> int:
+        return len(self._favorites)
+
+    def __contains__(self, scholarship) -> bool:
+        return favorite_identifier(scholarship) in self._favorites
+
     def add_to_favorites(self, scholarship: 'Scholarship'):
         """
         Adds a scholarship to list of favorites.
@@ -23,16 +65,14 @@ class FavoritesModel:
         Args:
             scholarship (Scholarship): The scholarship object to be added to favorites
         """
-        logger.info("Adding scholarship to favorites list...")
-        scholarship_identifier = (scholarship.university, scholarship.scholarship_name)
-        
-        # Check if scholarship already exists by comparing university and name
-        existing_identifiers = [(s.university, s.scholarship_name) for s in self.favorites]
-        if scholarship_identifier not in existing_identifiers:
-            self.favorites.append(scholarship)
-            logger.info("Scholarship added successfully.")
+        logger.debug("Adding scholarship to favorites list...")
+        scholarship_identifier = favorite_identifier(scholarship)
+
+        if scholarship_identifier not in self._favorites:
+            self._favorites[scholarship_identifier] = scholarship
+            logger.debug("Scholarship added successfully.")
         else:
-            logger.error("Scholarship already exists in favorites list.")
+            logger.warning("Scholarship already exists in favorites list.")
 
     def remove_from_favorites(self, scholarship: 'Scholarship'):
         """
@@ -41,23 +81,45 @@ class FavoritesModel:
         Args:
             scholarship (Scholarship): The scholarship object to be removed from favorites
         """
-        logger.info("Removing scholarship from favorites list...")
-        scholarship_identifier = (scholarship.university, scholarship.scholarship_name)
-        
-        # Find and remove scholarship by comparing university and name
-        for saved_scholarship in self.favorites[:]:  # Create a copy to iterate
-            if (saved_scholarship.university, saved_scholarship.scholarship_name) == scholarship_identifier:
-                self.favorites.remove(saved_scholarship)
-                logger.info("Scholarship removed successfully.")
-                return
-        logger.error("Scholarship not in favorites, cannot be removed.")
+        logger.debug("Removing scholarship from favorites list...")
+        if self._favorites.pop(favorite_identifier(scholarship), None) is not None:
+            logger.debug("Scholarship removed successfully.")
+            return
+        logger.warning("Scholarship not in favorites, cannot be removed.")
+
+    def load_many(self, scholarships: Iterable['Scholarship']) -> int:
+        """
+        Adds several scholarships in one pass, skipping ones already favorited.
+
+        Args:
+            scholarships (iterable): Scholarship objects or stored scholarship documents.
+
+        Returns:
+            int: The number of scholarships added.
+        """
+        before = len(self._favorites)
+        for scholarship in scholarships:
+            self._favorites.setdefault(favorite_identifier(scholarship), scholarship)
+        added = len(self._favorites) - before
+        logger.debug("Loaded %d scholarships into favorites list.", added)
+        return added
+
+    def replace_all(self, scholarships: Iterable['Scholarship']) -> None:
+        """
+        Replaces the favorites list with the given scholarships.
+
+        Args:
+            scholarships (iterable): Scholarship objects or stored scholarship documents.
+        """
+        self._favorites = {}
+        self.load_many(scholarships)
 
     def get_favorites(self) -> List['Scholarship']:
         """ Returns: All scholarships stored in the favorites list. """
-        logger.info("Retrieving favorited scholarships...")
+        logger.debug("Retrieving favorited scholarships...")
         return self.favorites
 
     def clear_favorites(self): 
         """ Removes all scholarships from the favorites list. """
-        logger.info("Removing all favorited scholarships...")
-        self.favorites = []
+        logger.debug("Removing all favorited scholarships...")
+        self._favorites = {}
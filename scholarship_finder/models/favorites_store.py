@@ -0,0 +1,448 @@
+import atexit
+import logging
+import time
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from scholarship_finder.utils.logger import configure_logger
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+# Hash field marking a user's favorites as loaded, so an empty list is not a miss
+LOADED_FIELD = "__loaded__"
+# Applies hash changes only while the loaded marker is present, so a hash that
+# expires mid-operation is never recreated holding part of a user's favorites.
+# ARGV: the marker, the TTL, then (op, field, value) triples with op "setnx",
+# "set" or "del". Returns -1 if the marker is missing, else the fields changed.
+CHANGE_IF_LOADED = """
+if redis.call('HEXISTS', KEYS[1], ARGV[1]) == 0 then return -1 end
+local changed = 0
+for i = 3, #ARGV, 3 do
+  if ARGV[i] == 'del' then
+    changed = changed + redis.call('HDEL', KEYS[1], ARGV[i + 1])
+  elseif ARGV[i] == 'setnx' then
+    changed = changed + redis.call('HSETNX', KEYS[1], ARGV[i + 1], ARGV[i + 2])
+  else
+    redis.call('HSET', KEYS[1], ARGV[i + 1], ARGV[i + 2])
+    changed = changed + 1
+  end
+end
+redis.call('EXPIRE', KEYS[1], ARGV[2])
+return changed
+"""
+# Projection for reading a user's favorites from their session document
+SESSION_PROJECTION = {"favorites": 1, "_id": 0}
+
+
+def _decode(value) -> str:
+    return value.decode() if isinstance(value, bytes) else value
+
+
+def cache_mapping(scholarship_ids: List[str]) -> Dict[str, str]:
+    """
+    Builds the Redis hash for a user's favorites.
+
+    Args:
+        scholarship_ids (list): The scholarship IDs in the order they were added.
+
+    Returns:
+        dict: Hash field to value: each ID maps to its insertion sequence, plus the loaded marker.
+        Sequences start at 1, so IDs added later, which are stamped with
+        `time.time_ns()`, sort after them even if the change was prepared before a reload.
+    """
+    mapping = {LOADED_FIELD: "0"}
+    for offset, scholarship_id in enumerate(scholarship_ids, start=1):
+        mapping.setdefault(scholarship_id, str(offset))
+    return mapping
+
+
+def ordered_ids(entries: Mapping) -> List[str]:
+    """
+    Reads scholarship IDs back from a user's Redis hash.
+
+    Args:
+        entries (dict): The hash as returned by `HGETALL`.
+
+    Returns:
+        list: The scholarship IDs in the order they were added.
+    """
+    added = {_decode(field): int(value) for field, value in entries.items()}
+    added.pop(LOADED_FIELD, None)
+    return sorted(added, key=added.get)
+
+
+def is_loaded(fields: Iterable) -> bool:
+    """ Returns: Whether a user's Redis hash, given as its fields or `HGETALL` result, holds the loaded marker. """
+    return any(_decode(field) == LOADED_FIELD for field in fields)
+
+
+def present_ids(fields: Iterable) -> Set[str]:
+    """
+    Reads the scholarship IDs present in a user's Redis hash.
+
+    Args:
+        fields (list): The hash fields as returned by `HKEYS`.
+
+    Returns:
+        set: The scholarship IDs, without the loaded marker.
+    """
+    present = {_decode(field) for field in fields}
+    present.discard(LOADED_FIELD)
+    return present
+
+
+def stored_favorites(session: Optional[Mapping]) -> List[Any]:
+    """ Returns: The `favorites` array of a session document, or an empty list if there is no session. """
+    return list(session.get("favorites", [])) if session else []
+
+
+def needs_migration(stored: List[Any]) -> bool:
+    """ Returns: Whether a stored favorites array still holds scholarship documents rather than IDs. """
+    return not all(isinstance(item, str) for item in stored)
+
+
+def favorite_update(op: str, scholarship_id: str) -> Dict[str, Any]:
+    """ Returns: The MongoDB update applying an `"add"` or `"remove"` operation to a session's favorites. """
+    return {"$addToSet" if op == "add" else "$pull": {"favorites": scholarship_id}}
+
+
+def queue_cache(pipeline, key: str, scholarship_ids: List[str], ttl: int):
+    """
+    Queues the commands that replace a user's Redis hash.
+
+    Synchronous and `redis.asyncio` pipelines queue commands the same way, so
+    both stores build their pipelines here and only execute them differently.
+
+    Args:
+        pipeline: A Redis pipeline.
+        key (str): The user's hash key.
+        scholarship_ids (list): The scholarship IDs in the order they were added.
+        ttl (int): Seconds until the hash expires.
+
+    Returns:
+        The pipeline, ready to execute.
+    """
+    pipeline.delete(key)
+    pipeline.hset(key, mapping=cache_mapping(scholarship_ids))
+    pipeline.expire(key, ttl)
+    return pipeline
+
+
+def change_args(changes: Iterable[Tuple[str, str, str]], ttl: int) -> List[str]:
+    """
+    Builds the `CHANGE_IF_LOADED` arguments.
+
+    Args:
+        changes (list): `(op, scholarship ID, value)` triples, op being "setnx", "set" or "del".
+        ttl (int): Seconds until the hash expires.
+
+    Returns:
+        list: The script's ARGV.
+    """
+    args = [LOADED_FIELD, str(ttl)]
+    for op, scholarship_id, value in changes:
+        args.extend((op, scholarship_id, value))
+    return args
+
+
+def batch_changes(final: Mapping[str, Optional[str]]) -> List[Tuple[str, str, str]]:
+    """ Returns: The hash changes planned by `plan_batch`, as `CHANGE_IF_LOADED` triples. """
+    return [("del", scholarship_id, "") if value is None else ("set", scholarship_id, value)
+            for scholarship_id, value in final.items()]
+
+
+def plan_batch(user_id: int, present: Set[str], operations: Sequence[Mapping[str, Any]]) -> Tuple[list, list, dict]:
+    """
+    Evaluates favorites operations in order against the IDs currently present.
+
+    Args:
+        user_id (int): The user's ID.
+        present (set): The user's current scholarship IDs; updated in place.
+        operations (list): Dicts with `op` (`"add"` or `"remove"`) and `scholarship_id`.
+
+    Returns:
+        tuple: The per-operation results, the MongoDB `UpdateOne` writes and
+        the final hash changes (ID to new value, or None to delete).
+    """
+    from pymongo import UpdateOne
+
+    results, writes, final = [], [], {}
+    base = time.time_ns()
+    for index, operation in enumerate(operations):
+        scholarship_id = operation["scholarship_id"]
+        if operation["op"] == "add":
+            applied = scholarship_id not in present
+            if applied:
+                present.add(scholarship_id)
+                final[scholarship_id] = str(base + index)
+        else:
+            applied = scholarship_id in present
+            if applied:
+                present.discard(scholarship_id)
+                final[scholarship_id] = None
+        if applied:
+            writes.append(UpdateOne({"user_id": user_id}, favorite_update(operation["op"], scholarship_id),
+                                    upsert=operation["op"] == "add"))
+        results.append({"index": index, "op": operation["op"], "scholarship_id": scholarship_id, "applied": applied})
+    return results, writes, final
+
+
+class FavoritesStore:
+    """
+    Per-user favorites kept in a Redis hash, backed by the Mongo `sessions` collection.
+
+    Favorites are stored as scholarship IDs only. Each user's IDs live in one
+    hash, so reading a user's favorites is a single `HGETALL`, and are hydrated
+    into full rows from the in-memory catalog. Changes are written through to
+    Mongo, which stays the durable copy, or in write-behind mode handed to a
+    `FavoritesWriteBehind` flusher; a user whose hash is missing or expired is
+    read through from Mongo and cached again.
+    """
+
+    def __init__(self, redis_client=None, sessions_collection=None, catalog=None,
+                 prefix: str = "favorites", ttl: int = 86400):
+        self._redis = redis_client
+        self._sessions = sessions_collection
+        self._catalog = catalog
+        self.prefix = prefix
+        self.ttl = ttl
+        self.writer = None
+
+    def init_app(self, app) -> None:
+        """
+        Reads favorites settings from the Flask config.
+
+        Args:
+            app (Flask): The application whose config holds the `FAVORITES_*` settings.
+        """
+        self.prefix = app.config.get('FAVORITES_REDIS_PREFIX', self.prefix)
+        self.ttl = app.config.get('FAVORITES_CACHE_TTL_SECONDS', self.ttl)
+        if app.config.get('FAVORITES_WRITE_BEHIND') and self.writer is None:
+            from scholarship_finder.models.favorites_writer import FavoritesWriteBehind
+            self.writer = FavoritesWriteBehind(
+                self,
+                flush_interval=app.config.get('FAVORITES_FLUSH_INTERVAL_SECONDS', 1.0),
+                batch_size=app.config.get('FAVORITES_FLUSH_BATCH_SIZE', 100),
+                max_pending=app.config.get('FAVORITES_MAX_PENDING_USERS', 10000),
+                enqueue_timeout=app.config.get('FAVORITES_ENQUEUE_TIMEOUT_SECONDS', 0.5)
+            )
+            self.writer.start()
+            atexit.register(self.writer.stop)
+        app.extensions['favorites_store'] = self
+
+    @property
+    def redis(self):
+        if self._redis is not None:
+            return self._redis
+        from scholarship_finder.clients.redis_client import redis_connection
+        return redis_connection.client  # Resolved per call so forked workers get their own client
+
+    @property
+    def sessions(self):
+        if self._sessions is not None:
+            return self._sessions
+        from scholarship_finder.clients.mongo_client import mongo
+        return mongo.sessions  # Resolved per call so forked workers get their own client
+
+    @property
+    def catalog(self):
+        if self._catalog is None:
+            from scholarship_finder.models.catalog_model import catalog_cache
+            self._catalog = catalog_cache
+        return self._catalog
+
+    def _key(self, user_id: int) -> str:
+        return f"{self.prefix}:{user_id}"
+
+    def _load_from_mongo(self, user_id: int) -> List[str]:
+        session = self.sessions.find_one({"user_id": user_id}, SESSION_PROJECTION)
+        return self._to_ids(user_id, stored_favorites(session))
+
+    def _to_ids(self, user_id: int, stored: List[Any]) -> List[str]:
+        return self._migrate(user_id, stored) if needs_migration(stored) else stored
+
+    def _migrate(self, user_id: int, stored: List[Any]) -> List[str]:
+        # Sessions written before IDs were kept hold full scholarship documents
+        snapshot = self.catalog.get_snapshot()
+        scholarship_ids = []
+        for item in stored:
+            if isinstance(item, str):
+                scholarship_ids.append(item)
+                continue
+            position = snapshot.position_of(item) if isinstance(item, Mapping) else None
+            if position is None:
+                logger.warning("Dropping favorite not found in catalog for user ID %d: %s", user_id, item)
+                continue
+            scholarship_ids.append(snapshot.columns.ids[position])
+        scholarship_ids = list(dict.fromkeys(scholarship_ids))
+        self.sessions.update_one({"user_id": user_id}, {"$set": {"favorites": scholarship_ids}})
+        logger.info("Migrated %d stored favorites to scholarship IDs for user ID %d.", len(scholarship_ids), user_id)
+        return scholarship_ids
+
+    def _cache(self, user_id: int, scholarship_ids: List[str]) -> None:
+        queue_cache(self.redis.pipeline(), self._key(user_id), scholarship_ids, self.ttl).execute()
+
+    def _reload(self, user_id: int) -> List[str]:
+        scholarship_ids = self._load_from_mongo(user_id)
+        self._cache(user_id, scholarship_ids)
+        return scholarship_ids
+
+    def _change(self, user_id: int, changes: List[Tuple[str, str, str]]) -> int:
+        # Reloaded and retried if the hash expired since it was last read
+        key = self._key(user_id)
+        args = change_args(changes, self.ttl)
+        while True:
+            changed = self.redis.eval(CHANGE_IF_LOADED, 1, key, *args)
+            if changed >= 0:
+                return changed
+            self._reload(user_id)
+
+    def seed(self, user_id: int, stored: List[Any]) -> None:
+        """
+        Caches favorites just read from the user's session, e.g. at login, so
+        the next read does not go back to MongoDB.
+
+        A copy already in Redis is kept: it may hold changes MongoDB has not seen yet.
+
+        Args:
+            user_id (int): The user's ID.
+            stored (list): The `favorites` array of the user's session document.
+        """
+        if not self.redis.hexists(self._key(user_id), LOADED_FIELD):
+            self._cache(user_id, self._to_ids(user_id, stored))
+
+    def get_ids(self, user_id: int) -> List[str]:
+        """
+        Returns a user's favorite scholarship IDs in the order they were added.
+
+        Args:
+            user_id (int): The user's ID.
+
+        Returns:
+            list: The scholarship IDs.
+        """
+        entries = self.redis.hgetall(self._key(user_id))
+        if not is_loaded(entries):
+            logger.debug("Favorites cache miss for user ID %d; reading from MongoDB.", user_id)
+            return self._reload(user_id)
+        return ordered_ids(entries)
+
+    def get(self, user_id: int) -> List[Dict[str, Any]]:
+        """
+        Returns a user's favorites, hydrated from the current catalog.
+
+        Args:
+            user_id (int): The user's ID.
+
+        Returns:
+            list: The favorited scholarships in the catalog row format, in the
+            order they were added; scholarships no longer in the catalog are skipped.
+        """
+        return self.catalog.get_snapshot().rows_by_id(self.get_ids(user_id))
+
+    def add(self, user_id: int, scholarship_id: str) -> bool:
+        """
+        Adds a scholarship to a user's favorites.
+
+        Args:
+            user_id (int): The user's ID.
+            scholarship_id (str): The scholarship's ID.
+
+        Returns:
+            bool: True if it was added, False if it was already a favorite.
+        """
+        if not self._change(user_id, [("setnx", scholarship_id, str(time.time_ns()))]):
+            return False
+        if self.writer is not None:
+            self.writer.mark_dirty(user_id)
+            return True
+        try:
+            self.sessions.update_one({"user_id": user_id}, favorite_update("add", scholarship_id), upsert=True)
+        except Exception:
+            self.redis.hdel(self._key(user_id), scholarship_id)
+            raise
+        return True
+
+    def remove(self, user_id: int, scholarship_id: str) -> bool:
+        """
+        Removes a scholarship from a user's favorites.
+
+        Args:
+            user_id (int): The user's ID.
+            scholarship_id (str): The scholarship's ID.
+
+        Returns:
+            bool: True if it was removed, False if it was not a favorite.
+        """
+        if not self._change(user_id, [("del", scholarship_id, "")]):
+            return False
+        if self.writer is not None:
+            self.writer.mark_dirty(user_id)
+            return True
+        try:
+            self.sessions.update_one({"user_id": user_id}, favorite_update("remove", scholarship_id))
+        except Exception:
+            self.evict(user_id)
+            raise
+        return True
+
+    def apply_batch(self, user_id: int, operations: Sequence[Mapping[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Applies add and remove operations in order, with one MongoDB `bulk_write`.
+
+        Each operation is checked against the favorites as left by the operations
+        before it, so adding then removing the same scholarship cancels out.
+
+        Args:
+            user_id (int): The user's ID.
+            operations (list): Dicts with `op` (`"add"` or `"remove"`) and `scholarship_id`.
+
+        Returns:
+            list: One result per operation: its `index`, `op`, `scholarship_id`
+            and whether it was `applied`.
+        """
+        fields = self.redis.hkeys(self._key(user_id))
+        present = present_ids(fields) if is_loaded(fields) else set(self._reload(user_id))
+        results, writes, final = plan_batch(user_id, present, operations)
+
+        if writes:
+            if self.writer is None:
+                try:
+                    self.sessions.bulk_write(writes, ordered=True)
+                except Exception:
+                    self.evict(user_id)
+                    raise
+            self._change(user_id, batch_changes(final))
+            if self.writer is not None:
+                self.writer.mark_dirty(user_id)
+        return results
+
+    def clear(self, user_id: int) -> None:
+        """
+        Removes all of a user's favorites.
+
+        Args:
+            user_id (int): The user's ID.
+        """
+        if self.writer is not None:
+            self._cache(user_id, [])
+            self.writer.mark_dirty(user_id)
+            return
+        self.sessions.update_one({"user_id": user_id}, {"$set": {"favorites": []}}, upsert=True)
+        self._cache(user_id, [])
+
+    def evict(self, user_id: int) -> None:
+        """
+        Drops a user's cached favorites; the next read goes to MongoDB.
+        A pending write-behind change for the user is written first.
+
+        Args:
+            user_id (int): The user's ID.
+        """
+        if self.writer is not None:
+            self.writer.flush_user(user_id)
+        self.redis.delete(self._key(user_id))
+
+
+favorites_store = FavoritesStore()
@@ -0,0 +1,273 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from pymongo import UpdateOne
+
+from scholarship_finder.models.favorites_store import _decode, is_loaded, ordered_ids
+from scholarship_finder.utils.logger import configure_logger
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+class FavoritesWriteBehind:
+    """
+    Write-behind flusher for favorites changes.
+
+    In write-behind mode a favorites change is acknowledged once it is in the
+    user's Redis hash, which acts as the journal, and the user is marked dirty
+    both here and in a Redis set shared by every worker. A background thread
+    periodically takes a batch of dirty users, reads each one's current
+    favorites from Redis and writes them to MongoDB in one `bulk_write`, so
+    any number of changes to the same user coalesce into a single write.
+
+    A user leaves the Redis set only once written. Every `recover_interval`
+    seconds, and when the flusher starts, users still in the set are adopted,
+    so changes pending in a worker that was killed are written by another.
+    A user whose hash has expired before it could be written is dropped: the
+    hash is the only copy of the change, and reading MongoDB in its place
+    would write the stale copy back.
+
+    The set of dirty users is bounded. When it is full, `mark_dirty` waits up
+    to `enqueue_timeout` seconds for the flusher and then writes the user
+    synchronously, pushing back on the caller instead of growing without limit.
+    Everything still pending is flushed by `stop()`.
+    """
+
+    def __init__(self, store, flush_interval: float = 1.0, batch_size: int = 100,
+                 max_pending: int = 10000, enqueue_timeout: float = 0.5, retry_interval: float = 5.0,
+                 recover_interval: float = 60.0):
+        self.store = store
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        self.enqueue_timeout = enqueue_timeout
+        self.retry_interval = retry_interval
+        self.recover_interval = recover_interval
+        self._pending: "OrderedDict[int, float]" = OrderedDict()  # user id -> time first marked dirty
+        self._condition = threading.Condition()
+        self._stop: Optional[threading.Event] = None
+        self._thread: Optional[threading.Thread] = None
+        self.flushed_users = 0
+        self.batches = 0
+        self.last_batch_size = 0
+        self.max_batch_size = 0
+        self.failures = 0
+        self.synchronous_writes = 0
+        self.expired = 0
+        self.recovered = 0
+        self.last_flush_at: Optional[float] = None
+
+    @property
+    def dirty_key(self) -> str:
+        """ Returns: The Redis set of users whose changes are not yet in MongoDB. """
+        return f"{self.store.prefix}:dirty"
+
+    def mark_dirty(self, user_id: int) -> None:
+        """
+        Records that a user's favorites changed and must be written to MongoDB.
+
+        Args:
+            user_id (int): The user's ID.
+        """
+        self.store.redis.sadd(self.dirty_key, user_id)  # Durable before the change is acknowledged
+        with self._condition:
+            if user_id in self._pending:
+                return  # Coalesced with the change already waiting
+            deadline = time.monotonic() + self.enqueue_timeout
+            while len(self._pending) >= self.max_pending:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or self._thread is None:
+                    break
+                self._condition.notify_all()
+                self._condition.wait(remaining)
+            if len(self._pending) < self.max_pending:
+                self._pending[user_id] = time.monotonic()
+                if len(self._pending) >= self.batch_size:
+                    self._condition.notify_all()
+                return
+        logger.warning("Favorites write-behind queue is full; writing user ID %d synchronously.", user_id)
+        self.synchronous_writes += 1
+        self._write([user_id])
+
+    def flush_user(self, user_id: int) -> None:
+        """
+        Writes one user's pending change now, if there is one.
+
+        Args:
+            user_id (int): The user's ID.
+        """
+        with self._condition:
+            if self._pending.pop(user_id, None) is None:
+                return
+            self._condition.notify_all()
+        try:
+            self._write([user_id])
+        except Exception:
+            self.mark_dirty(user_id)
+            raise
+
+    def _take_batch(self) -> List[int]:
+        with self._condition:
+            batch = []
+            while self._pending and len(batch) < self.batch_size:
+                user_id, _ = self._pending.popitem(last=False)
+                batch.append(user_id)
+            self._condition.notify_all()  # Wake callers waiting for room
+            return batch
+
+    def _write(self, user_ids: List[int]) -> None:
+        pipeline = self.store.redis.pipeline()
+        for user_id in user_ids:
+            pipeline.hgetall(self.store._key(user_id))
+        writes = []
+        for user_id, entries in zip(user_ids, pipeline.execute()):
+            if not is_loaded(entries):
+                # Only a complete hash may replace the stored list; never write part of it
+                self.expired += 1
+                logger.warning("Favorites for user ID %d expired from Redis before they were written.", user_id)
+                continue
+            writes.append(UpdateOne({"user_id": user_id}, {"$set": {"favorites": ordered_ids(entries)}}, upsert=True))
+        if writes:
+            self.store.sessions.bulk_write(writes, ordered=False)
+        with self._condition:
+            written = [user_id for user_id in user_ids if user_id not in self._pending]  # Not changed again since
+        if written:
+            self.store.redis.srem(self.dirty_key, *written)
+
+    def recover(self) -> int:
+        """
+        Queues users left in the shared dirty set, e.g. by a worker that was killed.
+
+        Returns:
+            int: The number of users queued.
+        """
+        members = self.store.redis.smembers(self.dirty_key)
+        adopted = 0
+        with self._condition:
+            for member in members:
+                user_id = int(_decode(member))
+                if user_id in self._pending or len(self._pending) >= self.max_pending:
+                    continue
+                self._pending[user_id] = time.monotonic()
+                adopted += 1
+            if adopted:
+                self._condition.notify_all()
+        if adopted:
+            self.recovered += adopted
+            logger.info("Recovered %d users with unwritten favorites changes.", adopted)
+        return adopted
+
+    def flush(self) -> int:
+        """
+        Writes every pending user to MongoDB now, in batches.
+
+        Returns:
+            int: The number of users written.
+
+        Raises:
+            Exception: The MongoDB error, after re-queueing the failed batch.
+        """
+        written = 0
+        while True:
+            batch = self._take_batch()
+            if not batch:
+                return written
+            try:
+                self._write(batch)
+            except Exception:
+                self.failures += 1
+                with self._condition:
+                    for user_id in batch:
+                        self._pending.setdefault(user_id, time.monotonic())
+                raise
+            written += len(batch)
+            self.flushed_users += len(batch)
+            self.batches += 1
+            self.last_batch_size = len(batch)
+            self.max_batch_size = max(self.max_batch_size, len(batch))
+            self.last_flush_at = time.time()
+            logger.debug("Flushed favorites for %d users to MongoDB.", len(batch))
+
+    def _run(self, stop: threading.Event) -> None:
+        next_recover = time.monotonic()
+        while not stop.is_set():
+            if time.monotonic() >= next_recover:
+                next_recover = time.monotonic() + self.recover_interval
+                try:
+                    self.recover()
+                except Exception as e:
+                    logger.error("Could not read the favorites dirty set: %s", str(e))
+            with self._condition:
+                # stop() sets the event before notifying, so checking it here cannot miss the wake-up
+                if len(self._pending) < self.batch_size and not stop.is_set():
+                    self._condition.wait(self.flush_interval)
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error("Favorites write-behind flush failed, retrying: %s", str(e))
+                stop.wait(self.retry_interval)
+
+    def start(self) -> None:
+        """ Starts the background flusher thread. """
+        if self._thread is not None:
+            return
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(self._stop,), name="favorites-flusher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """
+        Stops the flusher thread and writes everything still pending.
+
+        Args:
+            timeout (float): Seconds to wait for the thread to finish its current batch.
+        """
+        if self._thread is not None:
+            self._stop.set()
+            with self._condition:
+                self._condition.notify_all()
+            self._thread.join(timeout)
+            self._thread = None
+        try:
+            flushed = self.flush()
+            if flushed:
+                logger.info("Flushed favorites for %d users on shutdown.", flushed)
+        except Exception as e:
+            logger.error("Could not flush pending favorites on shutdown: %s", str(e))
+
+    def after_fork(self) -> None:
+        """
+        Restarts the flusher in a forked worker. The parent's thread does not
+        exist in the child, so the child starts with an empty queue and adopts
+        whatever is left in the shared dirty set.
+        """
+        self._pending = OrderedDict()
+        self._condition = threading.Condition()
+        self._stop = None
+        self._thread = None
+        self.start()
+
+    def stats(self) -> Dict[str, Any]:
+        """ Returns: Queue depth, lag of the oldest pending change and batch counters. """
+        with self._condition:
+            depth = len(self._pending)
+            oldest = next(iter(self._pending.values()), None)
+        return {
+            "queue_depth": depth,
+            "max_pending": self.max_pending,
+            "lag_seconds": (time.monotonic() - oldest) if oldest is not None else 0.0,
+            "flushed_users": self.flushed_users,
+            "batches": self.batches,
+            "last_batch_size": self.last_batch_size,
+            "max_batch_size": self.max_batch_size,
+            "average_batch_size": (self.flushed_users / self.batches) if self.batches else 0.0,
+            "failures": self.failures,
+            "synchronous_writes": self.synchronous_writes,
+            "expired": self.expired,
+            "recovered": self.recovered,
+            "last_flush_at": self.last_flush_at
+        }
@@ -1,6 +1,6 @@
 import logging
-from typing import Any, List
-from scholarship_finder.clients.mongo_client import sessions_collection
+from typing import Any, List, Optional
+from scholarship_finder.clients.mongo_client import mongo
 from scholarship_finder.utils.logger import configure_logger
 from scholarship_finder.models.favorites_model import FavoritesModel
 
@@ -8,43 +8,45 @@ logger = logging.getLogger(__name__)
 configure_logger(logger)
 
 
-def login_user(user_id: int, favorites_model: FavoritesModel) -> None:
+def login_user(user_id: int, favorites_model: Optional[FavoritesModel] = None) -> List[Any]:
     """
-    Load the user's favorite scholarships from MongoDB into the FavoritesModel's favorites list.
+    Load the user's stored favorites from their MongoDB session.
 
     Checks if a session document exists for the given `user_id` in MongoDB.
-    If it exists, clears any current favorites in `favorites_model` and loads
-    the stored favorites from MongoDB into `favorites_model`.
+    If it exists, its stored favorites are returned and, if a `favorites_model`
+    is given, loaded into it in a single pass.
 
     If no session is found, it creates a new session document for the user
     with an empty favorites list in MongoDB.
 
     Args:
         user_id (int): The ID of the user whose session is to be loaded.
-        favorites_model (FavoritesModel): An instance of `FavoritesModel` where the user's favorite scholarships
-                                          will be loaded.
+        favorites_model (FavoritesModel): Optional model to load the user's favorites into.
+
+    Returns:
+        list: The favorites as stored in the session, to seed `favorites_store` with.
     """
-    logger.info("Attempting to log in user with ID %d.", user_id)
-    session = sessions_collection.find_one({"user_id": user_id})
+    logger.debug("Attempting to log in user with ID %d.", user_id)
+    session = mongo.sessions.find_one({"user_id": user_id}, {"favorites": 1, "_id": 0})
 
     if session:
-        logger.info("Session found for user ID %d. Loading favorites into FavoritesModel.", user_id)
-        favorites_model.clear_favorites()
-        for scholarship_id in session.get("favorites", []):
-            logger.debug("Preparing favorite scholarship ID: %s", scholarship_id)
-            favorites_model.add_to_favorites(scholarship_id)
-        logger.info("Favorites successfully loaded for user ID %d.", user_id)
-    else:
-        logger.info("No session found for user ID %d. Creating a new session with empty favorites list.", user_id)
-        sessions_collection.insert_one({"user_id": user_id, "favorites": []})
-        logger.info("New session created for user ID %d.", user_id)
+        stored = list(session.get("favorites", []))
+        if favorites_model is not None:
+            favorites_model.replace_all(stored)
+        logger.info("%d favorites successfully loaded for user ID %d.", len(stored), user_id)
+        return stored
+    logger.info("No session found for user ID %d. Creating a new session with empty favorites list.", user_id)
+    # Upsert so two concurrent first logins cannot trip the unique user_id index
+    mongo.sessions.update_one({"user_id": user_id}, {"$setOnInsert": {"favorites": []}}, upsert=True)
+    logger.debug("New session created for user ID %d.", user_id)
+    return []
 
 
 def logout_user(user_id: int, favorites_model: FavoritesModel) -> None:
     """
     Store the current favorites from the FavoritesModel back into MongoDB.
 
-    Retrieves the current favorite scholarships from `favorites_model` and attempts to store them in
+    Retrieves the current favorite scholarship IDs from `favorites_model` and attempts to store them in
     the MongoDB session document associated with the given `user_id`. If no session
     document exists for the user, raises a `ValueError`.
 
@@ -59,11 +61,11 @@ def logout_user(user_id: int, favorites_model: FavoritesModel) -> None:
     Raises:
         ValueError: If no session document is found for the user in MongoDB.
     """
-    logger.info("Attempting to log out user with ID %d.", user_id)
+    logger.debug("Attempting to log out user with ID %d.", user_id)
     favorites_data = favorites_model.get_favorites()
     logger.debug("Current favorites for user ID %d: %s", user_id, favorites_data)
 
-    result = sessions_collection.update_one(
+    result = mongo.sessions.update_one(
         {"user_id": user_id},
         {"$set": {"favorites": favorites_data}},
         upsert=False  # Prevents creating a new document if not found
@@ -73,6 +75,63 @@ def logout_user(user_id: int, favorites_model: FavoritesModel) -> None:
         logger.error("No session found for user ID %d. Logout failed.", user_id)
         raise ValueError(f"User with ID {user_id} not found for logout.")
 
-    logger.info("Favorites successfully saved for user ID %d. Clearing FavoritesModel favorites.", user_id)
+    logger.debug("Favorites successfully saved for user ID %d. Clearing FavoritesModel favorites.", user_id)
+    favorites_model.clear_favorites()
+    logger.debug("FavoritesModel favorites cleared for user ID %d.", user_id)
+
+
+async def login_user_async(user_id: int, favorites_model: Optional[FavoritesModel] = None,
+                           sessions=None) -> List[Any]:
+    """
+    Coroutine version of `login_user` for the ASGI app.
+
+    Args:
+        user_id (int): The ID of the user whose session is to be loaded.
+        favorites_model (FavoritesModel): Optional model to load the stored favorites into.
+        sessions: The async 'sessions' collection, defaults to the running event loop's.
+
+    Returns:
+        list: The favorites as stored in the session.
+    """
+    if sessions is None:
+        from scholarship_finder.clients.async_clients import async_clients
+        sessions = async_clients.sessions
+    logger.debug("Attempting to log in user with ID %d.", user_id)
+    session = await sessions.find_one({"user_id": user_id}, {"favorites": 1, "_id": 0})
+
+    if session:
+        stored = list(session.get("favorites", []))
+        if favorites_model is not None:
+            favorites_model.replace_all(stored)
+        logger.info("%d favorites successfully loaded for user ID %d.", len(stored), user_id)
+        return stored
+    logger.info("No session found for user ID %d. Creating a new session with empty favorites list.", user_id)
+    await sessions.update_one({"user_id": user_id}, {"$setOnInsert": {"favorites": []}}, upsert=True)
+    return []
+
+
+async def logout_user_async(user_id: int, favorites_model: FavoritesModel, sessions=None) -> None:
+    """
+    Coroutine version of `logout_user` for the ASGI app.
+
+    Args:
+        user_id (int): The ID of the user whose session data is to be saved.
+        favorites_model (FavoritesModel): The model holding the favorites to save; cleared afterwards.
+        sessions: The async 'sessions' collection, defaults to the running event loop's.
+
+    Raises:
+        ValueError: If no session document is found for the user in MongoDB.
+    """
+    if sessions is None:
+        from scholarship_finder.clients.async_clients import async_clients
+        sessions = async_clients.sessions
+    logger.debug("Attempting to log out user with ID %d.", user_id)
+    result = await sessions.update_one({"user_id": user_id}, {"$set": {"favorites": favorites_model.get_favorites()}},
+                                       upsert=False)
+
+    if result.matched_count == 0:
+        logger.error("No session found for user ID %d. Logout failed.", user_id)
+        raise ValueError(f"User with ID {user_id} not found for logout.")
+
     favorites_model.clear_favorites()
-    logger.info("FavoritesModel favorites cleared for user ID %d.", user_id)
+    logger.info("Favorites successfully saved for user ID %d.", user_id)
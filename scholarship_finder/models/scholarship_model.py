@@ -15,6 +15,8 @@ class Scholarship:
     A class representing a scholarship with various attributes matching Notion database structure.
     """
 
+    __slots__ = ("university", "scholarship_name", "type", "degree_level", "country", "deadline", "min_gpa", "major")
+
     def __init__(
         self,
         university: str,
@@ -58,4 +60,4 @@ class Scholarship:
     @classmethod
     def sort_by_deadline(cls, scholarships: List["Scholarship"]) -> List["Scholarship"]:
         """Sorts scholarships by deadline."""
-        return sorted(scholarships, key=lambda s: s.deadline)
\ No newline at end of file
+        return sorted(scholarships, key=lambda s: s.deadline)
@@ -0,0 +1,105 @@
+import heapq
+import math
+import re
+import unicodedata
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+# Relative weight of a term occurrence in each field
+FIELD_WEIGHTS = (("scholarship_name", 2.0), ("university", 1.5), ("major", 1.0))
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Splits text into lowercase, accent-folded word tokens.
+
+    Args:
+        text (str): The text to tokenize.
+
+    Returns:
+        list: The tokens, in order.
+    """
+    if not text:
+        return []
+    folded = unicodedata.normalize("NFKD", text.lower())
+    folded = "".join(ch for ch in folded if not unicodedata.combining(ch))
+    return _TOKEN_RE.findall(folded)
+
+
+def _document_terms(key: Tuple) -> Tuple[Dict[str, float], float]:
+    name, university, majors = key
+    fields = {"scholarship_name": name, "university": university, "major": " ".join(majors)}
+    terms: Counter = Counter()
+    length = 0.0
+    for field, weight in FIELD_WEIGHTS:
+        for token in tokenize(fields[field]):
+            terms[token] += weight
+            length += weight
+    return dict(terms), length
+
+
+class SearchIndex:
+    """
+    Tokenized inverted index over scholarship names, universities and majors.
+
+    Queries are ranked with BM25 and the top results are taken with a heap, so
+    a search touches only the posting lists of its terms. When built from a
+    newer catalog, per-row term frequencies are reused from the previous index
+    for every row whose searchable text did not change, so a refresh only
+    tokenizes changed rows.
+    """
+
+    def __init__(self, documents: Iterable[Tuple[str, str, Tuple[str, ...]]], previous: Optional["SearchIndex"] = None):
+        reusable = previous._documents if previous is not None else {}
+        self._documents: Dict[Tuple, Tuple[Dict[str, float], float]] = {}
+        self.postings: Dict[str, List[Tuple[int, float]]] = {}
+        self.lengths: List[float] = []
+        self.tokenized = 0
+        for position, key in enumerate(documents):
+            document = self._documents.get(key) or reusable.get(key)
+            if document is None:
+                document = _document_terms(key)
+                self.tokenized += 1
+            self._documents[key] = document
+            terms, length = document
+            self.lengths.append(length)
+            for term, frequency in terms.items():
+                self.postings.setdefault(term, []).append((position, frequency))
+        self.average_length = (sum(self.lengths) / len(self.lengths)) if self.lengths else 0.0
+
+    def __len__(self) -> int:
+        return len(self.lengths)
+
+    def search(self, query: str, limit: int = 20, candidates: Optional[Set[int]] = None) -> List[Tuple[int, float]]:
+        """
+        Ranks rows against a keyword query.
+
+        Args:
+            query (str): Free-text query.
+            limit (int): Maximum number of results.
+            candidates (set): Restrict results to these row positions, if given.
+
+        Returns:
+            list: `(position, score)` pairs, best first; ties keep catalog order.
+        """
+        count = len(self.lengths)
+        if not count or limit <= 0:
+            return []
+        scores: Dict[int, float] = {}
+        for term in set(tokenize(query)):
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for position, frequency in postings:
+                if candidates is not None and position not in candidates:
+                    continue
+                norm = K1 * (1 - B + B * self.lengths[position] / self.average_length)
+                scores[position] = scores.get(position, 0.0) + idf * frequency * (K1 + 1) / (frequency + norm)
+        return heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], -item[0]))
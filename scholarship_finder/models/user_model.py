@@ -1,17 +1,79 @@
+import csv
 import hashlib
+import hmac
 import logging
 import os
 
+from itertools import islice
+from sqlalchemy import insert
 from sqlalchemy.exc import IntegrityError
-from typing import Tuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 # The database and logger imports need to be changed here
 from scholarship_finder.db import db
 from scholarship_finder.utils.logger import configure_logger
+from scholarship_finder.utils.ttl_cache import TTLCache
 
 logger = logging.getLogger(__name__)
 configure_logger(logger)
 
+# username -> (generation, (id, salt, password hash)); invalidated on password change and deletion
+credential_cache = TTLCache(max_entries=10000, ttl=60.0)
+
+# Redis hash of username -> generation, bumped whenever a user's credentials change
+CREDENTIAL_GENERATIONS_KEY = "credentials:generation"
+_shared_invalidation = False
+
+
+def init_credential_cache(app) -> None:
+    """
+    Sizes the credential cache from the Flask config and empties it.
+
+    With `USER_CREDENTIAL_CACHE_SHARED` set, every cache hit is checked against
+    the user's generation in Redis, so a password change or deletion in one
+    worker takes effect in all of them at once.
+
+    Args:
+        app (Flask): The application whose config holds the `USER_CREDENTIAL_CACHE_*` settings.
+    """
+    global _shared_invalidation
+    credential_cache.max_entries = app.config.get('USER_CREDENTIAL_CACHE_SIZE', credential_cache.max_entries)
+    credential_cache.ttl = app.config.get('USER_CREDENTIAL_CACHE_TTL_SECONDS', credential_cache.ttl)
+    _shared_invalidation = bool(app.config.get('USER_CREDENTIAL_CACHE_SHARED', False))
+    credential_cache.clear()
+
+
+def _generation(username: str) -> Optional[str]:
+    """ Returns: The user's credential generation, "" when caching is per process, or None if Redis is down. """
+    if not _shared_invalidation:
+        return ""
+    from scholarship_finder.clients.redis_client import redis_connection
+    try:
+        value = redis_connection.client.hget(CREDENTIAL_GENERATIONS_KEY, username)
+    except Exception as e:
+        logger.warning("Could not read the credential generation, bypassing the cache: %s", str(e))
+        return None
+    return value.decode() if isinstance(value, bytes) else (value or "0")
+
+
+def invalidate_credentials(username: str) -> None:
+    """
+    Drops a user's cached credentials in this process and, with shared
+    invalidation, in every other worker.
+
+    Args:
+        username (str): The username whose credentials changed.
+    """
+    credential_cache.invalidate(username)
+    if not _shared_invalidation:
+        return
+    from scholarship_finder.clients.redis_client import redis_connection
+    try:
+        redis_connection.client.hincrby(CREDENTIAL_GENERATIONS_KEY, username, 1)
+    except Exception as e:
+        logger.error("Could not invalidate cached credentials for %s in other workers for up to %.0f s: %s",
+                     username, credential_cache.ttl, str(e))
+
 
 class User(db.Model):
     __tablename__ = 'users'
@@ -63,6 +125,151 @@ class User(db.Model):
             logger.error("Database error: %s", str(e))
             raise
 
+    @classmethod
+    def bulk_create_users(cls, records: Iterable[Tuple], batch_size: int = 1000) -> Dict[str, Any]:
+        """
+        Create many users, committing one transaction per batch.
+
+        Passwords are hashed inline: SHA-256 holds the GIL on inputs this
+        short, so threads would not hash any faster. Existing usernames are
+        found with one query per batch, and the rest are inserted with a
+        single multi-row INSERT. Malformed records and duplicate usernames
+        (already stored, or repeated in the input) are reported per record
+        instead of aborting the import. If the input itself cannot be read,
+        e.g. invalid UTF-8, the import stops there and the batches already
+        committed are reported with the line it stopped at.
+
+        Args:
+            records (iterable): `(line_number, username, password, error)` tuples,
+                as produced by `iter_user_records`.
+            batch_size (int): Users inserted per transaction.
+
+        Returns:
+            dict: Counts of `created` and `failed` users, the number of
+            `transactions` committed and an `errors` list of
+            `{"line", "username", "error"}`; plus `aborted`, `{"line", "error"}`,
+            if the input could not be read to the end.
+        """
+        created, transactions = 0, 0
+        errors: List[Dict[str, Any]] = []
+        seen = set()
+        records = iter(records)
+        aborted: Optional[Dict[str, Any]] = None
+        last_line = 0
+        try:
+            while aborted is None:
+                batch = []
+                try:
+                    batch.extend(islice(records, batch_size))
+                except (ValueError, csv.Error) as e:
+                    # Everything before this point is still imported; nothing after it is
+                    aborted = {"line": (batch[-1][0] if batch else last_line) + 1, "error": str(e)}
+                if not batch:
+                    break
+                last_line = batch[-1][0]
+                pending = []
+                for line, username, password, error in batch:
+                    if error is None and username in seen:
+                        error = "duplicate username in input"
+                    if error is not None:
+                        errors.append({"line": line, "username": username, "error": error})
+                        continue
+                    seen.add(username)
+                    pending.append((line, username, password))
+                if not pending:
+                    continue
+
+                existing = {username for (username,) in db.session.query(cls.username).filter(
+                    cls.username.in_([username for _, username, _ in pending]))}
+                for line, username, _ in pending:
+                    if username in existing:
+                        errors.append({"line": line, "username": username, "error": "username already exists"})
+                pending = [record for record in pending if record[1] not in existing]
+                if not pending:
+                    continue
+
+                hashed = [cls._generate_hashed_password(password) for _, _, password in pending]
+                rows = [{"username": username, "salt": salt, "password": hashed_password}
+                        for (_, username, _), (salt, hashed_password) in zip(pending, hashed)]
+                try:
+                    db.session.execute(insert(cls), rows)
+                    db.session.commit()
+                    created += len(rows)
+                except IntegrityError:
+                    # A concurrent writer took some of these usernames; insert row by row
+                    db.session.rollback()
+                    for (line, username, _), row in zip(pending, rows):
+                        try:
+                            with db.session.begin_nested():
+                                db.session.execute(insert(cls), [row])
+                            created += 1
+                        except IntegrityError:
+                            errors.append({"line": line, "username": username, "error": "username already exists"})
+                    db.session.commit()
+                transactions += 1
+        except Exception as e:
+            db.session.rollback()
+            logger.error("Bulk user import failed after %d users: %s", created, str(e))
+            raise
+
+        errors.sort(key=lambda error: error["line"])
+        logger.info("Bulk import created %d users in %d transactions; %d records failed.",
+                    created, transactions, len(errors))
+        report = {"created": created, "failed": len(errors), "transactions": transactions, "errors": errors}
+        if aborted is not None:
+            logger.warning("Bulk import stopped at line %d: %s", aborted["line"], aborted["error"])
+            report["aborted"] = aborted
+        return report
+
+    @classmethod
+    def _credentials(cls, username: str) -> Tuple[int, str, str]:
+        """
+        Returns a user's id, salt and password hash, from the credential cache or
+        a single query on the unique username index.
+
+        Args:
+            username (str): The username of the user.
+
+        Returns:
+            tuple: The user's id, salt and password hash.
+
+        Raises:
+            ValueError: If the user does not exist.
+        """
+        # Read before the query, so a change committed in between makes the entry stale, not current
+        generation = _generation(username)
+        if generation is not None:
+            cached = credential_cache.get(username)
+            if cached is not None and cached[0] == generation:
+                return cached[1]
+        row = db.session.query(cls.id, cls.salt, cls.password).filter_by(username=username).first()
+        if not row:
+            logger.info("User %s not found", username)
+            raise ValueError(f"User {username} not found")
+        credentials = (row.id, row.salt, row.password)
+        if generation is not None:
+            credential_cache.put(username, (generation, credentials))
+        return credentials
+
+    @classmethod
+    def authenticate(cls, username: str, password: str) -> Tuple[int, bool]:
+        """
+        Look up a user and verify their password in one step.
+
+        Args:
+            username (str): The username of the user.
+            password (str): The password to check.
+
+        Returns:
+            tuple: The user's id and whether the password is correct.
+
+        Raises:
+            ValueError: If the user does not exist.
+        """
+        user_id, salt, stored_hash = cls._credentials(username)
+        hashed_password = hashlib.sha256((password + salt).encode()).hexdigest()
+        return user_id, hmac.compare_digest(hashed_password, stored_hash)
+
     @classmethod
     def check_password(cls, username: str, password: str) -> bool:
         """
@@ -78,12 +285,23 @@ class User(db.Model):
         Raises:
             ValueError: If the user does not exist.
         """
-        user = cls.query.filter_by(username=username).first()
-        if not user:
-            logger.info("User %s not found", username)
-            raise ValueError(f"User {username} not found")
-        hashed_password = hashlib.sha256((password + user.salt).encode()).hexdigest()
-        return hashed_password == user.password
+        return cls.authenticate(username, password)[1]
+
+    @classmethod
+    def get_id_by_username(cls, username: str) -> int:
+        """
+        Get the id of a user.
+
+        Args:
+            username (str): The username of the user.
+
+        Returns:
+            int: The user's id.
+
+        Raises:
+            ValueError: If the user does not exist.
+        """
+        return cls._credentials(username)[0]
 
     @classmethod
     def delete_user(cls, username: str) -> None:
@@ -102,6 +320,7 @@ class User(db.Model):
             raise ValueError(f"User {username} not found")
         db.session.delete(user)
         db.session.commit()
+        invalidate_credentials(username)
         logger.info("User %s deleted successfully", username)
 
     @classmethod
@@ -125,4 +344,5 @@ class User(db.Model):
         user.salt = salt
         user.password = hashed_password
         db.session.commit()
+        invalidate_credentials(username)
         logger.info("Password updated successfully for user: %s", username)
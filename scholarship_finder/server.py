@@ -0,0 +1,66 @@
+import logging
+
+from scholarship_finder.clients.mongo_client import mongo
+from scholarship_finder.db import db
+from scholarship_finder.models.catalog_model import CatalogSnapshot, catalog_cache
+from scholarship_finder.models.favorites_store import favorites_store
+from scholarship_finder.utils.logger import configure_logger
+from scholarship_finder.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+def warm_up(app) -> CatalogSnapshot:
+    """
+    Loads the catalog and encodes every row, so a preforking server can do it
+    once in the parent and share the result with its workers copy-on-write.
+
+    Args:
+        app (Flask): The application.
+
+    Returns:
+        CatalogSnapshot: The loaded snapshot.
+    """
+    with app.app_context():
+        snapshot = catalog_cache.get_snapshot()  # Builds the indexes too
+        for position in range(len(snapshot)):
+            snapshot.row_json(position)
+    logger.info("Warmed catalog version %d with %d scholarships.", snapshot.version, len(snapshot))
+    return snapshot
+
+
+def reset_after_fork(app) -> None:
+    """
+    Gives a forked worker its own connections and background threads.
+
+    Pooled SQLite and MongoDB connections opened in the parent must not be
+    shared, and the parent's threads (shared catalog listener, favorites
+    write-behind flusher) do not exist in the child. Metrics recorded while
+    the parent started up are discarded, so each worker reports only its own.
+
+    Args:
+        app (Flask): The application.
+    """
+    with app.app_context():
+        db.engine.dispose(close=False)  # Leave the parent's connections to the parent
+    mongo.reset()
+    catalog_cache.after_fork()
+    if catalog_cache.version == 0:
+        catalog_cache.load_in_background()  # The master's warm-up failed; keep trying until ready
+    if favorites_store.writer is not None:
+        favorites_store.writer.after_fork()
+    metrics.reset()
+
+
+def shutdown(app) -> None:
+    """
+    Stops background work before a worker exits, writing pending favorites.
+
+    Args:
+        app (Flask): The application.
+    """
+    if favorites_store.writer is not None:
+        favorites_store.writer.stop()
+    catalog_cache.stop_listener()
+    logger.info("Worker shut down cleanly.")
@@ -0,0 +1,98 @@
+import asyncio
+import functools
+import os
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+
+class BoundedExecutor:
+    """
+    Runs blocking calls (password hashing, SQLAlchemy) from coroutines on a fixed thread pool.
+
+    At most `max_workers + max_pending` calls are handed to the pool at once;
+    further callers wait on an asyncio semaphore, which costs no thread, so a
+    burst of slow requests queues on the event loop instead of growing the
+    pool's unbounded work queue. When `context` is given, each call runs
+    inside it, e.g. `app.app_context` for calls that need Flask's `db.session`.
+    """
+
+    def __init__(self, max_workers: int = 16, max_pending: int = 256,
+                 context: Optional[Callable[[], Any]] = None):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.context = context
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._pid: Optional[int] = None
+        self._semaphores: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()  # event loop -> Semaphore
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.completed = 0
+
+    @property
+    def pool(self) -> ThreadPoolExecutor:
+        """ Returns: The thread pool for the current process. """
+        pid = os.getpid()
+        if self._pool is None or self._pid != pid:
+            with self._lock:
+                if self._pool is None or self._pid != pid:
+                    self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="blocking")
+                    self._pid = pid
+        return self._pool
+
+    def _semaphore(self, loop: asyncio.AbstractEventLoop) -> asyncio.Semaphore:
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_workers + self.max_pending)
+            self._semaphores[loop] = semaphore
+        return semaphore
+
+    def _call(self, func: Callable, args: tuple, kwargs: dict) -> Any:
+        if self.context is None:
+            return func(*args, **kwargs)
+        with self.context():
+            return func(*args, **kwargs)
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        Runs a blocking function on the pool and waits for its result.
+
+        Args:
+            func (callable): The blocking function.
+            *args: Its positional arguments.
+            **kwargs: Its keyword arguments.
+
+        Returns:
+            The function's return value; its exception is raised in the caller.
+        """
+        loop = asyncio.get_running_loop()
+        async with self._semaphore(loop):
+            self.in_flight += 1
+            try:
+                return await loop.run_in_executor(self.pool, functools.partial(self._call, func, args, kwargs))
+            finally:
+                self.in_flight -= 1
+                self.completed += 1
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Stops the pool; a later call starts a new one.
+
+        Args:
+            wait (bool): Whether to wait for running calls to finish.
+        """
+        with self._lock:
+            if self._pool is not None and self._pid == os.getpid():
+                self._pool.shutdown(wait=wait)
+            self._pool = None
+            self._pid = None
+
+    def stats(self) -> Dict[str, Any]:
+        """ Returns: Pool size, queue bound and call counters. """
+        return {
+            "max_workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "in_flight": self.in_flight,
+            "completed": self.completed
+        }
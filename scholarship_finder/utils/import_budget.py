@@ -0,0 +1,130 @@
+"""
+Reports what starting the app costs, module by module.
+
+Usage:
+    python -m scholarship_finder.utils.import_budget [--top 15] [--budget-ms 250]
+
+Runs `from app import create_app; create_app()` in a fresh interpreter with
+`-X importtime` and prints the most expensive imports and the time spent in
+`create_app()`. Exits with status 1 if a client library that should only load
+on first use was imported, or if `create_app()` exceeded the budget.
+"""
+import argparse
+import os
+import subprocess
+import sys
+from typing import Dict, List, NamedTuple, Optional
+
+# Modules that must not load until a route needs them
+DEFERRED_MODULES = ("pymongo", "redis", "notion_client", "requests", "httpx")
+
+DEFAULT_BUDGET_MS = 250.0
+
+_STARTUP = """
+import time
+start = time.perf_counter()
+from app import create_app
+from {module} import {name} as config_class
+imported = time.perf_counter()
+create_app(config_class)
+print(imported - start, time.perf_counter() - imported)
+"""
+
+
+class ImportCost(NamedTuple):
+    module: str
+    self_us: int
+    cumulative_us: int
+
+
+class StartupProfile(NamedTuple):
+    imports: List[ImportCost]
+    import_seconds: float
+    create_app_seconds: float
+
+    @property
+    def modules(self) -> Dict[str, ImportCost]:
+        """ Returns: Import cost by module name. """
+        return {cost.module: cost for cost in self.imports}
+
+    def deferred_imported(self) -> List[str]:
+        """ Returns: The `DEFERRED_MODULES` that were imported anyway. """
+        return [name for name in DEFERRED_MODULES if name in self.modules]
+
+
+def parse_importtime(output: str) -> List[ImportCost]:
+    """
+    Parses the `-X importtime` report.
+
+    Args:
+        output (str): The interpreter's stderr.
+
+    Returns:
+        list: One entry per imported module, in import order.
+    """
+    costs = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = [field.strip() for field in line[len("import time:"):].split("|")]
+        if len(fields) != 3 or not fields[0].isdigit():
+            continue  # The header line
+        costs.append(ImportCost(fields[2], int(fields[0]), int(fields[1])))
+    return costs
+
+
+def profile_startup(config: str = "config.ProductionConfig", cwd: Optional[str] = None) -> StartupProfile:
+    """
+    Imports the app and calls `create_app()` in a fresh interpreter.
+
+    The database URL is pointed at an in-memory SQLite database so profiling
+    leaves no files behind.
+
+    Args:
+        config (str): Dotted path of the config class to pass to `create_app()`.
+        cwd (str): The directory holding `app.py`, defaults to the current one.
+
+    Returns:
+        StartupProfile: Per-module import costs and the measured times.
+
+    Raises:
+        RuntimeError: If the app fails to start.
+    """
+    module, name = config.rsplit(".", 1)
+    env = dict(os.environ, DATABASE_URL="sqlite://")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _STARTUP.format(module=module, name=name)],
+        cwd=cwd, env=env, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"App failed to start:\n{result.stderr[-2000:]}")
+    import_seconds, create_app_seconds = (float(value) for value in result.stdout.split()[-2:])
+    return StartupProfile(parse_importtime(result.stderr), import_seconds, create_app_seconds)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Report the app's import and create_app() cost.")
+    parser.add_argument("--top", type=int, default=15, help="Number of modules to list.")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS, help="Allowed create_app() time.")
+    parser.add_argument("--config", default="config.ProductionConfig", help="Config class to start the app with.")
+    args = parser.parse_args()
+
+    profile = profile_startup(args.config)
+    print(f"{'module':<50} {'self ms':>9} {'total ms':>9}")
+    for cost in sorted(profile.imports, key=lambda cost: cost.self_us, reverse=True)[:args.top]:
+        print(f"{cost.module:<50} {cost.self_us / 1000:>9.1f} {cost.cumulative_us / 1000:>9.1f}")
+    print(f"\nimports: {profile.import_seconds * 1000:.0f} ms, "
+          f"create_app(): {profile.create_app_seconds * 1000:.0f} ms (budget {args.budget_ms:.0f} ms)")
+
+    failed = False
+    for name in profile.deferred_imported():
+        print(f"FAIL: {name} is imported at startup; import it where it is first used.")
+        failed = True
+    if profile.create_app_seconds * 1000 > args.budget_ms:
+        print("FAIL: create_app() is over budget.")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
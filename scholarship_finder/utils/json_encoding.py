@@ -0,0 +1,77 @@
+import json
+from typing import Any, Dict, Iterable, Iterator
+
+try:
+    import orjson  # Optional: several times faster than the standard library encoder
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+
+def dumps(obj: Any) -> bytes:
+    """
+    Encodes an object as compact UTF-8 JSON.
+
+    Uses orjson when it is installed and the standard library otherwise.
+
+    Args:
+        obj: A JSON-serializable object.
+
+    Returns:
+        bytes: The encoded JSON.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def _array_prefix(envelope: Dict[str, Any], key: str) -> bytes:
+    head = dumps(envelope)[:-1]  # drop the closing brace
+    separator = b"," if envelope else b""
+    return head + separator + dumps(key) + b":["
+
+
+def join_fragments(envelope: Dict[str, Any], key: str, fragments: Iterable[bytes]) -> bytes:
+    """
+    Builds a JSON object from an envelope plus an array of pre-encoded items.
+
+    Args:
+        envelope (dict): The object's other fields, encoded normally.
+        key (str): Name of the array field, placed last.
+        fragments (iterable): Already-encoded JSON items of the array.
+
+    Returns:
+        bytes: The complete JSON document.
+    """
+    return _array_prefix(envelope, key) + b",".join(fragments) + b"]}"
+
+
+def iter_json_chunks(envelope: Dict[str, Any], key: str, fragments: Iterable[bytes],
+                     chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+    """
+    Streams the same document as `join_fragments` in chunks of about `chunk_size`
+    bytes, so the full body is never held in memory at once.
+
+    Args:
+        envelope (dict): The object's other fields, encoded normally.
+        key (str): Name of the array field, placed last.
+        fragments (iterable): Already-encoded JSON items of the array.
+        chunk_size (int): Target size of each yielded chunk.
+
+    Yields:
+        bytes: Consecutive pieces of the JSON document.
+    """
+    buffer = [_array_prefix(envelope, key)]
+    size = len(buffer[0])
+    first = True
+    for fragment in fragments:
+        if not first:
+            buffer.append(b",")
+            size += 1
+        first = False
+        buffer.append(fragment)
+        size += len(fragment)
+        if size >= chunk_size:
+            yield b"".join(buffer)
+            buffer, size = [], 0
+    buffer.append(b"]}")
+    yield b"".join(buffer)
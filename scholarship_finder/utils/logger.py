@@ -1,26 +1,223 @@
+import atexit
+import copy
 import logging
+import os
+import queue
 import sys
+import threading
+import time
+import weakref
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional, Tuple
 
 from flask import current_app, has_request_context
 
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+DEFAULT_LEVEL = os.environ.get('LOG_LEVEL', 'INFO').upper()
+DEFAULT_QUEUE_SIZE = 10000
+DEFAULT_RATE_LIMIT = 20  # Records per call site per second
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Lets at most `limit` records per call site through in each `interval`.
+
+    A call site is the file and line of the logging call, so a log line inside
+    a per-item loop cannot flood the output while other lines are unaffected.
+    Only records below WARNING are limited; warnings and errors always pass.
+    The first record let through after a suppressed burst carries how many
+    were dropped in its `rate_limit_suppressed` attribute, which
+    `SuppressedCountFormatter` appends to the line. A limit of 0 disables the filter.
+    """
+
+    def __init__(self, limit: int = DEFAULT_RATE_LIMIT, interval: float = 1.0):
+        super().__init__()
+        self.limit = limit
+        self.interval = interval
+        self._windows: Dict[Tuple[str, int], list] = {}  # call site -> [window start, count, suppressed]
+        self._lock = threading.Lock()
+        self.suppressed = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.limit <= 0 or record.levelno >= logging.WARNING:
+            return True
+        site = (record.pathname, record.lineno)
+        now = time.monotonic()
+        with self._lock:
+            window = self._windows.get(site)
+            if window is None or now - window[0] >= self.interval:
+                suppressed = window[2] if window else 0
+                self._windows[site] = [now, 1, 0]
+            elif window[1] < self.limit:
+                window[1] += 1
+                return True
+            else:
+                window[2] += 1
+                self.suppressed += 1
+                return False
+        if suppressed:
+            record.rate_limit_suppressed = suppressed
+        return True
+
+
+class SuppressedCountFormatter(logging.Formatter):
+    """ Appends the count of records `RateLimitFilter` dropped before this one. """
+
+    def format(self, record: logging.LogRecord) -> str:
+        text = super().format(record)
+        suppressed = getattr(record, 'rate_limit_suppressed', 0)
+        return f"{text} [{suppressed} similar messages suppressed]" if suppressed else text
+
+
+class _DroppingQueueHandler(QueueHandler):
+    """
+    Hands records to the background listener without blocking the caller.
+
+    Only the message arguments are merged here, because they may change after
+    the call; timestamps and the layout are formatted on the listener thread.
+    When the queue is full the record is dropped and counted.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def _parse_level(level) -> int:
+    if isinstance(level, int):
+        return level
+    value = logging.getLevelName(str(level).upper())
+    return value if isinstance(value, int) else logging.INFO
+
+
+_lock = threading.Lock()
+_level = _parse_level(DEFAULT_LEVEL)
+_handler: Optional[_DroppingQueueHandler] = None
+_listener: Optional[QueueListener] = None
+_rate_limit = RateLimitFilter()
+_loggers: "weakref.WeakSet[logging.Logger]" = weakref.WeakSet()
 
-def configure_logger(logger):
-    logger.setLevel(logging.DEBUG)  # Set the desired logging level here
 
-    # Create a console handler that logs to stderr
-    handler = logging.StreamHandler(sys.stderr)
-    handler.setLevel(logging.DEBUG)
+def _start_listener(queue_size: int = DEFAULT_QUEUE_SIZE) -> None:
+    global _handler, _listener
+    stream = logging.StreamHandler(sys.stderr)
+    stream.setFormatter(SuppressedCountFormatter(LOG_FORMAT))
+    log_queue = queue.Queue(maxsize=queue_size)
+    if _handler is None:
+        _handler = _DroppingQueueHandler(log_queue)
+        _handler.addFilter(_rate_limit)
+    else:
+        _handler.queue = log_queue
+    _listener = QueueListener(log_queue, stream, respect_handler_level=False)
+    _listener.start()
 
-    # Create a formatter with a timestamp
-    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 
-    # Add the formatter to the handler
-    handler.setFormatter(formatter)
+def _shared_handler() -> _DroppingQueueHandler:
+    if _handler is None:
+        with _lock:
+            if _handler is None:
+                _start_listener()
+    return _handler
 
-    # Add the handler to the logger
-    logger.addHandler(handler)
+
+def _restart_after_fork() -> None:
+    # The listener thread does not survive fork; give the child its own queue and thread
+    global _listener
+    if _handler is not None:
+        _listener = None
+        _start_listener(_handler.queue.maxsize)
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_restart_after_fork)
+
+
+def configure_logger(logger):
+    """
+    Routes a logger through the shared background handler at the configured level.
+
+    Safe to call any number of times for the same logger: the handler is only
+    attached once.
+
+    Args:
+        logger (Logger): The logger to configure.
+    """
+    handler = _shared_handler()
+    logger.setLevel(_level)
+    if handler not in logger.handlers:
+        logger.addHandler(handler)
+    _loggers.add(logger)
 
     if has_request_context():
         app_logger = current_app.logger
         for handler in app_logger.handlers:
-            logger.addHandler(handler)
+            if handler not in logger.handlers:
+                logger.addHandler(handler)
+
+
+def init_logging(app) -> None:
+    """
+    Applies the logging settings from the Flask config to every configured logger.
+
+    Reads `LOG_LEVEL`, `LOG_QUEUE_SIZE` and `LOG_RATE_LIMIT_PER_SECOND`, and
+    moves the app's own logger onto the background handler.
+
+    Args:
+        app (Flask): The application.
+    """
+    global _level
+    _level = _parse_level(app.config.get('LOG_LEVEL', DEFAULT_LEVEL))
+    _rate_limit.limit = app.config.get('LOG_RATE_LIMIT_PER_SECOND', _rate_limit.limit)
+
+    handler = _shared_handler()
+    queue_size = app.config.get('LOG_QUEUE_SIZE', DEFAULT_QUEUE_SIZE)
+    if handler.queue.maxsize != queue_size:
+        with _lock:
+            stop_logging()
+            _start_listener(queue_size)
+
+    from flask.logging import default_handler
+    app.logger.removeHandler(default_handler)
+    configure_logger(app.logger)
+    for logger in list(_loggers):
+        logger.setLevel(_level)
+
+
+def stop_logging() -> None:
+    """ Writes out queued records and stops the listener thread. """
+    global _listener
+    if _listener is not None:
+        try:
+            _listener.stop()
+        except queue.Full:
+            pass  # No room for the stop sentinel; the daemon thread dies with the process
+        _listener = None
+
+
+def logging_stats() -> Dict[str, int]:
+    """ Returns: Queue depth and the number of records dropped or rate-limited. """
+    handler = _handler
+    return {
+        "queue_depth": handler.queue.qsize() if handler else 0,
+        "dropped": handler.dropped if handler else 0,
+        "rate_limited": _rate_limit.suppressed
+    }
+
+
+atexit.register(stop_logging)
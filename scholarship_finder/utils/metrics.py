@@ -0,0 +1,272 @@
+import threading
+import weakref
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Request latency, in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Single database commands and queries
+FAST_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Sharded:
+    """
+    Base for metrics whose samples are kept in per-thread shards.
+
+    Each thread updates its own dict, so recording takes no lock; the lock is
+    only taken when a thread creates its shard and when a scrape merges them.
+    A scrape can miss an update that is in progress, never corrupt one.
+    When a thread exits, its shard is folded into a retired total, so
+    short-lived threads do not leave a shard each behind.
+    """
+
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        self._shards: List[dict] = []
+        self._retired: dict = {}
+        self._lock = threading.Lock()
+
+    def _shard(self) -> dict:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = {}
+            # Dropped with the thread's locals when it exits, which retires the shard
+            self._local.owner = owner = _ShardOwner()
+            weakref.finalize(owner, self._retire, shard)
+            with self._lock:
+                self._shards.append(shard)
+        return shard
+
+    def _retire(self, shard: dict) -> None:
+        with self._lock:
+            for index, live in enumerate(self._shards):
+                if live is shard:  # Not a shard discarded by `reset`
+                    del self._shards[index]
+                    self._merge(self._retired, shard)
+                    break
+
+    def _merge(self, total: dict, shard: dict) -> dict:
+        """ Adds a shard's samples to `total` and returns it. """
+        raise NotImplementedError
+
+    def _snapshot(self) -> List[dict]:
+        with self._lock:
+            return [self._merge({}, self._retired)] + [dict(shard) for shard in self._shards]
+
+    def _merged(self) -> dict:
+        merged: dict = {}
+        for shard in self._snapshot():
+            self._merge(merged, shard)
+        return merged
+
+    def reset(self) -> None:
+        """ Discards every recorded sample. """
+        with self._lock:
+            # Released after the lock, as dropping it runs the `_retire` finalizers
+            discarded, self._local = self._local, threading.local()
+            self._shards = []
+            self._retired = {}
+        del discarded
+
+
+class _ShardOwner:
+    """ Lives in a thread's locals next to its shard; weakly referenced to notice the thread exiting. """
+
+
+class Counter(_Sharded):
+    """ A monotonically increasing count per label combination. """
+
+    kind = "counter"
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        """
+        Adds to the count for the given label values.
+
+        Args:
+            *labels: One value per label name, in order.
+            amount (float): How much to add.
+        """
+        shard = self._shard()
+        shard[labels] = shard.get(labels, 0) + amount
+
+    def _merge(self, total: dict, shard: dict) -> dict:
+        for labels, value in shard.items():
+            total[labels] = total.get(labels, 0) + value
+        return total
+
+    def values(self) -> Dict[LabelValues, float]:
+        """ Returns: The merged count per label combination. """
+        return self._merged()
+
+    def render(self) -> Iterable[str]:
+        for labels, value in sorted(self.values().items()):
+            yield f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}"
+
+
+class Histogram(_Sharded):
+    """ Observations counted into cumulative buckets, with their sum and count. """
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *labels: str) -> None:
+        """
+        Records one observation.
+
+        Args:
+            value (float): The observed value, e.g. a duration in seconds.
+            *labels: One value per label name, in order.
+        """
+        shard = self._shard()
+        counts = shard.get(labels)
+        if counts is None:
+            counts = shard[labels] = [0] * (len(self.buckets) + 1) + [0.0]  # Buckets, +Inf, sum
+        counts[bisect_left(self.buckets, value)] += 1
+        counts[-1] += value
+
+    def _merge(self, total: dict, shard: dict) -> dict:
+        for labels, counts in shard.items():
+            sums = total.setdefault(labels, [0] * (len(self.buckets) + 1) + [0.0])
+            for index, value in enumerate(list(counts)):
+                sums[index] += value
+        return total
+
+    def values(self) -> Dict[LabelValues, List[float]]:
+        """ Returns: Per label combination, the per-bucket counts (last one +Inf) followed by the sum. """
+        return self._merged()
+
+    def render(self) -> Iterable[str]:
+        for labels, counts in sorted(self.values().items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = 'le="%s"' % _number(bound)
+                yield f"{self.name}_bucket{_labels(self.labelnames, labels, le)} {cumulative}"
+            yield f"{self.name}_sum{_labels(self.labelnames, labels)} {_number(counts[-1])}"
+            yield f"{self.name}_count{_labels(self.labelnames, labels)} {cumulative}"
+
+
+class Gauge:
+    """
+    A value read from the application when metrics are scraped.
+
+    Counters the application already keeps, such as cache hits, are exposed
+    the same way with `kind="counter"` instead of being counted twice.
+    """
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+                 collect: Optional[Callable[[], Iterable[Tuple[LabelValues, float]]]] = None, kind: str = "gauge"):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.collect = collect
+        self.kind = kind
+
+    def render(self) -> Iterable[str]:
+        for labels, value in (self.collect() if self.collect else ()):
+            if value is not None:
+                yield f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}"
+
+
+class MetricsRegistry:
+    """
+    Metrics of this process, rendered in the Prometheus text format.
+
+    Metrics are created by name and reused if they already exist, so a module
+    can declare the metrics it records at import time.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, name: str, factory: Callable[[], object]):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = factory()
+            return metric
+
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Counter:
+        """ Returns: The counter called `name`, created if needed. """
+        return self._register(name, lambda: Counter(name, help_text, labelnames))
+
+    def histogram(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        """ Returns: The histogram called `name`, created if needed. """
+        return self._register(name, lambda: Histogram(name, help_text, labelnames, buckets))
+
+    def gauge(self, name: str, help_text: str, collect: Callable[[], Iterable[Tuple[LabelValues, float]]],
+              labelnames: Sequence[str] = (), kind: str = "gauge") -> Gauge:
+        """
+        Registers a gauge whose values are collected at scrape time; replaces an existing one.
+
+        Args:
+            name (str): The metric name.
+            help_text (str): The HELP line.
+            collect (callable): Returns `(label values, value)` pairs; a None value is skipped.
+            labelnames (list): The label names.
+            kind (str): The TYPE line, "counter" for totals kept by the application.
+
+        Returns:
+            Gauge: The gauge.
+        """
+        gauge = Gauge(name, help_text, labelnames, collect, kind)
+        with self._lock:
+            self._metrics[name] = gauge
+        return gauge
+
+    def reset(self) -> None:
+        """ Discards the samples of every counter and histogram, e.g. those a forked worker inherited. """
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            if isinstance(metric, _Sharded):
+                metric.reset()
+
+    def render(self) -> str:
+        """ Returns: Every metric in the Prometheus text exposition format. """
+        with self._lock:
+            metrics = sorted(self._metrics.items())
+        lines = []
+        for name, metric in metrics:
+            try:
+                samples = list(metric.render())
+            except Exception as e:  # A broken collector must not take the endpoint down
+                lines.append(f"# {name} not collected: {_escape(str(e))}")
+                continue
+            lines.append(f"# HELP {name} {metric.help}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            lines.extend(samples)
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
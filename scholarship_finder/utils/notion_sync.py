@@ -0,0 +1,168 @@
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+from scholarship_finder.utils.logger import configure_logger
+from scholarship_finder.utils.metrics import metrics
+from scholarship_finder.utils.random_utils import iter_database_pages, parse_scholarship_page
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+NOTION_FETCH_SECONDS = metrics.histogram(
+    "notion_fetch_duration_seconds", "Time spent reading the Notion database per sync.", ("mode",),
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+)
+NOTION_PAGES_FETCHED = metrics.counter(
+    "notion_pages_fetched_total", "Pages returned by Notion database queries.", ("mode",)
+)
+NOTION_ROWS_CHANGED = metrics.counter(
+    "notion_rows_changed_total", "Catalog rows loaded by full syncs or changed by incremental ones.", ("mode",)
+)
+
+
+class NotionSync:
+    """
+    Keeps a local copy of the Notion scholarship database up to date.
+
+    The first sync walks every page of the database. Later syncs only ask
+    Notion for pages whose `last_edited_time` is on or after the newest edit
+    already seen and merge them into the existing rows, so the cost of a
+    refresh follows the number of changed rows rather than the catalog size.
+
+    Archived or trashed pages that come back from an incremental query are
+    dropped. Pages that are hard-deleted never show up in a filtered query, so
+    every `full_sync_every` syncs a full pass reconciles deletions.
+    """
+
+    def __init__(self, client=None, database_id: Optional[str] = None, full_sync_every: int = 12):
+        self.client = client
+        self.database_id = database_id
+        self.full_sync_every = full_sync_every
+        self._rows: Dict[str, Dict[str, Any]] = {}  # Notion page id -> parsed row, in catalog order
+        self._synced_through: Optional[str] = None  # Newest last_edited_time seen so far
+        self._syncs_since_full = 0
+        self.last_changes = 0
+
+    def sync(self) -> Optional[List[Dict[str, Any]]]:
+        """
+        Runs a full or incremental sync, whichever is due.
+
+        Returns:
+            list: The merged catalog rows, or None if nothing changed since the last sync.
+        """
+        if self._synced_through is None or self._syncs_since_full >= self.full_sync_every:
+            return self.full_sync()
+        return self.incremental_sync()
+
+    def full_sync(self) -> List[Dict[str, Any]]:
+        """
+        Re-reads every page of the database, replacing the local copy.
+
+        Returns:
+            list: The catalog rows.
+        """
+        started = time.perf_counter()
+        rows: Dict[str, Dict[str, Any]] = {}
+        synced_through = self._synced_through
+        pages = 0
+        for page in iter_database_pages(self.client, self.database_id):
+            pages += 1
+            synced_through = self._newest(synced_through, page.get('last_edited_time'))
+            row = self._parse(page)
+            if row is not None:
+                rows[page['id']] = row
+
+        NOTION_FETCH_SECONDS.observe(time.perf_counter() - started, "full")
+        NOTION_PAGES_FETCHED.inc("full", amount=pages)
+        NOTION_ROWS_CHANGED.inc("full", amount=len(rows))
+        logger.info("Full Notion sync loaded %d scholarships.", len(rows))
+        self._rows = rows
+        self._synced_through = synced_through
+        self._syncs_since_full = 0
+        self.last_changes = len(rows)
+        return list(rows.values())
+
+    def incremental_sync(self) -> Optional[List[Dict[str, Any]]]:
+        """
+        Fetches only pages edited since the last sync and merges them in.
+
+        Returns:
+            list: The merged catalog rows, or None if no page changed.
+        """
+        edited_filter = {
+            "timestamp": "last_edited_time",
+            "last_edited_time": {"on_or_after": self._synced_through}
+        }
+        started = time.perf_counter()
+        synced_through = self._synced_through
+        changes = pages = 0
+        for page in iter_database_pages(self.client, self.database_id, filter=edited_filter):
+            pages += 1
+            synced_through = self._newest(synced_through, page.get('last_edited_time'))
+            page_id = page['id']
+            if page.get('archived') or page.get('in_trash'):
+                if self._rows.pop(page_id, None) is not None:
+                    changes += 1
+                continue
+            row = self._parse(page)
+            if row is not None and self._rows.get(page_id) != row:
+                self._rows[page_id] = row
+                changes += 1
+
+        self._synced_through = synced_through
+        self._syncs_since_full += 1
+        self.last_changes = changes
+        NOTION_FETCH_SECONDS.observe(time.perf_counter() - started, "incremental")
+        NOTION_PAGES_FETCHED.inc("incremental", amount=pages)
+        NOTION_ROWS_CHANGED.inc("incremental", amount=changes)
+        logger.info("Incremental Notion sync merged %d changed scholarships.", changes)
+        if not changes:
+            return None
+        return list(self._rows.values())
+
+    def export_state(self) -> Dict[str, Any]:
+        """
+        Returns what another process needs to continue syncing incrementally
+        from the rows returned by the last sync.
+
+        Returns:
+            dict: The page ids in row order and the sync watermark.
+        """
+        return {
+            "page_ids": list(self._rows),
+            "synced_through": self._synced_through,
+            "syncs_since_full": self._syncs_since_full
+        }
+
+    def restore(self, rows: List[Dict[str, Any]], state: Dict[str, Any]) -> None:
+        """
+        Resumes from rows and state produced by `export_state` in another process.
+
+        Args:
+            rows (list): The catalog rows, in the same order as `state["page_ids"]`.
+            state (dict): The exported sync state.
+        """
+        page_ids = state.get("page_ids") or []
+        if len(page_ids) != len(rows):
+            logger.warning("Sync state does not match catalog rows; next sync will be a full pass.")
+            self._rows, self._synced_through = {}, None
+            return
+        self._rows = dict(zip(page_ids, rows))
+        self._synced_through = state.get("synced_through")
+        self._syncs_since_full = state.get("syncs_since_full", 0)
+
+    @staticmethod
+    def _parse(page: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        try:
+            return parse_scholarship_page(page)
+        except Exception as e:
+            logger.error("Error processing scholarship page %s: %s", page.get('id'), str(e))
+            return None
+
+    @staticmethod
+    def _newest(current: Optional[str], candidate: Optional[str]) -> Optional[str]:
+        # Notion timestamps are ISO-8601 in UTC, so string order is time order
+        if candidate and (current is None or candidate > current):
+            return candidate
+        return current
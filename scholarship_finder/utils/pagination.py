@@ -0,0 +1,79 @@
+import base64
+import hashlib
+import json
+from typing import Any, Dict, Optional, Sequence
+
+
+def query_fingerprint(params: Dict[str, Any]) -> str:
+    """
+    Returns a short, order-independent fingerprint of the query parameters.
+
+    Args:
+        params (dict): The filter and sort parameters of the query.
+
+    Returns:
+        str: The fingerprint.
+    """
+    canonical = json.dumps(sorted((k, v) for k, v in params.items() if v not in (None, "")))
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()[:12]
+
+
+def encode_cursor(version: int, rank: int, fingerprint: str) -> str:
+    """
+    Builds an opaque keyset cursor.
+
+    Args:
+        version (int): The catalog version the page was served from.
+        rank (int): The sort rank of the last row on the page.
+        fingerprint (str): The fingerprint of the query the cursor belongs to.
+
+    Returns:
+        str: The URL-safe cursor.
+    """
+    payload = json.dumps({"v": version, "r": rank, "q": fingerprint}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """
+    Parses a cursor produced by `encode_cursor`.
+
+    Args:
+        cursor (str): The cursor from the request.
+
+    Returns:
+        dict: The cursor's version (`v`), rank (`r`) and query fingerprint (`q`).
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return {"v": int(payload["v"]), "r": int(payload["r"]), "q": str(payload["q"])}
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def seek_after(positions: Sequence[int], rank: Sequence[int], last_rank: int, descending: bool = False) -> int:
+    """
+    Finds where the page after `last_rank` starts, by binary search.
+
+    Args:
+        positions (list): Result row positions, ordered by `rank`.
+        rank (list): Sort rank of every row position.
+        last_rank (int): The rank of the last row already returned.
+        descending (bool): Whether `positions` is in descending rank order.
+
+    Returns:
+        int: Index into `positions` of the first row of the next page.
+    """
+    low, high = 0, len(positions)
+    while low < high:
+        middle = (low + high) // 2
+        current = rank[positions[middle]]
+        if (current < last_rank) if descending else (current > last_rank):
+            high = middle
+        else:
+            low = middle + 1
+    return low
@@ -1,84 +1,158 @@
 import logging
-import requests
 import os
-from notion_client import Client
+import threading
 from pprint import pprint
-from dotenv import load_dotenv
 
 from scholarship_finder.utils.logger import configure_logger
 
 logger = logging.getLogger(__name__)
 configure_logger(logger)
 
-# Load environment variables from .env file
-load_dotenv()
+_notion_client = None
+_notion_pid = None
+_notion_lock = threading.Lock()
 
-# Get your Notion Integration Token and Database ID from environment variables
-NOTION_API_KEY = os.getenv("NOTION_API_KEY")
-DATABASE_ID = os.getenv("NOTION_DATABASE_ID")
 
-# Initialize Notion client
-notion = Client(auth=NOTION_API_KEY)
+def get_notion_client():
+    """
+    Returns the Notion client for the current process, creating it on first use.
+
+    `notion_client` (and the HTTP stack under it) is only imported here, so
+    starting the app does not pay for it. The token is read from
+    `NOTION_API_KEY` when the client is created.
+
+    Returns:
+        Client: The Notion client.
+    """
+    global _notion_client, _notion_pid
+    pid = os.getpid()
+    if _notion_client is None or _notion_pid != pid:
+        with _notion_lock:
+            if _notion_client is None or _notion_pid != pid:
+                from notion_client import Client
+                _notion_client = Client(auth=os.getenv("NOTION_API_KEY"))
+                _notion_pid = pid
+    return _notion_client
+
+
+def __getattr__(name: str):
+    # Module attributes kept for existing imports; resolved per access so they stay lazy
+    if name == 'notion':
+        return get_notion_client()
+    if name == 'NOTION_API_KEY':
+        return os.getenv("NOTION_API_KEY")
+    if name == 'DATABASE_ID':
+        return os.getenv("NOTION_DATABASE_ID")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def iter_database_pages(client=None, database_id=None, filter=None, page_size=100):
+    """
+    Walk every page of a Notion database query.
+
+    Follows `has_more`/`next_cursor` so results are not truncated at the first
+    100 rows, and yields pages one at a time so callers never hold more than a
+    single response in memory.
+
+    Args:
+        client (Client): The Notion client to query, defaults to the process's client.
+        database_id (str): The database to query, defaults to NOTION_DATABASE_ID.
+        filter (dict): Optional Notion filter object.
+        page_size (int): Number of rows per request (Notion caps this at 100).
+
+    Yields:
+        dict: Raw Notion page objects.
+    """
+    client = client or get_notion_client()
+    query_args = {"database_id": database_id or os.getenv("NOTION_DATABASE_ID"), "page_size": page_size}
+    if filter:
+        query_args["filter"] = filter
+
+    while True:
+        response = client.databases.query(**query_args)
+        for page in response.get('results', []):
+            yield page
+        next_cursor = response.get('next_cursor')
+        if not response.get('has_more') or not next_cursor:
+            break
+        query_args["start_cursor"] = next_cursor
+
+
+def parse_scholarship_page(result):
+    """
+    Parse a raw Notion page into the scholarship dictionary format.
+
+    Args:
+        result (dict): A Notion page object from a database query.
 
-def fetch_scholarship_data():
+    Returns:
+        dict: The parsed scholarship.
+    """
+    properties = result.get('properties', {})
+
+    # More defensive property extraction
+    rich_text = properties.get('University', {}).get('rich_text', [])
+    university = rich_text[0].get('text', {}).get('content', '') if rich_text else ''
+
+    title = properties.get('Scholarship Name', {}).get('title', [])
+    scholarship_name = title[0].get('text', {}).get('content', '') if title else ''
+
+    # For select fields, check if select is None before accessing name
+    type_select = properties.get('Type', {}).get('select')
+    type_name = type_select.get('name', '') if type_select else ''
+
+    degree_select = properties.get('Degree Level', {}).get('select')
+    degree_level = degree_select.get('name', '') if degree_select else ''
+
+    country_select = properties.get('Country', {}).get('select')
+    country = country_select.get('name', '') if country_select else ''
+
+    date = properties.get('Deadline', {}).get('date')
+    deadline = date.get('start', '') if date else ''
+
+    return {
+        "id": result.get('id'),  # Stable Notion page id; favorites refer to scholarships by it
+        "university": university,
+        "scholarship_name": scholarship_name,
+        "type": type_name,
+        "degree_level": degree_level,
+        "country": country,
+        "deadline": deadline,
+        "min_gpa": properties.get('Min GPA', {}).get('number'),
+        # Keep only the option names; Notion's option ids and colors are never served
+        "major": [{"name": option.get('name', '')} for option in properties.get('Major', {}).get('multi_select', [])]
+    }
+
+
+def fetch_scholarship_data(raise_on_error=False):
     """
     Fetch scholarship data from the Notion database.
     Parses and returns the data in a dictionary format.
+
+    Args:
+        raise_on_error (bool): Re-raise Notion errors instead of returning an empty list,
+                               so callers holding a cached catalog can keep serving it.
     """
     try:
-        # Querying the Notion database
-        query = notion.databases.query(database_id=DATABASE_ID)
-        
-        # Add debug logging
-        logger.debug(f"Raw query response: {query}")
-        
         scholarships = []
-        for result in query.get('results', []):  # Use .get() with default empty list
+        for result in iter_database_pages():
             try:
-                properties = result.get('properties', {})
-                
-                # More defensive property extraction
-                rich_text = properties.get('University', {}).get('rich_text', [])
-                university = rich_text[0].get('text', {}).get('content', '') if rich_text else ''
-                
-                title = properties.get('Scholarship Name', {}).get('title', [])
-                scholarship_name = title[0].get('text', {}).get('content', '') if title else ''
-                
-                # For select fields, check if select is None before accessing name
-                type_select = properties.get('Type', {}).get('select')
-                type_name = type_select.get('name', '') if type_select else ''
-                
-                degree_select = properties.get('Degree Level', {}).get('select')
-                degree_level = degree_select.get('name', '') if degree_select else ''
-                
-                country_select = properties.get('Country', {}).get('select')
-                country = country_select.get('name', '') if country_select else ''
-                
-                date = properties.get('Deadline', {}).get('date')
-                deadline = date.get('start', '') if date else ''
-                
-                scholarship = {
-                    "university": university,
-                    "scholarship_name": scholarship_name,
-                    "type": type_name,
-                    "degree_level": degree_level,
-                    "country": country,
-                    "deadline": deadline,
-                    "min_gpa": properties.get('Min GPA', {}).get('number'),
-                    "major": properties.get('Major', {}).get('multi_select', [])
-                }
-                scholarships.append(scholarship)
+                scholarships.append(parse_scholarship_page(result))
             except Exception as e:
-                logger.error(f"Error processing individual scholarship: {str(e)}")
+                logger.error("Error processing individual scholarship: %s", str(e))
                 continue
-        
+
+        logger.debug("Fetched %d scholarships from Notion.", len(scholarships))
         return scholarships
-    
+
     except Exception as e:
-        logger.error(f"Error fetching data from Notion: {str(e)}")
+        logger.error("Error fetching data from Notion: %s", str(e))
+        if raise_on_error:
+            raise
         return []
 
 # Example usage
 if __name__ == "__main__":
+    from dotenv import load_dotenv
+    load_dotenv()
     data = fetch_scholarship_data()
     pprint(data)  # Prints the fetched scholarship data
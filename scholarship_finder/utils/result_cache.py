@@ -0,0 +1,109 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+class ResultCache:
+    """
+    Bounded LRU cache of serialized responses, sized by bytes.
+
+    Keys start with the catalog version they were computed from, so a catalog
+    refresh invalidates every entry without an explicit purge; entries for
+    older versions are dropped as soon as a newer version is stored.
+    """
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024, max_entry_fraction: float = 0.125):
+        self.max_bytes = max_bytes
+        self.max_entry_fraction = max_entry_fraction
+        self._entries: "OrderedDict[Tuple[int, Hashable], bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._latest_version = 0
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def init_app(self, app) -> None:
+        """
+        Reads the memory budget from the Flask config.
+
+        Args:
+            app (Flask): The application whose config holds `RESULT_CACHE_MAX_BYTES`.
+        """
+        self.max_bytes = app.config.get('RESULT_CACHE_MAX_BYTES', self.max_bytes)
+        app.extensions['result_cache'] = self
+
+    def get(self, version: int, key: Hashable) -> Optional[bytes]:
+        """
+        Looks up a cached response.
+
+        Args:
+            version (int): The catalog version the response must come from.
+            key (tuple): The canonical query.
+
+        Returns:
+            bytes: The cached response body, or None on a miss.
+        """
+        with self._lock:
+            body = self._entries.get((version, key))
+            if body is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end((version, key))
+            self.hits += 1
+            return body
+
+    def put(self, version: int, key: Hashable, body: bytes) -> None:
+        """
+        Stores a response, evicting least recently used entries to stay within budget.
+
+        Responses larger than `max_entry_fraction` of the budget are not cached.
+
+        Args:
+            version (int): The catalog version the response was computed from.
+            key (tuple): The canonical query.
+            body (bytes): The serialized response body.
+        """
+        if len(body) > self.max_bytes * self.max_entry_fraction:
+            return
+        with self._lock:
+            if version > self._latest_version:
+                self._drop_older_than(version)
+                self._latest_version = version
+            previous = self._entries.pop((version, key), None)
+            if previous is not None:
+                self.size -= len(previous)
+            self._entries[(version, key)] = body
+            self.size += len(body)
+            while self.size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= len(evicted)
+                self.evictions += 1
+
+    def _drop_older_than(self, version: int) -> None:
+        for entry_key in [k for k in self._entries if k[0] < version]:
+            self.size -= len(self._entries.pop(entry_key))
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """ Removes every entry; counters are kept. """
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """ Returns: Entry count, size in bytes and hit/miss/eviction counters. """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self.size,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": (self.hits / lookups) if lookups else 0.0
+            }
+
+
+result_cache = ResultCache()
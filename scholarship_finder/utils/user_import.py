@@ -0,0 +1,83 @@
+import csv
+import json
+from typing import Iterable, Iterator, Optional, Tuple
+
+# (line number, username, password, error); error is None for a well-formed record
+UserRecord = Tuple[int, Optional[str], Optional[str], Optional[str]]
+
+FORMATS = ("ndjson", "csv")
+
+
+def detect_format(content_type: Optional[str], filename: Optional[str] = None) -> Optional[str]:
+    """
+    Picks the import format from a content type or file name.
+
+    Args:
+        content_type (str): The request's Content-Type, if any.
+        filename (str): The file name, if any.
+
+    Returns:
+        str: `"ndjson"` or `"csv"`, or None if neither matches.
+    """
+    content_type = (content_type or "").split(";")[0].strip().lower()
+    if content_type in ("application/x-ndjson", "application/ndjson", "application/jsonl"):
+        return "ndjson"
+    if content_type in ("text/csv", "application/csv"):
+        return "csv"
+    name = (filename or "").lower()
+    if name.endswith((".ndjson", ".jsonl")):
+        return "ndjson"
+    if name.endswith(".csv"):
+        return "csv"
+    return None
+
+
+def _record(line_number: int, username, password) -> UserRecord:
+    if not isinstance(username, str) or not isinstance(password, str) or not username or not password:
+        return (line_number, username if isinstance(username, str) else None, None,
+                "both username and password are required")
+    return (line_number, username, password, None)
+
+
+def iter_user_records(lines: Iterable[str], fmt: str) -> Iterator[UserRecord]:
+    """
+    Parses users to import, one record at a time.
+
+    NDJSON input has one `{"username": ..., "password": ...}` object per line;
+    CSV input has a header row with `username` and `password` columns. Blank
+    lines are skipped. Malformed records are yielded with an error instead of
+    aborting the import.
+
+    Args:
+        lines (iterable): The input, line by line.
+        fmt (str): `"ndjson"` or `"csv"`.
+
+    Yields:
+        tuple: `(line_number, username, password, error)`.
+
+    Raises:
+        ValueError: If the format is unknown or a CSV header lacks the required columns.
+    """
+    if fmt == "ndjson":
+        for line_number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                item = json.loads(line)
+            except ValueError:
+                yield (line_number, None, None, "invalid JSON")
+                continue
+            if not isinstance(item, dict):
+                yield (line_number, None, None, "expected a JSON object")
+                continue
+            yield _record(line_number, item.get("username"), item.get("password"))
+    elif fmt == "csv":
+        reader = csv.DictReader(lines)
+        if reader.fieldnames is None or not {"username", "password"} <= set(reader.fieldnames):
+            raise ValueError("CSV input needs a header with username and password columns")
+        for row in reader:
+            if not any(row.values()):
+                continue
+            yield _record(reader.line_num, row.get("username"), row.get("password"))
+    else:
+        raise ValueError(f"Unsupported import format: {fmt}")
@@ -20,4 +20,132 @@ def client(app):
 @pytest.fixture
 def session(app):
     with app.app_context():
-        yield db.session
\ No newline at end of file
+        yield db.session
+
+@pytest.fixture
+def favorites_redis():
+    return FakeRedis()
+
+@pytest.fixture
+def favorites_sessions():
+    return FakeSessions()
+
+
+##########################################################
+# Fakes shared by the favorites store and ASGI tests
+##########################################################
+
+class FakeRedis:
+    """In-memory stand-in for the Redis hash commands the store uses."""
+
+    def __init__(self):
+        self.hashes = {}
+        self.sets = {}
+        self.calls = 0
+
+    def hgetall(self, key):
+        self.calls += 1
+        return {field.encode(): value.encode() for field, value in self.hashes.get(key, {}).items()}
+
+    def hkeys(self, key):
+        return [field.encode() for field in self.hashes.get(key, {})]
+
+    def hexists(self, key, field):
+        return field in self.hashes.get(key, {})
+
+    def hset(self, key, mapping):
+        self.hashes.setdefault(key, {}).update(mapping)
+
+    def hsetnx(self, key, field, value):
+        fields = self.hashes.setdefault(key, {})
+        if field in fields:
+            return 0
+        fields[field] = value
+        return 1
+
+    def hdel(self, key, field):
+        return 1 if self.hashes.get(key, {}).pop(field, None) is not None else 0
+
+    def expire(self, key, ttl):
+        return True
+
+    def delete(self, key):
+        self.hashes.pop(key, None)
+
+    def sadd(self, key, *members):
+        self.sets.setdefault(key, set()).update(str(member) for member in members)
+
+    def srem(self, key, *members):
+        self.sets.get(key, set()).difference_update(str(member) for member in members)
+
+    def smembers(self, key):
+        return {member.encode() for member in self.sets.get(key, set())}
+
+    def eval(self, script, numkeys, key, loaded, ttl, *args):
+        # Only CHANGE_IF_LOADED is ever evaluated
+        fields = self.hashes.get(key, {})
+        if loaded not in fields:
+            return -1
+        changed = 0
+        for index in range(0, len(args), 3):
+            op, field, value = args[index:index + 3]
+            if op == "del":
+                changed += self.hdel(key, field)
+            elif op == "setnx":
+                changed += self.hsetnx(key, field, value)
+            else:
+                self.hset(key, {field: value})
+                changed += 1
+        return changed
+
+    def pipeline(self):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.commands.append((name, args, kwargs))
+
+    def execute(self):
+        return [getattr(self.redis, name)(*args, **kwargs) for name, args, kwargs in self.commands]
+
+
+class FakeSessions:
+    """In-memory stand-in for the Mongo `sessions` collection."""
+
+    def __init__(self):
+        self.documents = {}
+        self.reads = 0
+        self.bulk_writes = 0
+
+    def find_one(self, query, projection=None):
+        self.reads += 1
+        document = self.documents.get(query["user_id"])
+        return dict(document) if document else None
+
+    def bulk_write(self, requests, ordered=True):
+        self.bulk_writes += 1
+        for request in requests:
+            self.update_one(request._filter, request._doc, upsert=request._upsert)
+
+    def insert_one(self, document):
+        self.documents[document["user_id"]] = dict(document)
+
+    def update_one(self, query, update, upsert=False):
+        document = self.documents.get(query["user_id"])
+        if document is None:
+            if not upsert:
+                return
+            document = self.documents[query["user_id"]] = {"user_id": query["user_id"], "favorites": []}
+        for operator, fields in update.items():
+            for field, value in fields.items():
+                if operator == "$set":
+                    document[field] = value
+                elif operator == "$addToSet" and value not in document[field]:
+                    document[field].append(value)
+                elif operator == "$pull":
+                    document[field] = [item for item in document[field] if item != value]
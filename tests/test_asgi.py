@@ -0,0 +1,209 @@
+import asyncio
+import json
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from asgi import AsgiApp
+from scholarship_finder.models.async_favorites_store import AsyncFavoritesStore
+from scholarship_finder.models.catalog_model import catalog_cache
+from scholarship_finder.models.favorites_store import favorites_store
+from scholarship_finder.models.user_model import User
+from scholarship_finder.utils.executor import BoundedExecutor
+
+
+class AsyncRedis:
+    """Coroutine wrapper around FakeRedis, shaped like `redis.asyncio.Redis`."""
+
+    def __init__(self, redis):
+        self.redis = redis
+
+    def __getattr__(self, name):
+        async def command(*args, **kwargs):
+            return getattr(self.redis, name)(*args, **kwargs)
+        return command
+
+    def pipeline(self):
+        pipeline = self.redis.pipeline()
+        async def execute():
+            return pipeline.execute()
+        return SimpleNamespace(
+            delete=pipeline.delete, hset=pipeline.hset, hdel=pipeline.hdel, expire=pipeline.expire, execute=execute
+        )
+
+
+class AsyncSessions:
+    """Coroutine wrapper around FakeSessions, shaped like an `AsyncMongoClient` collection."""
+
+    def __init__(self, sessions):
+        self.sessions = sessions
+
+    async def find_one(self, query, projection=None):
+        return self.sessions.find_one(query, projection)
+
+    async def update_one(self, query, update, upsert=False):
+        matched = query["user_id"] in self.sessions.documents
+        self.sessions.update_one(query, update, upsert=upsert)
+        return SimpleNamespace(matched_count=int(matched))
+
+    async def bulk_write(self, requests, ordered=True):
+        self.sessions.bulk_write(requests, ordered)
+
+
+@pytest.fixture
+def merit():
+    return {"id": "page-merit", "university": "MIT", "scholarship_name": "Merit Scholarship", "type": "Merit-based",
+            "degree_level": "Undergraduate", "country": "USA", "deadline": "2024-01-15",
+            "min_gpa": 3.5, "major": [{"name": "Computer Science"}]}
+
+
+@pytest.fixture
+def asgi_app(app, merit, favorites_redis, favorites_sessions):
+    original = (favorites_store._redis, favorites_store._sessions, catalog_cache.loader)
+    favorites_store._redis, favorites_store._sessions = favorites_redis, favorites_sessions
+    catalog_cache.loader = lambda: [merit]
+    catalog_cache.clear()
+    asgi = AsgiApp(app)
+    asgi.favorites = AsyncFavoritesStore(favorites_store, None, asgi.executor,
+                                         redis_client=AsyncRedis(favorites_redis),
+                                         sessions_collection=AsyncSessions(favorites_sessions))
+    yield asgi
+    asgi.executor.shutdown()
+    favorites_store._redis, favorites_store._sessions, catalog_cache.loader = original
+    catalog_cache.clear()
+
+
+def call(asgi, method, path, body=None, query=b""):
+    async def run():
+        messages = [{"type": "http.request", "body": json.dumps(body).encode() if body is not None else b""}]
+        sent = []
+
+        async def receive():
+            return messages.pop(0)
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {"type": "http", "method": method, "path": path, "query_string": query,
+                 "headers": [(b"host", b"localhost"), (b"content-type", b"application/json")]}
+        await asgi(scope, receive, send)
+        return sent
+
+    sent = asyncio.run(run())
+    headers = dict(sent[0]["headers"])
+    return sent[0]["status"], headers, json.loads(b"".join(message.get("body", b"") for message in sent[1:]))
+
+
+##########################################################
+# Native routes
+##########################################################
+
+def test_favorites_round_trip(asgi_app, merit):
+    """Test adding, reading and removing favorites through the async routes."""
+    status, _, body = call(asgi_app, "POST", "/api/favorites/add", {"user_id": 3, "scholarship_id": "page-merit"})
+    assert (status, body["added"]) == (200, True)
+    status, _, body = call(asgi_app, "GET", "/api/favorites/3")
+    assert body["favorites"] == [merit]
+    # The synchronous store sees the same Redis hash
+    assert favorites_store.get_ids(3) == ["page-merit"]
+    status, _, body = call(asgi_app, "POST", "/api/favorites/remove", {"user_id": 3, "scholarship": merit})
+    assert body["removed"] is True
+    assert favorites_store._sessions.documents[3]["favorites"] == []
+
+def test_favorites_validation(asgi_app):
+    """Test that the async routes reject bad input like the Flask routes."""
+    assert call(asgi_app, "POST", "/api/favorites/add", {"user_id": 3})[0] == 400
+    assert call(asgi_app, "POST", "/api/favorites/add", {"user_id": 3, "scholarship_id": "page-x"})[0] == 404
+    status, _, body = call(asgi_app, "POST", "/api/favorites/batch", {"user_id": 3, "operations": [{"op": "move"}]})
+    assert (status, body["message"]) == (400, "Invalid operation at index 0")
+
+def test_favorites_batch_and_clear(asgi_app):
+    """Test the async batch and clear routes."""
+    status, _, body = call(asgi_app, "POST", "/api/favorites/batch", {"user_id": 5, "operations": [
+        {"op": "add", "scholarship_id": "page-merit"},
+        {"op": "add", "scholarship_id": "page-merit"},
+    ]})
+    assert [result["applied"] for result in body["results"]] == [True, False]
+    assert call(asgi_app, "POST", "/api/favorites/clear", {"user_id": 5})[0] == 200
+    assert favorites_store.get_ids(5) == []
+
+def test_login_and_logout(asgi_app, session, merit):
+    """Test that login hashes on the executor and returns the user's favorites."""
+    User.create_user("alice", "secret")
+    user_id = User.get_id_by_username("alice")
+    call(asgi_app, "POST", "/api/favorites/add", {"user_id": user_id, "scholarship_id": "page-merit"})
+
+    assert call(asgi_app, "POST", "/api/login", {"username": "alice", "password": "wrong"})[0] == 401
+    status, _, body = call(asgi_app, "POST", "/api/login", {"username": "alice", "password": "secret"})
+    assert status == 200
+    assert body["favorites"] == [merit]
+    status, _, body = call(asgi_app, "POST", "/api/logout", {"username": "alice"})
+    assert status == 200
+    assert favorites_store._sessions.documents[user_id]["favorites"] == ["page-merit"]
+
+    # Logout evicted the cached copy; logging in again reads the session once
+    reads = favorites_store._sessions.reads
+    status, _, body = call(asgi_app, "POST", "/api/login", {"username": "alice", "password": "secret"})
+    assert body["favorites"] == [merit]
+    assert favorites_store._sessions.reads == reads + 1
+
+
+##########################################################
+# Flask fallback and lifespan
+##########################################################
+
+def test_other_routes_are_served_by_flask(asgi_app, merit):
+    """Test that routes without a coroutine handler go through the Flask app."""
+    status, headers, body = call(asgi_app, "GET", "/api/scholarships", query=b"type=Merit-based")
+    assert status == 200
+    assert int(headers[b"x-catalog-version"]) == catalog_cache.version
+    assert body["scholarships"] == [merit]
+    assert call(asgi_app, "GET", "/api/missing")[0] == 404
+
+def test_lifespan_loads_catalog(asgi_app):
+    """Test that startup loads the catalog and shutdown completes."""
+    async def run():
+        messages = [{"type": "lifespan.startup"}, {"type": "lifespan.shutdown"}]
+        sent = []
+
+        async def receive():
+            return messages.pop(0)
+
+        async def send(message):
+            sent.append(message["type"])
+
+        await asgi_app({"type": "lifespan"}, receive, send)
+        return sent
+
+    assert catalog_cache.version == 0
+    assert asyncio.run(run()) == ["lifespan.startup.complete", "lifespan.shutdown.complete"]
+    assert catalog_cache.version > 0
+
+
+##########################################################
+# Executor
+##########################################################
+
+def test_executor_bounds_concurrency():
+    """Test that at most max_workers blocking calls run at once."""
+    executor = BoundedExecutor(max_workers=2, max_pending=1)
+    running, peak, lock = [0], [0], threading.Lock()
+
+    def work():
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.01)
+        with lock:
+            running[0] -= 1
+        return 1
+
+    async def run():
+        return await asyncio.gather(*(executor.run(work) for _ in range(20)))
+
+    assert sum(asyncio.run(run())) == 20
+    assert peak[0] <= 2
+    assert executor.stats()["completed"] == 20
+    executor.shutdown()
@@ -0,0 +1,66 @@
+import pytest
+
+from scholarship_finder.models.catalog_columns import ColumnarCatalog, RowView
+
+
+@pytest.fixture
+def rows():
+    return [
+        {"id": "page-1", "university": "MIT", "scholarship_name": "Merit Scholarship", "type": "Merit-based",
+         "degree_level": "Undergraduate", "country": "USA", "deadline": "2024-01-15",
+         "min_gpa": 3.5, "major": [{"name": "Computer Science"}, {"name": "Engineering"}]},
+        {"id": "page-2", "university": "MIT", "scholarship_name": "Need Scholarship", "type": "Need-based",
+         "degree_level": "Graduate", "country": "USA", "deadline": "2024-02-20T12:00:00.000+00:00",
+         "min_gpa": None, "major": []},
+        {"id": "page-3", "university": "University of Toronto", "scholarship_name": "STEM Scholarship", "type": "Merit-based",
+         "degree_level": "Undergraduate", "country": "Canada", "deadline": "",
+         "min_gpa": 3.7, "major": [{"name": "Engineering"}]},
+    ]
+
+
+##########################################################
+# Storage
+##########################################################
+
+def test_rows_round_trip(rows):
+    """Test that every row materializes back to its original JSON shape."""
+    columns = ColumnarCatalog(rows)
+    assert len(columns) == 3
+    assert [columns.row(i) for i in range(3)] == rows
+
+def test_categorical_values_are_interned(rows):
+    """Test that repeated values are stored once and referenced by code."""
+    columns = ColumnarCatalog(rows)
+    assert columns.values["university"] == ["MIT", "University of Toronto"]
+    assert list(columns.codes["university"]) == [0, 0, 1]
+    assert columns.major_values == ["Computer Science", "Engineering"]
+    assert columns.codes["country"].itemsize == 1
+
+def test_deadlines_stored_as_ordinals(rows):
+    """Test that deadlines are parsed once, with missing values kept apart."""
+    columns = ColumnarCatalog(rows + [dict(rows[0], deadline=None)])
+    keys = columns.sort_keys("deadline")
+    assert keys[0] < keys[1]
+    assert keys[2] == 0
+    assert keys[3] is None
+    assert columns.get(3, "deadline") is None
+
+def test_notion_option_metadata_is_dropped(rows):
+    """Test that only major names are kept from Notion multi-select options."""
+    rows[0]["major"] = [{"id": "abc", "name": "Computer Science", "color": "blue"}]
+    assert ColumnarCatalog(rows).row(0)["major"] == [{"name": "Computer Science"}]
+
+
+##########################################################
+# Row view and indexes
+##########################################################
+
+def test_row_view_behaves_like_a_list(rows):
+    """Test indexing, slicing and iteration over the row view."""
+    view = RowView(ColumnarCatalog(rows))
+    assert len(view) == 3
+    assert view[-1] == rows[-1]
+    assert view[0:2] == rows[0:2]
+    assert list(view) == rows
+    with pytest.raises(IndexError):
+        view[3]
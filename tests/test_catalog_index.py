@@ -0,0 +1,104 @@
+import pytest
+
+from scholarship_finder.models.catalog_columns import ColumnarCatalog
+from scholarship_finder.models.catalog_index import (
+    FacetIndex, SortedIndex, deadline_between, gpa_at_least
+)
+
+
+@pytest.fixture
+def rows():
+    return [
+        {"university": "MIT", "scholarship_name": "Merit Scholarship", "type": "Merit-based",
+         "degree_level": "Undergraduate", "country": "USA", "deadline": "2024-01-15",
+         "min_gpa": 3.5, "major": [{"name": "Computer Science"}, {"name": "Engineering"}]},
+        {"university": "Stanford", "scholarship_name": "Need Scholarship", "type": "Need-based",
+         "degree_level": "Graduate", "country": "USA", "deadline": "2024-02-20",
+         "min_gpa": 3.0, "major": [{"name": "Any"}]},
+        {"university": "University of Toronto", "scholarship_name": "STEM Scholarship", "type": "Merit-based",
+         "degree_level": "Undergraduate", "country": "Canada", "deadline": "2024-03-10",
+         "min_gpa": 3.7, "major": [{"name": "computer science"}]},
+    ]
+
+
+@pytest.fixture
+def index(rows):
+    return FacetIndex.from_columns(ColumnarCatalog(rows))
+
+
+##########################################################
+# Facet lookups
+##########################################################
+
+def test_lookup_single_facet(index):
+    """Test that a single facet returns every matching row position."""
+    assert index.lookup("type", "Merit-based") == {0, 2}
+    assert index.lookup("country", "Canada") == {2}
+    assert index.lookup("country", "France") == set()
+
+def test_major_lookup_is_case_insensitive(index):
+    """Test that major names are normalized when indexed and queried."""
+    assert index.lookup("major", "COMPUTER SCIENCE") == {0, 2}
+
+
+##########################################################
+# Multi-facet matching
+##########################################################
+
+def test_match_intersects_filters(index):
+    """Test that multiple filters intersect."""
+    assert index.match_set({"type": "Merit-based", "country": "USA"}) == {0}
+    assert index.match_set({"type": "Merit-based", "major": "computer science"}) == {0, 2}
+
+def test_match_without_filters_returns_none(index):
+    """Test that empty filters are ignored entirely."""
+    assert index.match_set({"type": None, "country": ""}) is None
+
+def test_match_with_no_results(index):
+    """Test that disjoint filters produce an empty result."""
+    assert index.match_set({"country": "Canada", "degree_level": "Graduate"}) == set()
+
+def test_match_agrees_with_linear_scan(rows, index):
+    """Test that indexed filtering matches a straightforward scan."""
+    expected = [i for i, r in enumerate(rows)
+                if r["degree_level"] == "Undergraduate"
+                and any(m["name"].lower() == "engineering" for m in r["major"])]
+    assert sorted(index.match_set({"degree_level": "Undergraduate", "major": "Engineering"})) == expected
+
+
+##########################################################
+# Sorted indexes
+##########################################################
+
+def test_sorted_index_orders_missing_values_last():
+    """Test that None keys sort after every present key."""
+    index = SortedIndex(["2024-03-01", None, "2024-01-01", "2024-02-01"])
+    assert index.ordered() == [2, 3, 0, 1]
+    assert index.ordered(descending=True) == [1, 0, 3, 2]
+
+def test_sorted_index_orders_subsets(rows):
+    """Test that subsets are ordered by walking or ranking the permutation."""
+    index = SortedIndex(ColumnarCatalog(rows).sort_keys("university"))
+    assert index.ordered({0, 2}) == [0, 2]
+    assert index.ordered({0, 2}, descending=True) == [2, 0]
+    assert index.ordered([2, 1, 0]) == [0, 1, 2]
+
+def test_gpa_thresholds_use_binary_search(rows):
+    """Test GPA range lookups against the requirement values."""
+    index = SortedIndex(ColumnarCatalog(rows).sort_keys("min_gpa"))
+    assert gpa_at_least(index, 3.5) == [0, 2]
+    assert gpa_at_least(index, 4.0) == []
+
+def test_gpa_threshold_skips_zero_requirements():
+    """Test that missing or zero GPA requirements never match a threshold."""
+    index = SortedIndex([0.0, None, 2.5, None])
+    assert gpa_at_least(index, 0) == [2]
+
+def test_deadline_window(rows):
+    """Test inclusive deadline windows, including datetime deadlines."""
+    rows[1]["deadline"] = "2024-02-20T12:00:00.000+00:00"
+    rows.append(dict(rows[0], deadline=""))
+    index = SortedIndex(ColumnarCatalog(rows).sort_keys("deadline"))
+    assert deadline_between(index, "2024-01-15", "2024-02-20") == [0, 1]
+    assert deadline_between(index, after="2024-02-01") == [1, 2]
+    assert deadline_between(index, before="2024-01-31") == [0]
@@ -0,0 +1,136 @@
+import json
+import threading
+
+import pytest
+
+from scholarship_finder.models.catalog_model import CatalogCache, CatalogSnapshot
+
+
+@pytest.fixture
+def rows():
+    return [
+        {
+            "university": "MIT",
+            "scholarship_name": "Merit Scholarship",
+            "type": "Merit-based",
+            "degree_level": "Undergraduate",
+            "country": "USA",
+            "deadline": "2024-01-15",
+            "min_gpa": 3.5,
+            "major": [{"name": "Computer Science"}]
+        }
+    ]
+
+
+@pytest.fixture
+def counting_loader(rows):
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return list(rows)
+
+    loader.calls = calls
+    return loader
+
+
+##########################################################
+# Snapshot loading
+##########################################################
+
+def test_first_access_loads_synchronously(counting_loader):
+    """Test that the first snapshot access loads the catalog."""
+    cache = CatalogCache(loader=counting_loader, ttl=60)
+    assert cache.version == 0
+    assert cache.age is None
+    snapshot = cache.get_snapshot()
+    assert len(snapshot) == 1
+    assert snapshot.version == 1
+    assert len(counting_loader.calls) == 1
+
+def test_fresh_snapshot_is_reused(counting_loader):
+    """Test that a snapshot within its TTL is served without reloading."""
+    cache = CatalogCache(loader=counting_loader, ttl=60)
+    first = cache.get_snapshot()
+    second = cache.get_snapshot()
+    assert first is second
+    assert len(counting_loader.calls) == 1
+
+def test_refresh_publishes_new_version(counting_loader):
+    """Test that an explicit refresh bumps the catalog version."""
+    cache = CatalogCache(loader=counting_loader, ttl=60)
+    cache.get_snapshot()
+    snapshot = cache.refresh()
+    assert snapshot.version == 2
+    assert cache.version == 2
+
+
+##########################################################
+# Stale-while-revalidate
+##########################################################
+
+def test_stale_snapshot_served_while_refreshing(rows):
+    """Test that an expired snapshot is returned while a background refresh runs."""
+    release = threading.Event()
+    calls = []
+
+    def loader():
+        calls.append(1)
+        if len(calls) > 1:
+            release.wait(5)
+        return list(rows)
+
+    cache = CatalogCache(loader=loader, ttl=0)
+    first = cache.get_snapshot()
+    stale = cache.get_snapshot()
+    assert stale is first, "Stale snapshot should be served while refreshing."
+    assert cache.get_snapshot() is first, "Only one refresh should run at a time."
+    release.set()
+    for _ in range(100):
+        if cache.version == 2:
+            break
+        threading.Event().wait(0.01)
+    assert cache.version == 2
+    assert len(calls) == 2
+
+def test_failed_refresh_keeps_stale_snapshot(rows):
+    """Test that a failing refresh keeps serving the previous snapshot."""
+    calls = []
+
+    def loader():
+        calls.append(1)
+        if len(calls) > 1:
+            raise RuntimeError("Notion unavailable")
+        return list(rows)
+
+    cache = CatalogCache(loader=loader, ttl=0, retry_interval=60)
+    first = cache.get_snapshot()
+    cache._background_refresh()
+    assert cache.get_snapshot() is first
+    assert cache.version == 1
+
+def test_unchanged_refresh_keeps_version(rows):
+    """Test that a loader reporting no changes keeps the current version."""
+    results = [list(rows), None]
+    cache = CatalogCache(loader=lambda: results.pop(0), ttl=60)
+    first = cache.get_snapshot()
+    assert cache.refresh() is first
+    assert cache.version == 1
+
+def test_row_json_is_encoded_once_per_snapshot():
+    """Test that row fragments decode to the row and are reused."""
+    snapshot = CatalogSnapshot([{"university": "MIT", "scholarship_name": "Merit", "major": [{"name": "STEM"}]}], 1)
+    fragment = snapshot.row_json(0)
+    assert json.loads(fragment) == snapshot.rows[0]
+    assert snapshot.row_json(0) is fragment
+
+def test_lookup_by_id_and_name():
+    """Test O(1) ID lookups, batch hydration and the name fallback."""
+    snapshot = CatalogSnapshot([
+        {"id": "page-1", "university": "MIT", "scholarship_name": "Merit", "major": []},
+        {"id": "page-2", "university": "Stanford", "scholarship_name": "Need", "major": []},
+    ], 1)
+    assert snapshot.id_index == {"page-1": 0, "page-2": 1}
+    assert [row["scholarship_name"] for row in snapshot.rows_by_id(["page-2", "missing", "page-1"])] == ["Need", "Merit"]
+    assert snapshot.position_of({"university": "Stanford", "scholarship_name": "Need"}) == 1
+    assert snapshot.position_of({"id": "missing", "university": "MIT", "scholarship_name": "Merit"}) is None
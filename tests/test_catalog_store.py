@@ -0,0 +1,152 @@
+import time
+
+import pytest
+
+from scholarship_finder.models.catalog_model import CatalogCache
+from scholarship_finder.models.catalog_store import RedisCatalogStore, decode_catalog, encode_catalog
+
+
+class FakeRedis:
+    """In-memory stand-in for the handful of Redis commands the store uses."""
+
+    def __init__(self):
+        self.data = {}
+        self.published = []
+
+    def get(self, key):
+        value = self.data.get(key)
+        return str(value).encode() if isinstance(value, (int, float)) else value
+
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        return True
+
+    def incr(self, key):
+        self.data[key] = int(self.data.get(key, 0)) + 1
+        return self.data[key]
+
+    def publish(self, channel, message):
+        self.published.append((channel, message))
+
+    def eval(self, script, numkeys, key, token):
+        if self.data.get(key) == token:
+            del self.data[key]
+
+    def pipeline(self):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.commands.append((name, args, kwargs))
+
+    def execute(self):
+        return [getattr(self.redis, name)(*args, **kwargs) for name, args, kwargs in self.commands]
+
+
+@pytest.fixture
+def rows():
+    return [
+        {"id": "page-1", "university": "MIT", "scholarship_name": "Merit Scholarship", "type": "Merit-based",
+         "degree_level": "Undergraduate", "country": "USA", "deadline": "2024-01-15",
+         "min_gpa": 3.5, "major": [{"name": "Computer Science"}]},
+        {"id": "page-2", "university": "Stanford", "scholarship_name": "Need Scholarship", "type": "Need-based",
+         "degree_level": "Graduate", "country": "USA", "deadline": None,
+         "min_gpa": None, "major": []},
+    ]
+
+
+@pytest.fixture
+def fake_redis():
+    return FakeRedis()
+
+
+##########################################################
+# Blob encoding
+##########################################################
+
+def test_encode_decode_round_trip(rows):
+    """Test that rows and sync state survive the compressed encoding."""
+    blob = encode_catalog(rows, {"synced_through": "2024-01-01"}, fetched_at=123.0)
+    decoded_rows, state, fetched_at = decode_catalog(blob)
+    assert decoded_rows == rows
+    assert state == {"synced_through": "2024-01-01"}
+    assert fetched_at == 123.0
+
+
+##########################################################
+# Shared refresh
+##########################################################
+
+def test_publish_assigns_fleet_versions(fake_redis, rows):
+    """Test that each publish gets the next version and is announced."""
+    store = RedisCatalogStore(fake_redis)
+    assert store.publish(rows) == 1
+    assert store.publish(rows) == 2
+    assert store.current_version() == 2
+    assert fake_redis.published == [("catalog:updates", 1), ("catalog:updates", 2)]
+
+def test_second_worker_reuses_published_catalog(fake_redis, rows):
+    """Test that only one worker loads from the source; others read Redis."""
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return list(rows)
+
+    worker_a = CatalogCache(loader=loader, store=RedisCatalogStore(fake_redis))
+    worker_b = CatalogCache(loader=loader, store=RedisCatalogStore(fake_redis))
+    assert worker_a.get_snapshot().version == 1
+    snapshot_b = worker_b.get_snapshot()
+    assert snapshot_b.version == 1
+    assert snapshot_b.rows == rows
+    assert len(calls) == 1
+
+def test_refresh_skipped_while_lock_is_held(fake_redis, rows):
+    """Test that a worker that loses the refresh lock adopts the shared version."""
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return list(rows)
+
+    store = RedisCatalogStore(fake_redis)
+    worker = CatalogCache(loader=loader, store=store, ttl=0)
+    worker.get_snapshot()
+    assert RedisCatalogStore(fake_redis).acquire_refresh_lock()
+    worker.refresh()
+    assert len(calls) == 1
+    assert worker.version == 1
+
+def test_cold_start_loads_from_source_when_redis_is_down(rows):
+    """Test that a store that cannot be reached does not keep the worker from loading."""
+    class DownStore(RedisCatalogStore):
+        def current_version(self):
+            raise ConnectionError("redis down")
+
+    worker = CatalogCache(loader=lambda: list(rows), store=DownStore(None))
+    assert worker.get_snapshot().rows == rows
+
+def test_cold_start_wait_is_bounded(fake_redis, rows):
+    """Test that a worker stops waiting for another worker's load after initial_wait."""
+    assert RedisCatalogStore(fake_redis).acquire_refresh_lock()  # Held by a worker that never publishes
+    worker = CatalogCache(loader=lambda: list(rows), store=RedisCatalogStore(fake_redis), initial_wait=0)
+    started = time.monotonic()
+    assert worker.get_snapshot().rows == rows
+    assert time.monotonic() - started < 1
+
+def test_announced_version_is_swapped_in(fake_redis, rows):
+    """Test that a pub/sub announcement swaps in the newer shared catalog."""
+    worker_a = CatalogCache(loader=lambda: list(rows), store=RedisCatalogStore(fake_redis), ttl=0)
+    worker_b = CatalogCache(loader=lambda: list(rows), store=RedisCatalogStore(fake_redis))
+    worker_a.get_snapshot()
+    worker_b.get_snapshot()
+    worker_a.refresh()
+    worker_b._on_shared_version(2)
+    assert worker_b.version == 2
@@ -0,0 +1,48 @@
+import pytest
+from sqlalchemy import create_engine, text
+
+from scholarship_finder.db import configure_engine, install_pragmas
+
+
+class FakeApp:
+    def __init__(self, **config):
+        self.config = config
+
+
+def test_sqlite_production_profile():
+    """Test that the SQLite profile sets connect arguments and pragmas."""
+    app = FakeApp(SQLALCHEMY_ENGINE_PROFILE="sqlite-production", SQLALCHEMY_DATABASE_URI="sqlite:///app.db",
+                  SQLITE_PRAGMAS={"cache_size": -2000})
+    pragmas = configure_engine(app)
+    assert app.config["SQLALCHEMY_ENGINE_OPTIONS"]["connect_args"]["timeout"] == 5
+    assert pragmas["journal_mode"] == "WAL"
+    assert pragmas["cache_size"] == -2000
+
+def test_server_profile_with_overrides():
+    """Test pool options for server databases, with config overrides."""
+    app = FakeApp(SQLALCHEMY_ENGINE_PROFILE="server", SQLALCHEMY_DATABASE_URI="postgresql://db/app",
+                  SQLALCHEMY_ENGINE_OPTIONS={"pool_size": 4})
+    assert configure_engine(app) == {}
+    options = app.config["SQLALCHEMY_ENGINE_OPTIONS"]
+    assert options["pool_size"] == 4
+    assert options["pool_pre_ping"] is True
+    assert "connect_args" not in options
+
+def test_unknown_profile():
+    """Test that a misspelled profile fails loudly."""
+    with pytest.raises(ValueError):
+        configure_engine(FakeApp(SQLALCHEMY_ENGINE_PROFILE="fast"))
+
+def test_tracking_disabled_without_consumers():
+    """Test that modification tracking is switched off when nothing listens."""
+    app = FakeApp(SQLALCHEMY_TRACK_MODIFICATIONS=True, SQLALCHEMY_DATABASE_URI="sqlite://")
+    configure_engine(app)
+    assert app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] is False
+
+def test_install_pragmas(tmp_path):
+    """Test that pragmas are applied to every new connection."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'app.db'}")
+    install_pragmas(engine, {"journal_mode": "WAL", "busy_timeout": 1234})
+    with engine.connect() as connection:
+        assert connection.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert connection.execute(text("PRAGMA busy_timeout")).scalar() == 1234
@@ -72,3 +72,32 @@ def test_clear_favorites(favorites_model, sample_scholarship1, sample_scholarshi
     assert len(favorites_model.favorites) == 2  # should have two scholarships
     favorites_model.clear_favorites()
     assert len(favorites_model.favorites) == 0  # should be empty again
+
+def test_contains_and_duplicates(favorites_model, sample_scholarship1, sample_scholarship2):
+    """Test membership checks and that duplicates are ignored"""
+    favorites_model.add_to_favorites(sample_scholarship1)
+    favorites_model.add_to_favorites(sample_scholarship1)
+    assert len(favorites_model) == 1
+    assert sample_scholarship1 in favorites_model
+    assert sample_scholarship2 not in favorites_model
+    assert {"university": "MIT", "scholarship_name": "Merit Scholarship"} in favorites_model
+
+def test_remove_missing_scholarship(favorites_model, sample_scholarship1):
+    """Test that removing a scholarship that is not favorited leaves the list unchanged"""
+    favorites_model.remove_from_favorites(sample_scholarship1)
+    assert len(favorites_model.favorites) == 0
+
+def test_load_many(favorites_model, sample_scholarship1, sample_scholarship2):
+    """Test bulk loading keeps order and skips duplicates"""
+    added = favorites_model.load_many([sample_scholarship2, sample_scholarship1, sample_scholarship2])
+    assert added == 2
+    assert [s.scholarship_name for s in favorites_model.favorites] == ["Need Scholarship", "Merit Scholarship"]
+
+def test_replace_all(favorites_model, sample_scholarship1):
+    """Test replacing the favorites list with stored documents"""
+    favorites_model.add_to_favorites(sample_scholarship1)
+    document = {"university": "Stanford", "scholarship_name": "Need Scholarship", "type": "Need-based",
+                "degree_level": "Graduate", "country": "USA", "deadline": "2024-02-20", "min_gpa": 3.0,
+                "major": ["Any"]}
+    favorites_model.replace_all([document])
+    assert favorites_model.favorites == [document]
@@ -0,0 +1,298 @@
+import pytest
+
+from scholarship_finder.models.catalog_model import CatalogCache, catalog_cache
+from scholarship_finder.models.favorites_store import FavoritesStore, favorites_store
+from scholarship_finder.models.favorites_writer import FavoritesWriteBehind
+
+
+@pytest.fixture
+def merit():
+    return {"id": "page-merit", "university": "MIT", "scholarship_name": "Merit Scholarship", "type": "Merit-based",
+            "degree_level": "Undergraduate", "country": "USA", "deadline": "2024-01-15",
+            "min_gpa": 3.5, "major": [{"name": "Computer Science"}]}
+
+
+@pytest.fixture
+def need():
+    return {"id": "page-need", "university": "Stanford", "scholarship_name": "Need Scholarship", "type": "Need-based",
+            "degree_level": "Graduate", "country": "USA", "deadline": "2024-02-20",
+            "min_gpa": 3.0, "major": [{"name": "Any"}]}
+
+
+@pytest.fixture
+def catalog(merit, need):
+    return CatalogCache(loader=lambda: [merit, need])
+
+
+@pytest.fixture
+def store(favorites_redis, favorites_sessions, catalog):
+    return FavoritesStore(redis_client=favorites_redis, sessions_collection=favorites_sessions, catalog=catalog)
+
+
+##########################################################
+# Store
+##########################################################
+
+def test_add_and_get_in_order(store, favorites_sessions, merit, need):
+    """Test that favorites are hydrated in insertion order and stored in Mongo as IDs."""
+    assert store.add(1, "page-need")
+    assert store.add(1, "page-merit")
+    assert store.get_ids(1) == ["page-need", "page-merit"]
+    assert store.get(1) == [need, merit]
+    assert favorites_sessions.documents[1]["favorites"] == ["page-need", "page-merit"]
+
+def test_add_duplicate(store, favorites_sessions):
+    """Test that adding a favorite twice is a no-op."""
+    store.add(1, "page-merit")
+    assert not store.add(1, "page-merit")
+    assert favorites_sessions.documents[1]["favorites"] == ["page-merit"]
+
+def test_remove(store, favorites_sessions, need):
+    """Test removing favorites from Redis and Mongo."""
+    store.add(1, "page-merit")
+    store.add(1, "page-need")
+    assert store.remove(1, "page-merit")
+    assert not store.remove(1, "page-merit")
+    assert store.get(1) == [need]
+    assert favorites_sessions.documents[1]["favorites"] == ["page-need"]
+
+def test_get_reads_through_once(store, favorites_sessions):
+    """Test that a Redis miss loads from Mongo and later reads stay in Redis."""
+    favorites_sessions.insert_one({"user_id": 2, "favorites": ["page-merit"]})
+    assert store.get_ids(2) == ["page-merit"]
+    assert store.get_ids(2) == ["page-merit"]
+    assert favorites_sessions.reads == 1
+
+def test_empty_favorites_are_cached(store, favorites_sessions):
+    """Test that a user without favorites is not re-read from Mongo."""
+    assert store.get(3) == []
+    assert store.get(3) == []
+    assert favorites_sessions.reads == 1
+
+def test_add_after_eviction_keeps_stored_favorites(store, favorites_sessions):
+    """Test that writes to an uncached user keep the favorites already in Mongo."""
+    favorites_sessions.insert_one({"user_id": 4, "favorites": ["page-merit"]})
+    store.add(4, "page-need")
+    store.evict(4)
+    assert store.get_ids(4) == ["page-merit", "page-need"]
+
+def test_hash_without_loaded_marker_is_read_through(store, favorites_sessions):
+    """Test that a partial hash is never served as the user's complete favorites."""
+    favorites_sessions.insert_one({"user_id": 4, "favorites": ["page-merit", "page-need"]})
+    store.redis.hashes["favorites:4"] = {"page-need": "1"}
+    assert store.get_ids(4) == ["page-merit", "page-need"]
+    assert favorites_sessions.reads == 1
+
+def test_favorites_missing_from_catalog_are_skipped(store):
+    """Test that IDs no longer in the catalog are kept but not hydrated."""
+    store.add(5, "page-gone")
+    store.add(5, "page-need")
+    assert [s["id"] for s in store.get(5)] == ["page-need"]
+    assert store.get_ids(5) == ["page-gone", "page-need"]
+
+def test_legacy_documents_are_migrated_to_ids(store, favorites_sessions, merit):
+    """Test that favorites_sessions holding full scholarship documents are rewritten as IDs."""
+    legacy = {k: v for k, v in merit.items() if k != "id"}
+    favorites_sessions.insert_one({"user_id": 6, "favorites": [legacy, {"university": "Nowhere", "scholarship_name": "Gone"}]})
+    assert store.get(6) == [merit]
+    assert favorites_sessions.documents[6]["favorites"] == ["page-merit"]
+
+def test_apply_batch_in_order(store, favorites_sessions, merit, need):
+    """Test that batch operations see the effect of earlier ones and persist in one bulk write."""
+    store.add(1, "page-merit")
+    results = store.apply_batch(1, [
+        {"op": "add", "scholarship_id": "page-need"},
+        {"op": "add", "scholarship_id": "page-merit"},
+        {"op": "remove", "scholarship_id": "page-merit"},
+        {"op": "remove", "scholarship_id": "page-merit"},
+        {"op": "add", "scholarship_id": "page-merit"},
+    ])
+    assert [r["applied"] for r in results] == [True, False, True, False, True]
+    assert favorites_sessions.bulk_writes == 1
+    assert store.get(1) == [need, merit]
+    assert favorites_sessions.documents[1]["favorites"] == ["page-need", "page-merit"]
+
+def test_apply_batch_without_changes(store, favorites_sessions):
+    """Test that a batch with no effective operations skips MongoDB."""
+    results = store.apply_batch(1, [{"op": "remove", "scholarship_id": "page-merit"}])
+    assert results[0]["applied"] is False
+    assert favorites_sessions.bulk_writes == 0
+
+def test_seed_fills_the_cache_without_a_read(store, favorites_sessions):
+    """Test that favorites read at login are cached, but never replace a cached copy."""
+    store.seed(1, ["page-need"])
+    assert store.get_ids(1) == ["page-need"]
+    assert favorites_sessions.reads == 0
+    store.seed(1, ["page-merit"])
+    assert store.get_ids(1) == ["page-need"]
+
+def test_clear(store, favorites_sessions):
+    """Test clearing a user's favorites."""
+    store.add(1, "page-merit")
+    store.clear(1)
+    assert store.get(1) == []
+    assert favorites_sessions.documents[1]["favorites"] == []
+
+
+##########################################################
+# Write-behind
+##########################################################
+
+@pytest.fixture
+def writer(store):
+    store.writer = FavoritesWriteBehind(store, batch_size=2, max_pending=3, enqueue_timeout=0)
+    return store.writer
+
+def test_write_behind_acknowledges_before_mongo(store, favorites_sessions, writer, need):
+    """Test that changes are visible immediately and reach Mongo only when flushed."""
+    store.add(1, "page-merit")
+    store.add(1, "page-need")
+    store.remove(1, "page-merit")
+    assert store.get(1) == [need]
+    assert favorites_sessions.documents.get(1) is None
+    assert writer.stats()["queue_depth"] == 1
+    assert writer.flush() == 1
+    assert favorites_sessions.documents[1]["favorites"] == ["page-need"]
+    assert favorites_sessions.bulk_writes == 1
+
+def test_write_behind_batches_users(store, favorites_sessions, writer):
+    """Test that dirty users are written in batches of `batch_size`."""
+    for user_id in (1, 2, 3):
+        store.add(user_id, "page-merit")
+    assert writer.flush() == 3
+    stats = writer.stats()
+    assert stats["batches"] == 2
+    assert stats["max_batch_size"] == 2
+    assert stats["queue_depth"] == 0
+
+def test_write_behind_backpressure(store, favorites_sessions, writer):
+    """Test that a full queue makes the caller write synchronously."""
+    for user_id in (1, 2, 3, 4):
+        store.add(user_id, "page-merit")
+    assert writer.stats()["synchronous_writes"] == 1
+    assert favorites_sessions.documents[4]["favorites"] == ["page-merit"]
+    assert 1 not in favorites_sessions.documents
+
+def test_write_behind_requeues_failed_batches(store, favorites_sessions, writer, monkeypatch):
+    """Test that a failed flush keeps the users pending."""
+    store.add(1, "page-merit")
+    def fail(requests, ordered=True):
+        raise RuntimeError("mongo down")
+    monkeypatch.setattr(favorites_sessions, "bulk_write", fail)
+    with pytest.raises(RuntimeError):
+        writer.flush()
+    assert writer.stats()["queue_depth"] == 1
+    assert writer.stats()["failures"] == 1
+
+def test_write_behind_flushes_on_stop_and_evict(store, favorites_sessions, writer):
+    """Test that stopping the flusher and evicting a user write pending changes."""
+    writer.start()
+    store.add(1, "page-merit")
+    store.add(2, "page-need")
+    store.evict(2)
+    assert favorites_sessions.documents[2]["favorites"] == ["page-need"]
+    writer.stop()
+    assert favorites_sessions.documents[1]["favorites"] == ["page-merit"]
+
+def test_write_behind_dirty_set_survives_a_lost_worker(store, favorites_sessions, writer, need):
+    """Test that another worker writes changes a killed worker left in the shared dirty set."""
+    store.add(1, "page-need")
+    store.remove(1, "page-need")
+    store.add(1, "page-need")
+    assert store.redis.sets["favorites:dirty"] == {"1"}
+
+    survivor = FavoritesWriteBehind(store)  # The first writer's queue is lost with its process
+    assert survivor.recover() == 1
+    assert survivor.flush() == 1
+    assert favorites_sessions.documents[1]["favorites"] == ["page-need"]
+    assert store.redis.sets["favorites:dirty"] == set()
+
+def test_write_behind_skips_expired_hashes(store, favorites_sessions, writer):
+    """Test that a dirty user whose hash expired is dropped, not overwritten from MongoDB."""
+    favorites_sessions.insert_one({"user_id": 1, "favorites": ["page-need"]})
+    store.add(1, "page-merit")
+    store.redis.delete("favorites:1")
+    assert writer.flush() == 1
+    assert favorites_sessions.documents[1]["favorites"] == ["page-need"]
+    assert favorites_sessions.reads == 1  # Only the initial cache fill, no read-through at flush time
+    assert writer.stats()["expired"] == 1
+    assert store.redis.sets["favorites:dirty"] == set()
+
+def test_write_behind_never_writes_a_partial_hash(store, favorites_sessions, writer):
+    """Test that a hash without the loaded marker never replaces the stored list."""
+    favorites_sessions.insert_one({"user_id": 1, "favorites": ["page-need", "page-merit"]})
+    store.redis.hashes["favorites:1"] = {"page-other": "1"}  # Recreated by a stray write after expiry
+    writer.mark_dirty(1)
+    writer.flush()
+    assert favorites_sessions.documents[1]["favorites"] == ["page-need", "page-merit"]
+    assert writer.stats()["expired"] == 1
+
+def test_changes_to_an_expired_hash_reload_it_first(store, favorites_sessions, writer):
+    """Test that a write landing after the hash expired merges into the full stored list."""
+    favorites_sessions.insert_one({"user_id": 1, "favorites": ["page-need"]})
+    store.get_ids(1)
+    store.redis.delete("favorites:1")
+    assert store.add(1, "page-merit")
+    writer.flush()
+    assert favorites_sessions.documents[1]["favorites"] == ["page-need", "page-merit"]
+
+
+##########################################################
+# Routes
+##########################################################
+
+@pytest.fixture
+def routes_store(store, merit, need):
+    original = (favorites_store._redis, favorites_store._sessions, catalog_cache.loader)
+    favorites_store._redis, favorites_store._sessions = store._redis, store._sessions
+    catalog_cache.loader = lambda: [merit, need]
+    catalog_cache.clear()
+    yield favorites_store
+    favorites_store._redis, favorites_store._sessions, catalog_cache.loader = original
+    catalog_cache.clear()
+
+def test_favorites_persist_across_requests(client, routes_store, merit, need):
+    """Test that favorites added through the API are returned by later requests."""
+    client.post("/api/favorites/add", json={"user_id": 7, "scholarship_id": "page-merit"})
+    client.post("/api/favorites/add", json={"user_id": 7, "scholarship": need})
+    response = client.post("/api/favorites/remove", json={"user_id": 7, "scholarship": merit})
+    assert response.get_json()["removed"] is True
+    response = client.get("/api/favorites/7")
+    assert response.status_code == 200
+    assert response.get_json()["favorites"] == [need]
+
+def test_favorites_add_by_name_and_duplicates(client, routes_store):
+    """Test that a scholarship sent without an ID is matched by university and name."""
+    scholarship = {"university": "MIT", "scholarship_name": "Merit Scholarship"}
+    response = client.post("/api/favorites/add", json={"user_id": 7, "scholarship": scholarship})
+    assert response.get_json()["scholarship_id"] == "page-merit"
+    response = client.post("/api/favorites/add", json={"user_id": 7, "scholarship_id": "page-merit"})
+    assert response.get_json()["added"] is False
+
+def test_favorites_add_unknown_scholarship(client, routes_store):
+    """Test that scholarships not in the catalog cannot be favorited."""
+    response = client.post("/api/favorites/add", json={"user_id": 7, "scholarship_id": "page-unknown"})
+    assert response.status_code == 404
+
+def test_favorites_batch_route(client, routes_store, merit, need):
+    """Test the batch endpoint's per-operation results."""
+    response = client.post("/api/favorites/batch", json={"user_id": 8, "operations": [
+        {"op": "add", "scholarship_id": "page-merit"},
+        {"op": "add", "scholarship": need},
+        {"op": "add", "scholarship_id": "page-merit"},
+    ]})
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body["applied"] == 2
+    assert [r["applied"] for r in body["results"]] == [True, True, False]
+    assert client.get("/api/favorites/8").get_json()["favorites"] == [merit, need]
+
+def test_favorites_batch_rejects_invalid_operations(client, routes_store):
+    """Test that malformed operations are rejected before anything is applied."""
+    response = client.post("/api/favorites/batch", json={"user_id": 8, "operations": [
+        {"op": "add", "scholarship_id": "page-merit"},
+        {"op": "rename", "scholarship_id": "page-merit"},
+    ]})
+    assert response.status_code == 400
+    assert "index 1" in response.get_json()["message"]
+    assert client.get("/api/favorites/8").get_json()["favorites"] == []
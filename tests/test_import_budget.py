@@ -0,0 +1,27 @@
+import os
+
+from scholarship_finder.utils.import_budget import DEFAULT_BUDGET_MS, StartupProfile, parse_importtime, profile_startup
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_parse_importtime():
+    """Test that the -X importtime report is parsed, skipping its header."""
+    output = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        120 |   json.decoder\n"
+        "import time:       300 |        420 | json\n"
+        "import time:       900 |        900 |   pymongo\n"
+    )
+    costs = parse_importtime(output)
+    assert [(cost.module, cost.cumulative_us) for cost in costs] == [
+        ("json.decoder", 120), ("json", 420), ("pymongo", 900)
+    ]
+    assert StartupProfile(costs, 0.0, 0.0).deferred_imported() == ["pymongo"]
+
+def test_startup_defers_clients_and_stays_in_budget():
+    """Test that create_app() loads no client library and finishes within budget."""
+    profile = profile_startup(cwd=ROOT)
+    assert "app" in profile.modules
+    assert profile.deferred_imported() == []
+    assert profile.create_app_seconds * 1000 < DEFAULT_BUDGET_MS
@@ -0,0 +1,27 @@
+import json
+
+from scholarship_finder.utils.json_encoding import dumps, iter_json_chunks, join_fragments
+
+
+def test_join_fragments_matches_plain_encoding():
+    """Test that splicing pre-encoded items yields the same document as encoding it whole."""
+    items = [{"name": "Merit"}, {"name": "Need", "gpa": 3.0}]
+    body = join_fragments({"status": "success", "count": 2}, "items", [dumps(i) for i in items])
+    assert json.loads(body) == {"status": "success", "count": 2, "items": items}
+
+def test_join_fragments_with_empty_envelope_and_items():
+    """Test the edge cases of no other fields and no items."""
+    assert json.loads(join_fragments({}, "items", [])) == {"items": []}
+
+def test_iter_json_chunks_matches_join_fragments():
+    """Test that streamed chunks concatenate to the buffered document."""
+    fragments = [dumps({"n": i, "text": "x" * 50}) for i in range(100)]
+    chunks = list(iter_json_chunks({"count": 100}, "items", fragments, chunk_size=256))
+    assert len(chunks) > 1
+    assert b"".join(chunks) == join_fragments({"count": 100}, "items", fragments)
+
+def test_dumps_keeps_unicode():
+    """Test that non-ASCII text is encoded as UTF-8."""
+    assert json.loads(dumps({"university": "Université de Montréal"}).decode("utf-8")) == {
+        "university": "Université de Montréal"
+    }
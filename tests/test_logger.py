@@ -0,0 +1,63 @@
+import logging
+import queue
+
+from scholarship_finder.utils import logger as logger_module
+from scholarship_finder.utils.logger import (
+    RateLimitFilter, SuppressedCountFormatter, _DroppingQueueHandler, configure_logger, init_logging
+)
+
+
+def make_record(message="hello %s", args=("world",), lineno=10, level=logging.INFO):
+    return logging.LogRecord("test", level, "module.py", lineno, message, args, None)
+
+
+def test_configure_logger_is_idempotent():
+    """Test that configuring a logger twice attaches the shared handler once."""
+    logger = logging.getLogger("test.idempotent")
+    configure_logger(logger)
+    configure_logger(logger)
+    assert len(logger.handlers) == 1
+
+def test_init_logging_sets_levels_from_config(app):
+    """Test that the configured level applies to loggers configured earlier."""
+    logger = logging.getLogger("test.levels")
+    configure_logger(logger)
+    app.config["LOG_LEVEL"] = "WARNING"
+    init_logging(app)
+    try:
+        assert logger.level == logging.WARNING
+        assert not logger.isEnabledFor(logging.INFO)
+        assert logger_module._handler in app.logger.handlers
+    finally:
+        app.config["LOG_LEVEL"] = "INFO"
+        init_logging(app)
+
+def test_rate_limit_per_call_site(monkeypatch):
+    """Test that a busy call site is limited and later reports what it dropped."""
+    now = [0.0]
+    monkeypatch.setattr(logger_module.time, "monotonic", lambda: now[0])
+    rate_limit = RateLimitFilter(limit=2, interval=1.0)
+    assert [rate_limit.filter(make_record()) for _ in range(5)] == [True, True, False, False, False]
+    assert rate_limit.filter(make_record(lineno=11))  # Another call site is unaffected
+    now[0] = 1.5
+    record = make_record()
+    assert rate_limit.filter(record)
+    assert record.getMessage() == "hello world"
+    assert SuppressedCountFormatter("%(message)s").format(record) == "hello world [3 similar messages suppressed]"
+
+def test_rate_limit_lets_warnings_through():
+    """Test that warnings and errors are never rate-limited."""
+    rate_limit = RateLimitFilter(limit=1, interval=60.0)
+    assert rate_limit.filter(make_record())
+    assert not rate_limit.filter(make_record())
+    assert all(rate_limit.filter(make_record(level=level)) for level in (logging.WARNING, logging.ERROR) * 3)
+    assert rate_limit.suppressed == 1
+
+def test_queue_handler_merges_arguments_and_drops_when_full():
+    """Test that records are enqueued pre-merged and dropped once the queue is full."""
+    handler = _DroppingQueueHandler(queue.Queue(maxsize=1))
+    handler.handle(make_record())
+    handler.handle(make_record())
+    record = handler.queue.get_nowait()
+    assert (record.msg, record.args) == ("hello world", None)
+    assert handler.dropped == 1
@@ -0,0 +1,159 @@
+import gc
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from scholarship_finder.clients.mongo_client import MONGO_COMMAND_SECONDS, command_timer
+from scholarship_finder.db import DB_QUERY_SECONDS, db
+from scholarship_finder.instrumentation import HTTP_REQUEST_SECONDS, HTTP_REQUESTS
+from scholarship_finder.utils.metrics import MetricsRegistry
+from scholarship_finder.utils.notion_sync import NOTION_FETCH_SECONDS, NOTION_ROWS_CHANGED, NotionSync
+
+
+######################################################
+#
+#    Registry
+#
+######################################################
+
+
+def test_counter_merges_per_thread_shards():
+    """Test that increments from several threads are all counted."""
+    counter = MetricsRegistry().counter("jobs_total", "Jobs.", ("kind",))
+
+    def work():
+        for _ in range(1000):
+            counter.inc("a")
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    counter.inc("b", amount=2)
+    assert counter.values() == {("a",): 4000, ("b",): 2}
+
+def test_shards_of_exited_threads_are_retired():
+    """Test that short-lived threads do not each leave a shard behind, and their samples are kept."""
+    registry = MetricsRegistry()
+    counter = registry.counter("jobs_total", "Jobs.")
+    histogram = registry.histogram("job_seconds", "Jobs.", buckets=(1.0,))
+
+    def work():
+        counter.inc()
+        histogram.observe(0.5)
+
+    for _ in range(50):
+        thread = threading.Thread(target=work)
+        thread.start()
+        thread.join()
+    gc.collect()
+    assert len(counter._shards) <= 1 and len(histogram._shards) <= 1
+    assert counter.values() == {(): 50}
+    assert histogram.values() == {(): [50, 0, 25.0]}
+
+    registry.reset()
+    assert counter.values() == {} and histogram.values() == {}
+
+def test_histogram_renders_cumulative_buckets():
+    """Test the bucket, sum and count lines of a histogram."""
+    registry = MetricsRegistry()
+    histogram = registry.histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 5.0):
+        histogram.observe(value, "/a")
+    text = registry.render()
+    assert "# TYPE latency_seconds histogram" in text
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{route="/a",le="1.0"} 3' in text
+    assert 'latency_seconds_bucket{route="/a",le="+Inf"} 4' in text
+    assert 'latency_seconds_sum{route="/a"} 6.05' in text
+    assert 'latency_seconds_count{route="/a"} 4' in text
+
+def test_gauges_are_collected_at_render_time_and_escaped():
+    """Test collected gauges, label escaping and that a failing collector does not break the rest."""
+    registry = MetricsRegistry()
+    value = [1]
+    registry.gauge("items", "Items.", lambda: [(('say "hi"',), value[0])], ("name",))
+    registry.gauge("broken", "Broken.", lambda: 1 / 0)
+    registry.gauge("pending", "Nothing yet.", lambda: [((), None)])
+    value[0] = 7
+    text = registry.render()
+    assert 'items{name="say \\"hi\\""} 7' in text
+    assert "# broken not collected" in text
+    assert "\npending " not in text
+
+def test_registry_reuses_metrics_and_resets_samples():
+    """Test that metrics are looked up by name and reset() clears their samples."""
+    registry = MetricsRegistry()
+    counter = registry.counter("events_total", "Events.")
+    assert registry.counter("events_total", "Events.") is counter
+    counter.inc()
+    registry.reset()
+    assert counter.values() == {}
+    counter.inc()
+    assert counter.values() == {(): 1}
+
+
+######################################################
+#
+#    Instrumentation
+#
+######################################################
+
+
+def test_requests_are_counted_by_route_template(client):
+    """Test that requests are labelled with the route rule, not the raw path."""
+    route = "/api/favorites/<int:user_id>"
+    status = str(client.get("/api/favorites/1").status_code)
+    before = HTTP_REQUESTS.values()[(route, "GET", status)]
+    client.get("/api/favorites/2")
+    assert HTTP_REQUESTS.values()[(route, "GET", status)] == before + 1
+    assert not any(labels[0] == "/api/favorites/2" for labels in HTTP_REQUESTS.values())
+    assert HTTP_REQUEST_SECONDS.values()[(route, "GET")][-1] > 0
+
+def test_metrics_endpoint(client):
+    """Test that /api/metrics serves the Prometheus text format with the app's gauges."""
+    client.get("/api/health")
+    response = client.get("/api/metrics")
+    assert response.status_code == 200
+    assert response.mimetype == "text/plain"
+    text = response.get_data(as_text=True)
+    assert 'http_requests_total{route="/api/health",method="GET",status="200"}' in text
+    assert "# TYPE http_request_duration_seconds histogram" in text
+    assert "catalog_version " in text
+    assert 'cache_hit_ratio{cache="result"}' in text
+    assert "# TYPE cache_hits_total counter" in text
+    assert "log_records_dropped_total " in text
+
+def test_metrics_can_be_disabled(client, app):
+    """Test that the endpoint answers 404 when metrics are disabled."""
+    app.config["METRICS_ENABLED"] = False
+    assert client.get("/api/metrics").status_code == 404
+
+def test_sql_statements_are_timed(app):
+    """Test that statements on the app's engine are recorded by operation."""
+    before = DB_QUERY_SECONDS.values().get(("sqlite", "SELECT"), [0])
+    db.session.execute(db.text("SELECT 1"))
+    after = DB_QUERY_SECONDS.values()[("sqlite", "SELECT")]
+    assert sum(after[:-1]) == sum(before[:-1]) + 1
+
+def test_mongo_commands_are_timed():
+    """Test that the command listener files driver-reported durations."""
+    timer = command_timer()
+    before = MONGO_COMMAND_SECONDS.values().get(("find", "ok"), [0, 0.0])
+    timer.succeeded(SimpleNamespace(command_name="find", duration_micros=1500))
+    after = MONGO_COMMAND_SECONDS.values()[("find", "ok")]
+    assert sum(after[:-1]) == sum(before[:-1]) + 1
+    assert after[-1] - before[-1] == pytest.approx(0.0015)
+
+def test_notion_syncs_are_timed(monkeypatch):
+    """Test that a full sync records its duration and the rows it loaded."""
+    pages = [{"id": "p1", "last_edited_time": "2024-01-01T00:00:00.000Z"}]
+    monkeypatch.setattr("scholarship_finder.utils.notion_sync.iter_database_pages", lambda *args, **kwargs: iter(pages))
+    monkeypatch.setattr(NotionSync, "_parse", staticmethod(lambda page: {"id": page["id"]}))
+    fetches = sum(NOTION_FETCH_SECONDS.values().get(("full",), [0])[:-1])
+    rows = NOTION_ROWS_CHANGED.values().get(("full",), 0)
+    NotionSync().full_sync()
+    assert sum(NOTION_FETCH_SECONDS.values()[("full",)][:-1]) == fetches + 1
+    assert NOTION_ROWS_CHANGED.values()[("full",)] == rows + 1
@@ -0,0 +1,73 @@
+import pytest
+
+from scholarship_finder.clients import mongo_client
+from scholarship_finder.clients.mongo_client import LazyMongoClient
+
+
+class FakeApp:
+    def __init__(self, **config):
+        self.config = config
+        self.extensions = {}
+
+
+@pytest.fixture
+def lazy_client():
+    client = LazyMongoClient()
+    yield client
+    client.reset()
+
+
+def test_client_is_created_on_first_use(lazy_client):
+    """Test that no MongoClient exists until it is needed, and it is then reused."""
+    assert lazy_client._client is None
+    client = lazy_client.client
+    assert lazy_client.client is client
+
+def test_client_is_rebuilt_after_fork(lazy_client, monkeypatch):
+    """Test that a process with a different pid gets its own client."""
+    parent = lazy_client.client
+    monkeypatch.setattr(mongo_client.os, "getpid", lambda: -1)
+    assert lazy_client.client is not parent
+
+def test_pool_settings_from_config(lazy_client):
+    """Test that pool and timeout settings are passed to MongoClient."""
+    lazy_client.init_app(FakeApp(MONGO_MAX_POOL_SIZE=7, MONGO_SERVER_SELECTION_TIMEOUT_MS=1500))
+    assert lazy_client.options == {"maxPoolSize": 7, "serverSelectionTimeoutMS": 1500}
+    assert lazy_client.client.options.pool_options.max_pool_size == 7
+
+def test_init_app_ensures_indexes_on_first_use(lazy_client, monkeypatch):
+    """Test that the unique sessions index is created once, on first use rather than at startup."""
+    created = []
+    monkeypatch.setattr(LazyMongoClient, "ensure_indexes", lambda self: created.append(True))
+    lazy_client.init_app(FakeApp())
+    lazy_client.sessions
+    assert created == []
+    lazy_client.init_app(FakeApp(MONGO_ENSURE_INDEXES=True))
+    assert created == []
+    lazy_client.sessions
+    lazy_client.sessions
+    assert created == [True]
+
+def test_failed_index_creation_is_retried(lazy_client, monkeypatch):
+    """Test that indexes stay pending after a failure and are retried once the back-off has passed."""
+    attempts = []
+    def ensure_indexes(self):
+        attempts.append(True)
+        if len(attempts) == 1:
+            raise RuntimeError("mongo down")
+    monkeypatch.setattr(LazyMongoClient, "ensure_indexes", ensure_indexes)
+    now = [1000.0]
+    monkeypatch.setattr(mongo_client.time, "monotonic", lambda: now[0])
+    lazy_client.init_app(FakeApp(MONGO_ENSURE_INDEXES=True))
+
+    assert lazy_client.ensure_pending_indexes() is False
+    lazy_client.sessions
+    assert len(attempts) == 1  # Still backing off
+    now[0] += mongo_client.INDEX_RETRY_SECONDS
+    lazy_client.sessions
+    assert len(attempts) == 2
+    assert lazy_client.ensure_pending_indexes() is True
+
+def test_legacy_module_attributes_are_lazy():
+    """Test that `sessions_collection` still resolves for existing imports."""
+    assert mongo_client.sessions_collection.name == "sessions"
@@ -0,0 +1,119 @@
+import pytest
+
+from scholarship_finder.utils.notion_sync import NotionSync
+from scholarship_finder.utils.random_utils import iter_database_pages
+
+
+def make_page(page_id, name, edited, archived=False):
+    return {
+        "id": page_id,
+        "last_edited_time": edited,
+        "archived": archived,
+        "properties": {
+            "Scholarship Name": {"title": [{"text": {"content": name}}]},
+            "University": {"rich_text": [{"text": {"content": "MIT"}}]},
+            "Country": {"select": {"name": "USA"}},
+            "Min GPA": {"number": 3.0}
+        }
+    }
+
+
+class FakeDatabases:
+    """Serves pages in fixed-size chunks and honours last_edited_time filters."""
+
+    def __init__(self, pages, chunk_size=2):
+        self.pages = pages
+        self.chunk_size = chunk_size
+        self.calls = []
+
+    def query(self, database_id, page_size=100, start_cursor=None, filter=None):
+        self.calls.append({"start_cursor": start_cursor, "filter": filter})
+        pages = self.pages
+        if filter:
+            since = filter["last_edited_time"]["on_or_after"]
+            pages = [p for p in pages if p["last_edited_time"] >= since]
+        start = int(start_cursor or 0)
+        end = start + self.chunk_size
+        has_more = end < len(pages)
+        return {
+            "results": pages[start:end],
+            "has_more": has_more,
+            "next_cursor": str(end) if has_more else None
+        }
+
+
+class FakeClient:
+    def __init__(self, pages, chunk_size=2):
+        self.databases = FakeDatabases(pages, chunk_size)
+
+
+@pytest.fixture
+def pages():
+    return [
+        make_page("a", "Alpha", "2024-01-01T00:00:00.000Z"),
+        make_page("b", "Beta", "2024-01-02T00:00:00.000Z"),
+        make_page("c", "Gamma", "2024-01-03T00:00:00.000Z"),
+    ]
+
+
+##########################################################
+# Pagination
+##########################################################
+
+def test_iter_database_pages_follows_cursors(pages):
+    """Test that every page is returned, not just the first response."""
+    client = FakeClient(pages, chunk_size=2)
+    ids = [page["id"] for page in iter_database_pages(client, "db")]
+    assert ids == ["a", "b", "c"]
+    assert len(client.databases.calls) == 2
+    assert client.databases.calls[1]["start_cursor"] == "2"
+
+
+##########################################################
+# Full and incremental sync
+##########################################################
+
+def test_first_sync_is_full(pages):
+    """Test that the first sync loads every row."""
+    sync = NotionSync(FakeClient(pages), "db")
+    rows = sync.sync()
+    assert [r["scholarship_name"] for r in rows] == ["Alpha", "Beta", "Gamma"]
+    assert sync.last_changes == 3
+
+def test_incremental_sync_merges_changes(pages):
+    """Test that only edited pages are fetched and merged in place."""
+    client = FakeClient(pages)
+    sync = NotionSync(client, "db")
+    sync.sync()
+    pages[1] = make_page("b", "Beta Updated", "2024-01-04T00:00:00.000Z")
+    pages.append(make_page("d", "Delta", "2024-01-05T00:00:00.000Z"))
+    client.databases.calls.clear()
+
+    rows = sync.sync()
+    assert [r["scholarship_name"] for r in rows] == ["Alpha", "Beta Updated", "Gamma", "Delta"]
+    assert client.databases.calls[0]["filter"]["last_edited_time"]["on_or_after"] == "2024-01-03T00:00:00.000Z"
+    assert sync.last_changes == 2
+
+def test_incremental_sync_without_changes_returns_none(pages):
+    """Test that an incremental sync with no edits reports no change."""
+    sync = NotionSync(FakeClient(pages), "db")
+    sync.sync()
+    assert sync.sync() is None
+    assert sync.last_changes == 0
+
+def test_incremental_sync_drops_archived_pages(pages):
+    """Test that archived pages are removed from the catalog."""
+    sync = NotionSync(FakeClient(pages), "db")
+    sync.sync()
+    pages[0] = make_page("a", "Alpha", "2024-01-06T00:00:00.000Z", archived=True)
+    rows = sync.sync()
+    assert [r["scholarship_name"] for r in rows] == ["Beta", "Gamma"]
+
+def test_periodic_full_sync_reconciles_deletions(pages):
+    """Test that hard-deleted pages disappear on the next full pass."""
+    sync = NotionSync(FakeClient(pages), "db", full_sync_every=1)
+    sync.sync()
+    del pages[2]
+    assert sync.sync() is None  # incremental pass cannot see the deletion
+    rows = sync.sync()
+    assert [r["scholarship_name"] for r in rows] == ["Alpha", "Beta"]
@@ -0,0 +1,36 @@
+import asyncio
+
+from scholarship_finder.clients.async_clients import AsyncClients
+from scholarship_finder.clients.redis_client import LazyRedisClient, redis_connection
+
+
+class FakeApp:
+    def __init__(self, **config):
+        self.config = config
+        self.extensions = {}
+
+
+def test_clients_time_out_by_default():
+    """Test that the Redis client is never built without connect and socket timeouts."""
+    client = LazyRedisClient().client
+    kwargs = client.connection_pool.connection_kwargs
+    assert kwargs["socket_connect_timeout"] == 1.0
+    assert kwargs["socket_timeout"] == 2.0
+
+def test_timeouts_from_config(monkeypatch):
+    """Test that the timeout settings reach both the sync and the async Redis clients."""
+    lazy_client = LazyRedisClient()
+    lazy_client.init_app(FakeApp(REDIS_CONNECT_TIMEOUT_MS=250, REDIS_SOCKET_TIMEOUT_MS=500))
+    kwargs = lazy_client.client.connection_pool.connection_kwargs
+    assert (kwargs["socket_connect_timeout"], kwargs["socket_timeout"]) == (0.25, 0.5)
+
+    monkeypatch.setattr(redis_connection, "connect_timeout_ms", 250)
+    monkeypatch.setattr(redis_connection, "socket_timeout_ms", 500)
+
+    async def async_kwargs():
+        client = AsyncClients().redis
+        kwargs = client.connection_pool.connection_kwargs
+        await client.aclose()
+        return kwargs["socket_connect_timeout"], kwargs["socket_timeout"]
+
+    assert asyncio.run(async_kwargs()) == (0.25, 0.5)
@@ -0,0 +1,41 @@
+import pytest
+
+from scholarship_finder.utils.result_cache import ResultCache
+
+
+@pytest.fixture
+def cache():
+    return ResultCache(max_bytes=100, max_entry_fraction=0.5)
+
+
+def test_get_and_put(cache):
+    """Test that stored bodies are returned for the same version and key."""
+    assert cache.get(1, ("q",)) is None
+    cache.put(1, ("q",), b"body")
+    assert cache.get(1, ("q",)) == b"body"
+    assert cache.get(2, ("q",)) is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 2
+
+def test_evicts_least_recently_used_within_budget(cache):
+    """Test that the byte budget is enforced in LRU order."""
+    cache.put(1, "a", b"x" * 40)
+    cache.put(1, "b", b"x" * 40)
+    cache.get(1, "a")
+    cache.put(1, "c", b"x" * 40)
+    assert cache.get(1, "b") is None
+    assert cache.get(1, "a") is not None
+    assert cache.size <= 100
+    assert cache.stats()["evictions"] == 1
+
+def test_oversized_entries_are_not_cached(cache):
+    """Test that a single entry cannot take over the budget."""
+    cache.put(1, "big", b"x" * 60)
+    assert cache.get(1, "big") is None
+
+def test_newer_version_drops_older_entries(cache):
+    """Test that storing a newer version frees entries of older versions."""
+    cache.put(1, "a", b"x" * 10)
+    cache.put(2, "a", b"y" * 10)
+    assert cache.stats()["entries"] == 1
+    assert cache.size == 10
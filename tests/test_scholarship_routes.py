@@ -0,0 +1,236 @@
+import pytest
+
+from scholarship_finder.models.catalog_model import catalog_cache
+from scholarship_finder.utils.result_cache import result_cache
+
+
+@pytest.fixture
+def catalog_rows():
+    return [
+        {"university": "MIT", "scholarship_name": "Merit Scholarship", "type": "Merit-based",
+         "degree_level": "Undergraduate", "country": "USA", "deadline": "2024-01-15",
+         "min_gpa": 3.5, "major": [{"name": "Computer Science"}]},
+        {"university": "Stanford", "scholarship_name": "Need Scholarship", "type": "Need-based",
+         "degree_level": "Graduate", "country": "USA", "deadline": "2024-02-20",
+         "min_gpa": 3.0, "major": [{"name": "Any"}]},
+        {"university": "University of Toronto", "scholarship_name": "STEM Scholarship", "type": "Merit-based",
+         "degree_level": "Undergraduate", "country": "Canada", "deadline": "2024-03-10",
+         "min_gpa": 3.7, "major": [{"name": "STEM"}]},
+    ]
+
+
+@pytest.fixture(autouse=True)
+def catalog(catalog_rows):
+    """Serve the routes from a fixed catalog instead of Notion."""
+    original_loader = catalog_cache.loader
+    catalog_cache.loader = lambda: list(catalog_rows)
+    catalog_cache.clear()
+    result_cache.clear()
+    yield catalog_cache
+    catalog_cache.loader = original_loader
+    catalog_cache.clear()
+
+
+def names(response):
+    return [s["scholarship_name"] for s in response.get_json()["scholarships"]]
+
+
+##########################################################
+# Get Scholarships
+##########################################################
+
+def test_get_scholarships_default_order(client):
+    """Test that scholarships are sorted by deadline by default."""
+    response = client.get("/api/scholarships")
+    assert response.status_code == 200
+    assert names(response) == ["Merit Scholarship", "Need Scholarship", "STEM Scholarship"]
+    assert response.headers["X-Catalog-Version"] == str(catalog_cache.version)
+
+def test_get_scholarships_facet_filters(client):
+    """Test filtering by type and major."""
+    response = client.get("/api/scholarships?type=Merit-based&major=stem")
+    assert names(response) == ["STEM Scholarship"]
+    assert response.get_json()["count"] == 1
+
+def test_get_scholarships_min_gpa_and_sort(client):
+    """Test GPA thresholds combined with a descending sort."""
+    response = client.get("/api/scholarships?min_gpa=3.5&sort_by=university&sort_order=desc")
+    assert names(response) == ["STEM Scholarship", "Merit Scholarship"]
+
+def test_get_scholarships_deadline_window(client):
+    """Test filtering by deadline window."""
+    response = client.get("/api/scholarships?deadline_after=2024-02-01&deadline_before=2024-02-28")
+    assert names(response) == ["Need Scholarship"]
+
+def test_get_scholarships_invalid_min_gpa(client):
+    """Test that a non-numeric GPA is rejected."""
+    response = client.get("/api/scholarships?min_gpa=abc")
+    assert response.status_code == 400
+
+def test_get_scholarships_invalid_deadline(client):
+    """Test that a malformed deadline bound is rejected."""
+    response = client.get("/api/scholarships?deadline_after=January")
+    assert response.status_code == 400
+
+
+##########################################################
+# Pagination
+##########################################################
+
+def walk_pages(client, url):
+    seen = []
+    response = client.get(url)
+    while True:
+        body = response.get_json()
+        seen.extend(s["scholarship_name"] for s in body["scholarships"])
+        if not body["next_cursor"]:
+            return seen
+        response = client.get(f"{url}&cursor={body['next_cursor']}")
+
+def test_pagination_walks_catalog_order_in_both_directions(client):
+    """Test that an unknown sort field pages through every row in either direction."""
+    catalog_order = ["Merit Scholarship", "Need Scholarship", "STEM Scholarship"]
+    assert walk_pages(client, "/api/scholarships?limit=1&sort_by=foo") == catalog_order
+    assert walk_pages(client, "/api/scholarships?limit=1&sort_by=foo&sort_order=desc") == catalog_order[::-1]
+    assert walk_pages(client, "/api/scholarships?limit=2&sort_by=foo&sort_order=desc&type=Merit-based") == [
+        "STEM Scholarship", "Merit Scholarship"
+    ]
+
+def test_pagination_walks_every_row_once(client):
+    """Test that following next_cursor returns each row exactly once."""
+    assert walk_pages(client, "/api/scholarships?limit=1") == [
+        "Merit Scholarship", "Need Scholarship", "STEM Scholarship"
+    ]
+    assert walk_pages(client, "/api/scholarships?limit=2&sort_by=university&sort_order=desc") == [
+        "STEM Scholarship", "Need Scholarship", "Merit Scholarship"
+    ]
+
+def test_pagination_reports_totals(client):
+    """Test that a page reports its own count and the total matches."""
+    body = client.get("/api/scholarships?limit=2").get_json()
+    assert body["count"] == 2
+    assert body["total"] == 3
+    assert body["next_cursor"]
+
+def test_cursor_pins_catalog_version(client, catalog, catalog_rows):
+    """Test that a refresh between pages does not change the walked version."""
+    first_page = client.get("/api/scholarships?limit=1")
+    body = first_page.get_json()
+    catalog_rows.insert(0, dict(catalog_rows[0], scholarship_name="Early Scholarship", deadline="2023-12-01"))
+    catalog.refresh()
+    response = client.get(f"/api/scholarships?limit=5&cursor={body['next_cursor']}")
+    assert response.headers["X-Catalog-Version"] == first_page.headers["X-Catalog-Version"]
+    assert names(response) == ["Need Scholarship", "STEM Scholarship"]
+
+def test_cursor_for_other_query_is_rejected(client):
+    """Test that a cursor cannot be replayed against different filters."""
+    body = client.get("/api/scholarships?limit=1").get_json()
+    response = client.get(f"/api/scholarships?limit=1&country=USA&cursor={body['next_cursor']}")
+    assert response.status_code == 400
+
+def test_invalid_cursor_is_rejected(client):
+    """Test that a garbled cursor is rejected."""
+    response = client.get("/api/scholarships?cursor=not-a-cursor")
+    assert response.status_code == 400
+
+
+##########################################################
+# Search
+##########################################################
+
+def test_search_scholarships(client):
+    """Test keyword search over names, universities and majors."""
+    response = client.get("/api/scholarships/search?q=stanford")
+    assert response.status_code == 200
+    assert names(response) == ["Need Scholarship"]
+    assert response.get_json()["scholarships"][0]["score"] > 0
+
+def test_search_scholarships_with_facets(client):
+    """Test that facet filters narrow search results."""
+    response = client.get("/api/scholarships/search?q=scholarship&country=Canada")
+    assert names(response) == ["STEM Scholarship"]
+
+def test_search_scholarships_requires_query(client):
+    """Test that an empty query is rejected."""
+    assert client.get("/api/scholarships/search").status_code == 400
+
+def test_search_scholarships_rejects_non_positive_limit(client):
+    """Test that a zero or negative limit is rejected like on /api/scholarships."""
+    for limit in ("0", "-1"):
+        assert client.get(f"/api/scholarships/search?q=scholarship&limit={limit}").status_code == 400
+
+
+##########################################################
+# Facets
+##########################################################
+
+def test_facets_unfiltered(client):
+    """Test catalog-wide facet counts and the deadline histogram."""
+    body = client.get("/api/scholarships/facets").get_json()
+    assert body["total"] == 3
+    assert body["facets"]["type"] == {"Merit-based": 2, "Need-based": 1}
+    assert body["facets"]["country"] == {"USA": 2, "Canada": 1}
+    assert body["facets"]["major"] == {"Any": 1, "Computer Science": 1, "STEM": 1}
+    assert body["deadline_months"] == {"2024-01": 1, "2024-02": 1, "2024-03": 1}
+
+def test_facets_conditioned_on_filters(client):
+    """Test that each facet is counted against every filter except its own."""
+    body = client.get("/api/scholarships/facets?type=Merit-based&country=USA").get_json()
+    assert body["total"] == 1
+    assert body["facets"]["type"] == {"Merit-based": 1, "Need-based": 1}
+    assert body["facets"]["country"] == {"USA": 1, "Canada": 1}
+    assert body["facets"]["degree_level"] == {"Undergraduate": 1}
+    assert body["deadline_months"] == {"2024-01": 1}
+
+def test_facets_echo_canonical_filters(client):
+    """Test that facets echo the same filters_applied form as the listing."""
+    args = "country=USA&major=Computer%20Science&min_gpa=3&page=2"
+    listed = client.get(f"/api/scholarships?{args}").get_json()["filters_applied"]
+    counted = client.get(f"/api/scholarships/facets?{args}").get_json()["filters_applied"]
+    assert counted == {"country": "USA", "major": "computer science", "min_gpa": "3.0"}
+    assert listed == dict(counted, sort_by="deadline", sort_order="asc")
+
+def test_facets_with_gpa_filter(client):
+    """Test that range filters condition every facet."""
+    body = client.get("/api/scholarships/facets?min_gpa=3.6").get_json()
+    assert body["total"] == 1
+    assert body["facets"]["country"] == {"Canada": 1}
+
+def test_facets_invalid_filter(client):
+    """Test that malformed filters are rejected."""
+    assert client.get("/api/scholarships/facets?deadline_before=soon").status_code == 400
+
+
+##########################################################
+# Result cache
+##########################################################
+
+def test_equivalent_queries_share_a_cache_entry(client):
+    """Test that parameter order, case and defaults do not split the cache."""
+    first = client.get("/api/scholarships?major=STEM&type=Merit-based")
+    second = client.get("/api/scholarships?type=Merit-based&sort_order=ASC&major=stem&sort_by=deadline")
+    assert first.headers["X-Cache"] == "MISS"
+    assert second.headers["X-Cache"] == "HIT"
+    assert first.data == second.data
+    assert second.get_json()["filters_applied"] == {
+        "type": "Merit-based", "major": "stem", "sort_by": "deadline", "sort_order": "asc"
+    }
+
+def test_refresh_invalidates_cached_results(client, catalog, catalog_rows):
+    """Test that a new catalog version is never answered from old entries."""
+    client.get("/api/scholarships?country=Canada")
+    catalog_rows.append(dict(catalog_rows[2], scholarship_name="Second Canadian Scholarship"))
+    catalog.refresh()
+    response = client.get("/api/scholarships?country=Canada")
+    assert response.headers["X-Cache"] == "MISS"
+    assert response.get_json()["count"] == 2
+
+def test_large_results_are_streamed(client, app):
+    """Test that results above the stream threshold are streamed, uncached, with the same body."""
+    buffered = client.get("/api/scholarships?sort_by=university").get_json()
+    app.config['SCHOLARSHIPS_STREAM_THRESHOLD'] = 1
+    result_cache.clear()
+    response = client.get("/api/scholarships?sort_by=university")
+    assert response.headers["X-Cache"] == "BYPASS"
+    assert response.is_streamed
+    assert response.get_json() == buffered
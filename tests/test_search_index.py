@@ -0,0 +1,69 @@
+import pytest
+
+from scholarship_finder.models.catalog_columns import ColumnarCatalog
+from scholarship_finder.models.search_index import SearchIndex, tokenize
+
+
+@pytest.fixture
+def rows():
+    return [
+        {"university": "MIT", "scholarship_name": "Merit Scholarship",
+         "major": [{"name": "Computer Science"}]},
+        {"university": "Stanford University", "scholarship_name": "Need Based Award",
+         "major": [{"name": "Any"}]},
+        {"university": "Université de Montréal", "scholarship_name": "Science Excellence Scholarship",
+         "major": [{"name": "Physics"}]},
+    ]
+
+
+##########################################################
+# Tokenizing
+##########################################################
+
+def test_tokenize_lowercases_and_folds_accents():
+    """Test that tokens are lowercase and accent-insensitive."""
+    assert tokenize("Université de Montréal!") == ["universite", "de", "montreal"]
+    assert tokenize("") == []
+
+
+##########################################################
+# Ranking
+##########################################################
+
+def test_search_ranks_matches(rows):
+    """Test that rows matching more query terms rank higher."""
+    index = SearchIndex(ColumnarCatalog(rows).search_documents())
+    results = index.search("science scholarship")
+    assert [position for position, _ in results] == [2, 0]
+    assert results[0][1] > results[1][1]
+
+def test_search_matches_university_and_major(rows):
+    """Test that universities and majors are searchable, accent-insensitively."""
+    index = SearchIndex(ColumnarCatalog(rows).search_documents())
+    assert [p for p, _ in index.search("montreal")] == [2]
+    assert [p for p, _ in index.search("physics")] == [2]
+
+def test_search_respects_limit_and_candidates(rows):
+    """Test top-k truncation and candidate restriction."""
+    index = SearchIndex(ColumnarCatalog(rows).search_documents())
+    assert len(index.search("scholarship", limit=1)) == 1
+    assert [p for p, _ in index.search("scholarship", candidates={0})] == [0]
+
+def test_search_without_matches(rows):
+    """Test that unknown terms return nothing."""
+    assert SearchIndex(ColumnarCatalog(rows).search_documents()).search("astronomy") == []
+
+
+##########################################################
+# Incremental rebuild
+##########################################################
+
+def test_rebuild_only_tokenizes_changed_rows(rows):
+    """Test that unchanged rows reuse the previous index's tokens."""
+    previous = SearchIndex(ColumnarCatalog(rows).search_documents())
+    assert previous.tokenized == 3
+    rows[1] = dict(rows[1], scholarship_name="Need Based Grant")
+    rebuilt = SearchIndex(ColumnarCatalog(rows).search_documents(), previous)
+    assert rebuilt.tokenized == 1
+    assert [p for p, _ in rebuilt.search("grant")] == [1]
+    assert rebuilt.search("award") == []
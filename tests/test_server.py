@@ -0,0 +1,65 @@
+import time
+
+import pytest
+
+from scholarship_finder import server
+from scholarship_finder.models.catalog_model import catalog_cache
+from scholarship_finder.models.favorites_store import FavoritesStore
+from scholarship_finder.models.favorites_writer import FavoritesWriteBehind
+
+
+@pytest.fixture
+def catalog_rows():
+    rows = [{"id": "page-1", "university": "MIT", "scholarship_name": "Merit Scholarship", "type": "Merit-based",
+             "degree_level": "Undergraduate", "country": "USA", "deadline": "2024-01-15",
+             "min_gpa": 3.5, "major": [{"name": "Computer Science"}]}]
+    original = catalog_cache.loader
+    catalog_cache.loader = lambda: rows
+    catalog_cache.clear()
+    yield rows
+    catalog_cache.loader = original
+    catalog_cache.clear()
+
+
+def test_readiness_waits_for_catalog(app, client, catalog_rows):
+    """Test that the service reports ready only once the catalog is loaded."""
+    assert client.get("/api/ready").status_code == 503
+    snapshot = server.warm_up(app)
+    response = client.get("/api/ready")
+    assert response.status_code == 200
+    assert response.get_json()["catalog_version"] == snapshot.version
+    assert snapshot.derived("row_json", lambda s: None)[0] is not None
+
+def test_readiness_retries_a_failed_load(client, catalog_rows, monkeypatch):
+    """Test that an unready worker keeps loading the catalog in the background until it succeeds."""
+    attempts = []
+    def flaky_loader():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise RuntimeError("notion down")
+        return catalog_rows
+    catalog_cache.loader = flaky_loader
+    monkeypatch.setattr(catalog_cache, "retry_interval", 0.01)
+
+    assert client.get("/api/ready").status_code == 503
+    deadline = time.monotonic() + 5
+    while catalog_cache.version == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert client.get("/api/ready").status_code == 200
+    assert len(attempts) == 3
+
+def test_reset_after_fork(app, catalog_rows, monkeypatch):
+    """Test that a worker gets fresh locks and restarts the write-behind flusher."""
+    server.warm_up(app)
+    catalog_cache._refreshing = True
+    store = FavoritesStore()
+    store.writer = FavoritesWriteBehind(store, flush_interval=60)
+    monkeypatch.setattr(server, "favorites_store", store)
+
+    server.reset_after_fork(app)
+    assert catalog_cache._refreshing is False
+    assert catalog_cache.version > 0
+    assert store.writer._thread is not None and store.writer._thread.is_alive()
+
+    server.shutdown(app)
+    assert store.writer._thread is None
@@ -0,0 +1,33 @@
+from scholarship_finder.utils import ttl_cache
+from scholarship_finder.utils.ttl_cache import TTLCache
+
+
+def test_get_put_and_invalidate():
+    """Test storing, reading and invalidating entries."""
+    cache = TTLCache(max_entries=2, ttl=60)
+    assert cache.get("a") is None
+    cache.put("a", 1)
+    assert cache.get("a") == 1
+    cache.invalidate("a")
+    assert cache.get("a") is None
+    assert cache.stats()["hits"] == 1
+
+def test_evicts_least_recently_used():
+    """Test that the least recently read entry is evicted first."""
+    cache = TTLCache(max_entries=2, ttl=60)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+
+def test_entries_expire(monkeypatch):
+    """Test that entries are dropped after the TTL."""
+    now = [100.0]
+    monkeypatch.setattr(ttl_cache.time, "monotonic", lambda: now[0])
+    cache = TTLCache(max_entries=2, ttl=10)
+    cache.put("a", 1)
+    now[0] += 11
+    assert cache.get("a") is None
+    assert cache.stats()["entries"] == 0
@@ -0,0 +1,86 @@
+import json
+
+import pytest
+
+from scholarship_finder.models.user_model import User
+from scholarship_finder.utils.user_import import detect_format, iter_user_records
+
+
+##########################################################
+# Parsing
+##########################################################
+
+def test_iter_ndjson_records():
+    """Test parsing NDJSON, skipping blank lines and flagging bad records."""
+    lines = ['{"username": "a", "password": "x"}\n', '\n', 'not json\n', '{"username": "b"}\n']
+    assert list(iter_user_records(lines, "ndjson")) == [
+        (1, "a", "x", None),
+        (3, None, None, "invalid JSON"),
+        (4, "b", None, "both username and password are required"),
+    ]
+
+def test_iter_csv_records():
+    """Test parsing CSV with a header row."""
+    lines = ["username,password\n", "a,x\n", "b,\n"]
+    assert list(iter_user_records(lines, "csv")) == [
+        (2, "a", "x", None),
+        (3, "b", None, "both username and password are required"),
+    ]
+
+def test_csv_requires_header():
+    """Test that CSV input without the required columns is rejected."""
+    with pytest.raises(ValueError):
+        list(iter_user_records(["name,secret\n"], "csv"))
+
+def test_detect_format():
+    """Test picking the format from content type or file name."""
+    assert detect_format("application/x-ndjson; charset=utf-8") == "ndjson"
+    assert detect_format(None, "cohort.CSV") == "csv"
+    assert detect_format("application/json") is None
+
+
+##########################################################
+# Endpoint and CLI
+##########################################################
+
+def test_bulk_create_users_ndjson(client):
+    """Test importing NDJSON through the API."""
+    body = "\n".join(json.dumps({"username": f"user{i}", "password": "pw"}) for i in range(3))
+    response = client.post("/api/create-users/bulk", data=body, content_type="application/x-ndjson")
+    assert response.status_code == 200
+    assert response.get_json()["created"] == 3
+    assert User.check_password("user2", "pw") is True
+
+def test_bulk_create_users_csv_with_duplicates(client):
+    """Test importing CSV and reporting duplicates per row."""
+    body = "username,password\nalice,pw\nalice,pw2\n"
+    response = client.post("/api/create-users/bulk?format=csv", data=body)
+    report = response.get_json()
+    assert report["created"] == 1
+    assert report["errors"] == [{"line": 3, "username": "alice", "error": "duplicate username in input"}]
+
+def test_bulk_create_users_reports_unreadable_input(client, app):
+    """Test that invalid UTF-8 partway through returns the report of what was committed."""
+    app.config["USER_IMPORT_BATCH_SIZE"] = 100
+    lines = "".join(json.dumps({"username": f"user{i}", "password": "pw"}) + "\n" for i in range(2000))
+    response = client.post("/api/create-users/bulk", data=lines.encode() + b"\xff\n",
+                           content_type="application/x-ndjson")
+    report = response.get_json()
+    assert response.status_code == 400
+    assert report["status"] == "import aborted"
+    assert report["created"] == User.query.count()
+    assert report["aborted"]["line"] == report["created"] + 1
+    assert "utf-8" in report["aborted"]["error"]
+
+def test_bulk_create_users_unsupported_format(client):
+    """Test that a body in an unknown format is rejected."""
+    response = client.post("/api/create-users/bulk", data="{}", content_type="application/json")
+    assert response.status_code == 400
+
+def test_import_users_cli(app, tmp_path):
+    """Test the import-users command."""
+    path = tmp_path / "cohort.csv"
+    path.write_text("username,password\nbob,pw\ncarol,pw\n")
+    result = app.test_cli_runner().invoke(args=["import-users", str(path), "--batch-size", "1"])
+    assert result.exit_code == 0, result.output
+    assert "Created 2 users in 2 transactions" in result.output
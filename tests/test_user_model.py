@@ -1,7 +1,10 @@
 import pytest
 
+from sqlalchemy import event
 from sqlalchemy.exc import IntegrityError
 
+from scholarship_finder.clients.redis_client import redis_connection
+from scholarship_finder.models import user_model
 from scholarship_finder.models.user_model import User
 
 
@@ -52,6 +55,69 @@ def test_check_password_user_not_found(session):
     with pytest.raises(ValueError, match="User nonexistentuser not found"):
         User.check_password("nonexistentuser", "password")
 
+@pytest.fixture
+def query_count(session):
+    """Counts SQL statements executed on the test engine."""
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(session.get_bind(), "before_cursor_execute", listener)
+    yield statements
+    event.remove(session.get_bind(), "before_cursor_execute", listener)
+
+def test_authenticate(session, sample_user):
+    """Test that authenticate returns the user id and the verification result."""
+    User.create_user(**sample_user)
+    user_id = session.query(User).filter_by(username=sample_user["username"]).first().id
+    assert User.authenticate(sample_user["username"], sample_user["password"]) == (user_id, True)
+    assert User.authenticate(sample_user["username"], "wrongpassword") == (user_id, False)
+    assert User.get_id_by_username(sample_user["username"]) == user_id
+
+def test_repeated_logins_use_the_credential_cache(session, sample_user, query_count):
+    """Test that only the first authentication queries the database."""
+    User.create_user(**sample_user)
+    query_count.clear()
+    for _ in range(3):
+        User.authenticate(sample_user["username"], sample_user["password"])
+    assert len(query_count) == 1
+
+class FakeGenerations:
+    """In-memory stand-in for the Redis hash of credential generations."""
+
+    def __init__(self):
+        self.generations = {}
+
+    def hget(self, key, field):
+        value = self.generations.get(field)
+        return str(value).encode() if value is not None else None
+
+    def hincrby(self, key, field, amount):
+        self.generations[field] = self.generations.get(field, 0) + amount
+
+@pytest.fixture
+def shared_invalidation(monkeypatch):
+    generations = FakeGenerations()
+    monkeypatch.setattr(type(redis_connection), "client", property(lambda self: generations))
+    monkeypatch.setattr(user_model, "_shared_invalidation", True)
+    return generations
+
+def test_password_change_in_another_worker_invalidates_the_cache(session, sample_user, query_count,
+                                                                 shared_invalidation):
+    """Test that a cache hit is rejected once another worker bumps the user's generation."""
+    User.create_user(**sample_user)
+    query_count.clear()
+    User.authenticate(sample_user["username"], sample_user["password"])
+    User.authenticate(sample_user["username"], sample_user["password"])
+    assert len(query_count) == 1
+    shared_invalidation.hincrby(user_model.CREDENTIAL_GENERATIONS_KEY, sample_user["username"], 1)
+    User.authenticate(sample_user["username"], sample_user["password"])
+    assert len(query_count) == 2
+
+def test_delete_user_bumps_the_shared_generation(session, sample_user, shared_invalidation):
+    """Test that deleting a user tells the other workers to drop their cached credentials."""
+    User.create_user(**sample_user)
+    User.delete_user(sample_user["username"])
+    assert shared_invalidation.generations[sample_user["username"]] == 1
+
 ##########################################################
 # Update Password
 ##########################################################
@@ -63,6 +129,13 @@ def test_update_password(session, sample_user):
     User.update_password(sample_user["username"], new_password)
     assert User.check_password(sample_user["username"], new_password) is True, "Password should be updated successfully."
 
+def test_update_password_invalidates_cached_credentials(session, sample_user):
+    """Test that the old password stops working once the password changes."""
+    User.create_user(**sample_user)
+    assert User.check_password(sample_user["username"], sample_user["password"]) is True
+    User.update_password(sample_user["username"], "newpassword456")
+    assert User.check_password(sample_user["username"], sample_user["password"]) is False
+
 def test_update_password_user_not_found(session):
     """Test updating the password for a non-existent user."""
     with pytest.raises(ValueError, match="User nonexistentuser not found"):
@@ -80,7 +153,46 @@ def test_delete_user(session, sample_user):
     user = session.query(User).filter_by(username=sample_user["username"]).first()
     assert user is None, "User should be deleted from the database."
 
+def test_delete_user_invalidates_cached_credentials(session, sample_user):
+    """Test that a deleted user can no longer authenticate."""
+    User.create_user(**sample_user)
+    User.authenticate(sample_user["username"], sample_user["password"])
+    User.delete_user(sample_user["username"])
+    with pytest.raises(ValueError, match="User testuser not found"):
+        User.authenticate(sample_user["username"], sample_user["password"])
+
 def test_delete_user_not_found(session):
     """Test deleting a non-existent user."""
     with pytest.raises(ValueError, match="User nonexistentuser not found"):
         User.delete_user("nonexistentuser")
+
+
+##########################################################
+# Bulk Creation
+##########################################################
+
+def test_bulk_create_users(session):
+    """Test creating users in batches, one transaction per batch."""
+    records = [(i, f"user{i}", "password", None) for i in range(1, 6)]
+    report = User.bulk_create_users(records, batch_size=2)
+    assert report["created"] == 5
+    assert report["transactions"] == 3
+    assert report["errors"] == []
+    assert User.check_password("user3", "password") is True
+
+def test_bulk_create_users_reports_duplicates(session, sample_user):
+    """Test that duplicates and malformed records are reported per record."""
+    User.create_user(**sample_user)
+    report = User.bulk_create_users([
+        (1, "testuser", "password", None),
+        (2, "newuser", "password", None),
+        (3, "newuser", "other", None),
+        (4, None, None, "invalid JSON"),
+    ])
+    assert report["created"] == 1
+    assert report["failed"] == 3
+    assert [(e["line"], e["error"]) for e in report["errors"]] == [
+        (1, "username already exists"),
+        (3, "duplicate username in input"),
+        (4, "invalid JSON"),
+    ]
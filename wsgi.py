@@ -0,0 +1,27 @@
+"""
+WSGI entry point for production: `gunicorn wsgi:app` (settings in gunicorn.conf.py).
+
+With `preload_app`, this module is imported once in the gunicorn master. The
+catalog is fetched and warmed here, before the workers are forked, so they
+share it copy-on-write and no request pays for the first Notion fetch.
+"""
+import gc
+import logging
+
+from app import create_app
+from scholarship_finder.server import warm_up
+from scholarship_finder.utils.logger import configure_logger
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+app = create_app()
+
+try:
+    warm_up(app)
+except Exception as e:
+    # Workers start anyway and keep loading the catalog in the background; /api/ready reports 503 until then
+    logger.error("Could not warm the catalog before forking: %s", str(e))
+
+# Move the warmed heap out of the collector's reach so collections in the workers do not copy it
+gc.freeze()